@@ -6,8 +6,77 @@
 # ============================================================
 import os
 import sys
+import json
+import time
 import platform
-from pathlib import Path
+
+# Момент старта процесса (для отчёта о времени запуска)
+STARTUP_TIME = time.perf_counter()
+
+class StartupProfiler:
+    """Профилировщик запуска: монотонные отметки окончания каждой фазы"""
+    def __init__(self, started_at):
+        self.started_at = started_at
+        self.marks = []
+        self.reported = False
+        self.enabled = os.environ.get("ANTIC_PROFILE_STARTUP") == "1"
+        self.output_path = None
+        for arg in sys.argv[1:]:
+            if arg == "--profile-startup":
+                self.enabled = True
+            elif arg.startswith("--profile-startup="):
+                self.enabled = True
+                self.output_path = arg.split("=", 1)[1]
+    
+    def mark(self, phase):
+        """Отметка окончания фазы запуска"""
+        self.marks.append((phase, time.perf_counter()))
+    
+    def phases(self):
+        """Список фаз со смещением начала и длительностью (в секундах)"""
+        result = []
+        previous = self.started_at
+        for phase, timestamp in self.marks:
+            result.append({
+                "phase": phase,
+                "start": round(previous - self.started_at, 6),
+                "duration": round(timestamp - previous, 6)
+            })
+            previous = timestamp
+        return result
+    
+    def write_report(self, default_path, extra=None):
+        """Вывод таблицы фаз в лог и сохранение JSON для сравнения между релизами"""
+        if self.reported:
+            return
+        self.reported = True
+        phases = self.phases()
+        total = phases[-1]["start"] + phases[-1]["duration"] if phases else 0.0
+        
+        log_message("Профиль запуска:")
+        log_message(f"  {'Фаза':<28}{'Начало, с':>12}{'Длит., с':>12}")
+        for item in phases:
+            log_message(f"  {item['phase']:<28}{item['start']:>12.3f}{item['duration']:>12.3f}")
+        log_message(f"  {'ИТОГО':<28}{'':>12}{total:>12.3f}")
+        
+        report = {
+            "version": CURRENT_VERSION,
+            "platform": platform.platform(),
+            "python": platform.python_version(),
+            "total": round(total, 6),
+            "phases": phases
+        }
+        if extra:
+            report.update(extra)
+        path = self.output_path or default_path
+        try:
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(report, f, indent=4, ensure_ascii=False)
+            log_message(f"Профиль запуска сохранён: {path}")
+        except Exception as e:
+            log_message(f"Ошибка сохранения профиля запуска: {str(e)}", "ERROR")
+
+startup_profiler = StartupProfiler(STARTUP_TIME)
 
 # Защита от дублей в .exe (кроссплатформенная)
 if getattr(sys, 'frozen', False):
@@ -31,71 +100,19 @@ if getattr(sys, 'frozen', False):
             sys.exit(0)  # Другой экземпляр уже запущен
 
 # ─────── НАХОДИМ РАБОЧУЮ ПАПКУ playwright-browsers (в .exe она в _internal) ───────
-# Кроссплатформенное определение папки браузеров
-if getattr(sys, 'frozen', False):
-    exe_dir = Path(sys.executable).parent
-    search_paths = [
-        exe_dir / "_internal" / "playwright-browsers",
-        exe_dir / "playwright-browsers",
-    ]
-else:
-    search_paths = [Path(__file__).parent / "playwright-browsers"]
-
-# Определяем имя папки Chromium в зависимости от ОС
-system = platform.system()
-if system == 'Windows':
-    chromium_subpath = "chrome-win"
-    chromium_executable = "chrome.exe"
-elif system == 'Darwin':  # macOS
-    chromium_subpath = "chrome-mac"
-    chromium_executable = "Chromium.app"
-else:  # Linux
-    chromium_subpath = "chrome-linux"
-    chromium_executable = "chrome"
-
-browsers_path = None
-for p in search_paths:
-    if p.exists():
-        # Ищем папку chromium-* с правильным подкаталогом для текущей ОС
-        for chromium_dir in os.listdir(p):
-            if chromium_dir.startswith("chromium-"):
-                chromium_path = p / chromium_dir / chromium_subpath
-                if system == 'Darwin':
-                    # На macOS проверяем наличие .app бандла
-                    if (chromium_path / chromium_executable).exists():
-                        browsers_path = p
-                        break
-                else:
-                    # На Windows/Linux проверяем исполняемый файл
-                    if (chromium_path / chromium_executable).exists():
-                        browsers_path = p
-                        break
-        if browsers_path:
-            break
-
-if not browsers_path:
-    # Если не нашли упакованные браузеры, используем стандартное расположение Playwright
-    print("Используем стандартное расположение браузеров Playwright...")
-    # Playwright установит браузеры в стандартное место, путь не нужно задавать
-else:
-    # Устанавливаем правильный путь только если нашли упакованные браузеры
-    os.environ["PLAYWRIGHT_BROWSERS_PATH"] = str(browsers_path)
-    print(f"Playwright браузер найден: {browsers_path}")
+from antic_core.browsers import configure_playwright_browsers
+configure_playwright_browsers()
+startup_profiler.mark("browser_discovery")
 
 # ============================================================
 # ВСЁ ГОТОВО — СТАНДАРТНЫЕ ИМПОРТЫ
 # ============================================================
-import json
 import requests
 import zipfile
-import time
 import tempfile
 import threading
-import warnings
 import re
 import subprocess
-import shutil
-warnings.filterwarnings("ignore", category=UserWarning, module="pproxy")
 
 import flet as ft
 if not hasattr(ft, "Colors") and hasattr(ft, "colors"):
@@ -103,107 +120,46 @@ if not hasattr(ft, "Colors") and hasattr(ft, "colors"):
 if not hasattr(ft, "Icons") and hasattr(ft, "icons"):
     ft.Icons = ft.icons
 
-import pytz
-import pproxy
 import asyncio
-import geoip2.database
 import random
-from functools import lru_cache
-from timezonefinder import TimezoneFinder
-from playwright.async_api import async_playwright
-from playwright.async_api._generated import BrowserContext
+
+# Ядро без UI (тяжёлые модули внутри загружаются отложенно через lazy_import)
+from antic_core import (
+    CURRENT_VERSION, GITHUB_REPO, UPDATE_CHECK_URL, BASE_DIR,
+    SCREENS, LANGUAGES, HEAVY_MODULES, LAZY_IMPORT_TIMINGS,
+    log_message, set_notification_handler, get_timezones, load_api_keys, save_api_key,
+    initialize_directories, get_user_agents, refresh_user_agents, geo_service, provision_geo_databases, get_ip_range_table,
+    check_proxy_async, check_proxies_bulk, measure_proxy_throughput, submit_check,
+    get_proxy_check_cache, get_proxy, save_proxy_to_file, import_proxies, remove_proxy_from_file, prefetch_proxy_hosts,
+    proxy_monitor, result_is_stale, proxy_score, rank_proxies, best_proxy, proxy_breaker,
+    SXOrgAPI, CyberYozhAPI, translate_cyberyozh_message,
+    list_profiles, load_profile, save_profile, remove_profile, next_profile_name, launch_profile,
+)
+startup_profiler.mark("imports")
 
 # ============================================================
 # ТВОЙ КОД — АВТООБНОВЛЕНИЕ И ВЕРСИЯ
 # ============================================================
-CURRENT_VERSION = "1.0.0"
-GITHUB_REPO = "CJ-aezakmi/brows"
-UPDATE_CHECK_URL = f"https://api.github.com/repos/{GITHUB_REPO}/releases/latest"
-
-# Пути к файлам
-BASE_DIR = os.path.dirname(__file__) if "__file__" in globals() else os.getcwd()
-COUNTRY_DATABASE_PATH = os.path.join(BASE_DIR, "GeoLite2-Country.mmdb")
-CITY_DATABASE_PATH = os.path.join(BASE_DIR, "GeoLite2-City.mmdb")
-PROXY_CACHE_PATH = os.path.join(BASE_DIR, "proxy_cache.json")
-CONFIG_DIR = os.path.join(BASE_DIR, "config")
-COOKIES_DIR = os.path.join(BASE_DIR, "cookies")
-PROXIES_FILE = os.path.join(BASE_DIR, "proxies.json")
-API_KEYS_FILE = os.path.join(BASE_DIR, "api_keys.json")  # Файл для сохранения API ключей
-
-# Пути к файлам
-BASE_DIR = os.path.dirname(__file__)
-COUNTRY_DATABASE_PATH = os.path.join(BASE_DIR, "GeoLite2-Country.mmdb")
-CITY_DATABASE_PATH = os.path.join(BASE_DIR, "GeoLite2-City.mmdb")
-PROXY_CACHE_PATH = os.path.join(BASE_DIR, "proxy_cache.json")
-CONFIG_DIR = os.path.join(BASE_DIR, "config")
-COOKIES_DIR = os.path.join(BASE_DIR, "cookies")
-PROXIES_FILE = os.path.join(BASE_DIR, "proxies.json")
-
-# Константы
-SCREENS = ("800×600", "960×540", "1024×768", "1152×864", "1280×720", "1280×768", "1280×800", "1280×1024", "1366×768", "1408×792", "1440×900", "1400×1050", "1440×1080", "1536×864", "1600×900", "1600×1024", "1600×1200", "1680×1050", "1920×1080", "1920×1200", "2048×1152", "2560×1080", "2560×1440", "3440×1440")
-LANGUAGES = ("en-US", "en-GB", "fr-FR", "ru-RU", "es-ES", "pl-PL", "pt-PT", "nl-NL", "zh-CN")
-TIMEZONES = pytz.common_timezones
-
-# Маппинг стран к языкам и timezone (для автонастройки под GEO прокси)
-COUNTRY_SETTINGS = {
-    "US": {"lang": "en-US", "timezone": "America/New_York"},
-    "GB": {"lang": "en-GB", "timezone": "Europe/London"},
-    "FR": {"lang": "fr-FR", "timezone": "Europe/Paris"},
-    "DE": {"lang": "de-DE", "timezone": "Europe/Berlin"},
-    "RU": {"lang": "ru-RU", "timezone": "Europe/Moscow"},
-    "ES": {"lang": "es-ES", "timezone": "Europe/Madrid"},
-    "IT": {"lang": "it-IT", "timezone": "Europe/Rome"},
-    "PL": {"lang": "pl-PL", "timezone": "Europe/Warsaw"},
-    "PT": {"lang": "pt-PT", "timezone": "Europe/Lisbon"},
-    "NL": {"lang": "nl-NL", "timezone": "Europe/Amsterdam"},
-    "CN": {"lang": "zh-CN", "timezone": "Asia/Shanghai"},
-    "JP": {"lang": "ja-JP", "timezone": "Asia/Tokyo"},
-    "KR": {"lang": "ko-KR", "timezone": "Asia/Seoul"},
-    "BR": {"lang": "pt-BR", "timezone": "America/Sao_Paulo"},
-    "CA": {"lang": "en-US", "timezone": "America/Toronto"},
-    "AU": {"lang": "en-AU", "timezone": "Australia/Sydney"},
-    "IN": {"lang": "en-IN", "timezone": "Asia/Kolkata"},
-    "TR": {"lang": "tr-TR", "timezone": "Europe/Istanbul"},
-    "MX": {"lang": "es-MX", "timezone": "America/Mexico_City"},
-    "AR": {"lang": "es-AR", "timezone": "America/Argentina/Buenos_Aires"},
-    "UA": {"lang": "uk-UA", "timezone": "Europe/Kiev"},
-    "SE": {"lang": "sv-SE", "timezone": "Europe/Stockholm"},
-    "NO": {"lang": "no-NO", "timezone": "Europe/Oslo"},
-    "DK": {"lang": "da-DK", "timezone": "Europe/Copenhagen"},
-    "FI": {"lang": "fi-FI", "timezone": "Europe/Helsinki"},
-}
-
-# Логирование
-def log_message(message, level="INFO"):
-    """Логирование сообщений с временной меткой"""
-    timestamp = time.strftime("%Y-%m-%d %H:%M:%S")
-    print(f"[{timestamp}] [{level}] {message}")
-
-# Функции для управления API ключами
-def load_api_keys():
-    """Загрузка сохраненных API ключей"""
-    try:
-        if os.path.isfile(API_KEYS_FILE):
-            with open(API_KEYS_FILE, "r", encoding="utf-8") as f:
-                keys = json.load(f)
-                log_message("API ключи загружены")
-                return keys
-    except Exception as e:
-        log_message(f"Ошибка загрузки API ключей: {str(e)}", "ERROR")
-    return {"sx_org": "", "cyberyozh": ""}
-
-def save_api_key(service: str, key: str):
-    """Сохранение API ключа"""
-    try:
-        keys = load_api_keys()
-        keys[service] = key
-        with open(API_KEYS_FILE, "w", encoding="utf-8") as f:
-            json.dump(keys, f, indent=4)
-        log_message(f"API ключ для {service} сохранен")
-        return True
-    except Exception as e:
-        log_message(f"Ошибка сохранения API ключа: {str(e)}", "ERROR")
-        return False
+STARTUP_PROFILE_PATH = os.path.join(BASE_DIR, "startup_profile.json")
+
+def log_startup_report():
+    """Отчёт о времени запуска: когда показано окно и какие тяжёлые модули уже загружены"""
+    window_time = time.perf_counter() - STARTUP_TIME
+    loaded = [name for name in HEAVY_MODULES if name in sys.modules]
+    log_message(f"Окно показано через {window_time:.2f}с после старта")
+    if loaded:
+        log_message(f"До показа окна загружены тяжёлые модули: {', '.join(loaded)}", "WARNING")
+    else:
+        log_message("Тяжёлые модули до показа окна не загружались")
+    for name, timing in lazy_import_report().items():
+        log_message(f"  {name}: {timing['duration']:.2f}с (через {timing['since_start']:.2f}с после старта)")
+
+def lazy_import_report():
+    """Время отложенных импортов относительно старта процесса"""
+    return {
+        name: {"since_start": timing["started_at"] - STARTUP_TIME, "duration": timing["duration"]}
+        for name, timing in LAZY_IMPORT_TIMINGS.items()
+    }
 
 # Система автообновления
 class AutoUpdater:
@@ -328,563 +284,6 @@ rm -f "{update_script}"
 # Инициализация автообновления
 updater = AutoUpdater()
 
-# Безопасная загрузка USER_AGENTS
-try:
-    USER_AGENTS = requests.get("https://raw.githubusercontent.com/microlinkhq/top-user-agents/refs/heads/master/src/index.json", timeout=10).json()
-    log_message(f"Загружено {len(USER_AGENTS)} User Agents")
-except:
-    USER_AGENTS = [
-        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-        "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-        "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
-    ]
-    log_message("Используются стандартные User Agents")
-
-# Загрузка кэша прокси
-_proxy_check_cache = {}
-if os.path.isfile(PROXY_CACHE_PATH):
-    try:
-        with open(PROXY_CACHE_PATH, "r", encoding="utf-8") as f:
-            _proxy_check_cache = json.load(f)
-        log_message(f"Загружен кэш прокси: {len(_proxy_check_cache)} записей")
-    except:
-        _proxy_check_cache = {}
-        log_message("Не удалось загрузить кэш прокси")
-
-# SX.ORG API класс с улучшенной обработкой ошибок
-class SXOrgAPI:
-    def __init__(self):
-        self.base_url = "https://api.sx.org/"
-        self.api_key = ""
-        self.countries = []
-        self.states = []
-        self.cities = []
-        self.ports = []
-        self.balance = "0.00"
-        self.authenticated = False
-        log_message("SXOrgAPI инициализирован")
-    
-    def validate_key(self, api_key):
-        log_message(f"Проверяем API ключ: {api_key[:10]}...")
-        self.api_key = api_key
-        try:
-            # Используем более надежный способ запроса с повторными попытками
-            for attempt in range(3):
-                try:
-                    response = requests.get(
-                        f"{self.base_url}v2/plan/info", 
-                        params={"apiKey": api_key}, 
-                        timeout=15,
-                        headers={'User-Agent': 'Antic Browser v1.0.0'}
-                    )
-                    response.raise_for_status()
-                    data = response.json()
-                    break
-                except requests.exceptions.RequestException as e:
-                    if attempt == 2:
-                        raise e
-                    time.sleep(1)
-            
-            if not data.get('success'):
-                self.authenticated = False
-                log_message("API ключ неверный")
-                return False, "Неверный API ключ или недостаточно прав"
-            
-            # Получаем баланс
-            resp_balance = requests.get(
-                f"{self.base_url}v2/user/balance", 
-                params={"apiKey": api_key}, 
-                timeout=15,
-                headers={'User-Agent': 'Antic Browser v1.0.0'}
-            )
-            resp_balance.raise_for_status()
-            balance_data = resp_balance.json()
-            self.balance = balance_data.get('balance', '0.00') if balance_data.get('success') else '0.00'
-            
-            # Получаем страны
-            resp_countries = requests.get(
-                f"{self.base_url}v2/dir/countries", 
-                params={"apiKey": api_key}, 
-                timeout=15,
-                headers={'User-Agent': 'Antic Browser v1.0.0'}
-            )
-            resp_countries.raise_for_status()
-            countries_data = resp_countries.json()
-            if countries_data.get('success'):
-                self.countries = countries_data['countries']
-                priority_countries = {"United States", "Russia", "Germany", "United Kingdom", "Canada"}
-                prioritized = [c for c in self.countries if c['name'] in priority_countries]
-                others = [c for c in self.countries if c['name'] not in priority_countries]
-                others.sort(key=lambda x: x['name'])
-                self.countries = prioritized + others
-                log_message(f"Загружено {len(self.countries)} стран")
-            
-            self.authenticated = True
-            log_message(f"API ключ валиден, баланс: ${self.balance}")
-            return True, f"Баланс: ${self.balance}"
-        except Exception as e:
-            self.authenticated = False
-            log_message(f"Ошибка валидации API: {str(e)}", "ERROR")
-            return False, str(e)
-    
-    def get_states(self, country_id):
-        log_message(f"Получаем штаты для страны ID: {country_id}")
-        try:
-            resp = requests.get(
-                f"{self.base_url}v2/dir/states", 
-                params={"apiKey": self.api_key, "countryId": country_id}, 
-                timeout=15,
-                headers={'User-Agent': 'Antic Browser v1.0.0'}
-            )
-            resp.raise_for_status()
-            data = resp.json()
-            if data.get('success'):
-                self.states = sorted(data['states'], key=lambda x: x['name'])
-                log_message(f"Загружено {len(self.states)} штатов")
-                return True, self.states
-            log_message("Ошибка получения штатов")
-            return False, "Ошибка получения штатов"
-        except Exception as e:
-            log_message(f"Исключение при получении штатов: {str(e)}", "ERROR")
-            return False, str(e)
-    
-    def get_cities(self, state_id, country_id):
-        log_message(f"Получаем города для штата ID: {state_id}")
-        try:
-            resp = requests.get(
-                f"{self.base_url}v2/dir/cities", 
-                params={"apiKey": self.api_key, "stateId": state_id, "countryId": country_id}, 
-                timeout=15,
-                headers={'User-Agent': 'Antic Browser v1.0.0'}
-            )
-            resp.raise_for_status()
-            data = resp.json()
-            if data.get('success'):
-                self.cities = sorted(data['cities'], key=lambda x: x['name'])
-                log_message(f"Загружено {len(self.cities)} городов")
-                return True, self.cities
-            log_message("Ошибка получения городов")
-            return False, "Ошибка получения городов"
-        except Exception as e:
-            log_message(f"Исключение при получении городов: {str(e)}", "ERROR")
-            return False, str(e)
-    
-    def create_proxy(self, country_code, state_name, city_name, connection_type, proxy_types, proxy_name):
-        log_message(f"Создаем прокси: {proxy_name}")
-        try:
-            type_map = {"keep-connection": 2, "rotate-connection": 3}
-            type_id = type_map.get(connection_type)
-            
-            proxy_type_id = 1 if "residential" in proxy_types else 3 if "mobile" in proxy_types else 4 if "corporate" in proxy_types else 2
-            
-            data = {
-                "country_code": country_code,
-                "state": state_name,
-                "city": city_name,
-                "type_id": type_id,
-                "proxy_type_id": proxy_type_id,
-                "server_port_type_id": 0,
-                "name": proxy_name
-            }
-            
-            headers = {
-                "Content-Type": "application/json",
-                "User-Agent": "Antic Browser v1.0.0"
-            }
-            
-            resp = requests.post(
-                f"{self.base_url}v2/proxy/create-port", 
-                params={"apiKey": self.api_key}, 
-                headers=headers, 
-                data=json.dumps(data), 
-                timeout=30
-            )
-            resp.raise_for_status()
-            result = resp.json()
-            
-            if result.get('success'):
-                proxy_data = result.get('data', [result]) if isinstance(result.get('data'), list) else [result.get('data')]
-                proxies = []
-                for p in proxy_data:
-                    proxy_str = f"http://{p.get('login')}:{p.get('password')}@{p.get('server')}:{p.get('port')}"
-                    proxies.append(proxy_str)
-                log_message(f"Создано {len(proxies)} прокси")
-                return True, proxies
-            else:
-                log_message(f"Ошибка создания прокси: {result.get('message', 'Неизвестная ошибка')}")
-                return False, result.get('message', 'Неизвестная ошибка')
-        except Exception as e:
-            log_message(f"Исключение при создании прокси: {str(e)}", "ERROR")
-            return False, str(e)
-    
-    def get_ports(self):
-        log_message("Получаем список портов")
-        try:
-            resp = requests.get(
-                f"{self.base_url}v2/proxy/ports", 
-                params={"apiKey": self.api_key}, 
-                timeout=15,
-                headers={'User-Agent': 'Antic Browser v1.0.0'}
-            )
-            resp.raise_for_status()
-            data = resp.json()
-            if data.get('success'):
-                self.ports = data['message'].get('proxies', [])
-                log_message(f"Загружено {len(self.ports)} портов")
-                return True, self.ports
-            log_message(f"Ошибка получения портов: {data.get('message', 'Неизвестная ошибка')}")
-            return False, data.get('message', 'Неизвестная ошибка')
-        except Exception as e:
-            log_message(f"Исключение при получении портов: {str(e)}", "ERROR")
-            return False, str(e)
-
-# CyberYozh API класс с улучшенной обработкой ошибок
-class CyberYozhAPI:
-    def __init__(self):
-        self.base_url = "https://app.cyberyozh.com/api/v1/"
-        self.api_key = ""
-        self.balance = 0
-        self.countries = []
-        self.proxies = []
-        self.authenticated = False
-        log_message("CyberYozhAPI инициализирован")
-    
-    def validate_key(self, api_key):
-        log_message(f"Проверяем API ключ CyberYozh: {api_key[:10]}...")
-        self.api_key = api_key
-        try:
-            # Баланс доступен только на v2
-            response = requests.get(
-                "https://app.cyberyozh.com/api/v2/users/balance/", 
-                headers={
-                    'X-Api-Key': api_key,  # Правильный заголовок с заглавными буквами
-                    'User-Agent': 'Antic Browser v1.0.0'
-                },
-                timeout=15
-            )
-            response.raise_for_status()
-            
-            # Ответ возвращает просто число: "1.71$"
-            balance_text = response.text.strip()
-            try:
-                # Убираем символ $ и конвертируем в число
-                self.balance = float(balance_text.replace('$', '').strip())
-            except:
-                self.balance = balance_text
-            
-            self.authenticated = True
-            log_message(f"API ключ CyberYozh валиден, баланс: {self.balance}")
-            return True, f"Баланс: ${self.balance}"
-        except Exception as e:
-            self.authenticated = False
-            log_message(f"Ошибка валидации API CyberYozh: {str(e)}", "ERROR")
-            return False, str(e)
-    
-    def get_countries(self):
-        """Получение списка доступных стран из магазина прокси"""
-        log_message("Получаем список стран CyberYozh")
-        try:
-            response = requests.get(
-                f"{self.base_url}proxies/shop/",
-                headers={
-                    'X-Api-Key': self.api_key,
-                    'User-Agent': 'Antic Browser v1.0.0'
-                },
-                timeout=15
-            )
-            response.raise_for_status()
-            data = response.json()
-            
-            # Парсим данные магазина и извлекаем уникальные страны
-            countries = []
-            if isinstance(data, dict) and 'results' in data:
-                # Извлекаем уникальные коды стран
-                country_codes = set()
-                for item in data['results']:
-                    if 'country_code' in item:
-                        country_codes.add(item['country_code'])
-                countries = sorted(list(country_codes))
-            
-            self.countries = countries
-            log_message(f"Загружено {len(countries)} стран CyberYozh")
-            return True, countries
-        except Exception as e:
-            log_message(f"Ошибка получения стран CyberYozh: {str(e)}", "ERROR")
-            return False, str(e)
-    
-    def create_proxy(self, proxy_id, auto_renew=False):
-        """Покупка прокси по ID продукта из магазина"""
-        log_message(f"Покупаем прокси CyberYozh: id={proxy_id}, auto_renew={auto_renew}")
-        try:
-            # API v1 PurchaseRequest schema: array of objects with 'id' (uuid) and 'auto_renew'
-            data = [{
-                "id": proxy_id,
-                "auto_renew": auto_renew
-            }]
-            
-            response = requests.post(
-                f"{self.base_url}proxies/shop/buy_proxies/",
-                json=data,
-                headers={
-                    'X-Api-Key': self.api_key,
-                    'Content-Type': 'application/json',
-                    'User-Agent': 'Antic Browser v1.0.0'
-                },
-                timeout=30
-            )
-            # Обрабатываем дружелюбные сообщения
-            if response.status_code >= 400:
-                try:
-                    err = response.json()
-                except:
-                    err = {"detail": response.text}
-                msg = err.get('message') or err.get('detail') or 'Ошибка запроса'
-                return False, translate_cyberyozh_message(msg)
-
-            result = response.json()
-            
-            log_message(f"Прокси куплен успешно: {result}")
-            # Возвращаем дружелюбное сообщение, если есть статус/сообщение
-            try:
-                if isinstance(result, list) and result:
-                    item = result[0]
-                    status = item.get('status')
-                    msg = item.get('message')
-                    friendly = translate_cyberyozh_message(msg) if msg else None
-                    if status and friendly:
-                        return False if status == 'canceled' else True, friendly
-            except Exception:
-                pass
-            return True, 'Покупка успешно инициирована'
-        except Exception as e:
-            log_message(f"Ошибка покупки прокси CyberYozh: {str(e)}", "ERROR")
-            return False, str(e)
-    
-    def get_shop_proxies(self, country_code=None, access_type=None, category=None):
-        """Получение списка доступных прокси в магазине"""
-        log_message(f"Получаем список прокси в магазине CyberYozh")
-        try:
-            params = {}
-            if country_code:
-                params['country_code'] = country_code
-            if access_type:
-                params['access_type'] = access_type
-            if category:
-                params['category'] = category
-            
-            response = requests.get(
-                f"{self.base_url}proxies/shop/",
-                params=params,
-                headers={
-                    'X-Api-Key': self.api_key,
-                    'User-Agent': 'Antic Browser v1.0.0'
-                },
-                timeout=15
-            )
-            response.raise_for_status()
-            result = response.json()
-            
-            proxies = result.get('results', []) if isinstance(result, dict) else result
-            log_message(f"Найдено {len(proxies)} прокси в магазине")
-            return True, proxies
-        except Exception as e:
-            log_message(f"Ошибка получения магазина CyberYozh: {str(e)}", "ERROR")
-            return False, str(e)
-    
-    def get_proxies(self, protocol='http', type_format='full_url'):
-        """Получение списка купленных прокси из истории"""
-        log_message(f"Получаем купленные прокси CyberYozh (protocol={protocol}, format={type_format})")
-        try:
-            response = requests.get(
-                f"{self.base_url}proxies/history/",
-                headers={
-                    'X-Api-Key': self.api_key,
-                    'User-Agent': 'Antic Browser v1.0.0'
-                },
-                timeout=15
-            )
-            response.raise_for_status()
-            result = response.json()
-            
-            # Парсим результат
-            proxies_list = result.get('results', []) if isinstance(result, dict) else result
-            
-            # Форматируем прокси в нужный формат с метаданными
-            formatted_proxies = []
-            for proxy in proxies_list:
-                # Проверяем статус и срок действия
-                if proxy.get('system_status') != 'active':
-                    log_message(f"Пропускаем прокси с статусом: {proxy.get('system_status')}")
-                    continue
-                if proxy.get('expired', False):
-                    log_message(f"Пропускаем истекший прокси: {proxy.get('id')}")
-                    continue
-                
-                # Получаем данные подключения
-                login = proxy.get('connection_login')
-                password = proxy.get('connection_password')
-                host = proxy.get('connection_host')
-                port = proxy.get('connection_port')
-                
-                if not all([login, password, host, port]):
-                    log_message(f"Пропускаем прокси с неполными данными: {proxy.get('id')}")
-                    continue
-                
-                # Формируем строку прокси
-                proxy_str = f"{protocol}://{login}:{password}@{host}:{port}"
-                
-                # Определяем реальную геолокацию по IP
-                ip = proxy.get('public_ipaddress', host)
-                country_code = proxy.get('country_code', 'Unknown')
-                city = 'Unknown'
-                
-                # Если API не вернул страну или вернул Unknown, определяем по GeoIP
-                if country_code == 'Unknown' or not country_code:
-                    try:
-                        geo_info = get_proxy_info(ip)
-                        country_code = geo_info.get('country_code', 'UNK')
-                        city = geo_info.get('city', 'Unknown')
-                        log_message(f"Определена геолокация для {ip}: {country_code}, {city}")
-                    except Exception as e:
-                        log_message(f"Не удалось определить геолокацию для {ip}: {str(e)}")
-                        country_code = 'UNK'
-                
-                # Добавляем с метаданными для UI
-                formatted_proxies.append({
-                    'proxy': proxy_str,
-                    'host': host,
-                    'port': port,
-                    'country': country_code,
-                    'city': city,
-                    'type': proxy.get('access_type', 'Unknown'),
-                    'category': proxy.get('category', ''),
-                    'expired_at': proxy.get('access_expires_at', ''),
-                    'ip': ip
-                })
-                log_message(f"Добавлен прокси: {host}:{port} [{country_code}]")
-            
-            log_message(f"Загружено {len(formatted_proxies)} активных прокси CyberYozh")
-            return True, formatted_proxies
-        except Exception as e:
-            log_message(f"Ошибка получения прокси CyberYozh: {str(e)}", "ERROR")
-            return False, str(e)
-
-def translate_cyberyozh_message(msg: str) -> str:
-    """Переводит системные ответы CyberYozh в понятные русские сообщения."""
-    if not msg:
-        return "Неизвестная ошибка"
-    text = msg.strip()
-    mapping = {
-        "Not enough money.": "Недостаточно средств",
-        "Request was throttled.": "Слишком много запросов. Попробуйте позже",
-        "Invalid API Key": "Неверный API ключ",
-        "Bad Request": "Некорректный запрос",
-        "Unauthorized": "Неавторизовано",
-        "Forbidden": "Доступ запрещён",
-        "Not Found": "Элемент не найден",
-        "Too Many Requests": "Слишком много запросов",
-        "Internal Server Error": "Внутренняя ошибка сервера",
-    }
-    # Точное совпадение
-    if text in mapping:
-        return mapping[text]
-    # Эвристики
-    if "money" in text.lower():
-        return "Недостаточно средств"
-    if "throttle" in text.lower() or "too many" in text.lower():
-        return "Слишком много запросов. Попробуйте позже"
-    return text
-    
-    def get_proxies(self, protocol='http', type_format='full_url'):
-            """Получение списка купленных прокси с credentials"""
-            log_message(f"Получаем список купленных прокси CyberYozh (protocol={protocol}, format={type_format})")
-            try:
-                # Используем /proxies/history/ который возвращает полную информацию
-                response = requests.get(
-                    f"{self.base_url}proxies/history/",
-                    headers={
-                        'X-Api-Key': self.api_key,
-                        'User-Agent': 'Antic Browser v1.0.0'
-                    },
-                    timeout=15
-                )
-                response.raise_for_status()
-                result = response.json()
-            
-                proxies = []
-                # Парсим ответ с полной информацией о прокси
-                if isinstance(result, dict) and 'results' in result:
-                    for item in result['results']:
-                        try:
-                            # Пропускаем истекшие прокси
-                            if item.get('expired', False):
-                                continue
-                        
-                            # Извлекаем данные для подключения
-                            host = item.get('connection_host', '')
-                            port = item.get('connection_port', '')
-                            login = item.get('connection_login', '')
-                            password = item.get('connection_password', '')
-                        
-                            # Определяем протокол из URL или используем заданный
-                            url = item.get('url', '')
-                            if url.startswith('socks5://') or url.startswith('socks5_http://'):
-                                proxy_protocol = 'socks5'
-                            else:
-                                proxy_protocol = protocol
-                        
-                            # Формируем прокси в нужном формате
-                            if type_format == 'full_url':
-                                proxy_str = f"{proxy_protocol}://{login}:{password}@{host}:{port}"
-                            elif type_format == 'ip_port_user_pass':
-                                proxy_str = f"{host}:{port}:{login}:{password}"
-                            elif type_format == 'user_pass_at_ip_port':
-                                proxy_str = f"{login}:{password}@{host}:{port}"
-                            else:
-                                proxy_str = f"{proxy_protocol}://{login}:{password}@{host}:{port}"
-                        
-                            proxies.append(proxy_str)
-                        except Exception as e:
-                            log_message(f"Ошибка парсинга прокси: {str(e)}", "ERROR")
-                            continue
-            
-                log_message(f"Получено {len(proxies)} прокси CyberYozh")
-                return True, proxies if proxies else []
-            except Exception as e:
-                log_message(f"Ошибка получения прокси CyberYozh: {str(e)}", "ERROR")
-                return False, str(e)
-    
-    def download_proxies_txt(self, protocol='http', type_format='full_url'):
-        """Скачивание всех прокси в текстовом формате (для импорта)"""
-        log_message(f"Скачиваем прокси CyberYozh в TXT формате (protocol={protocol}, format={type_format})")
-        try:
-            params = {
-                'type_format': type_format
-            }
-            if protocol:
-                params['protocol'] = protocol
-            
-            response = requests.get(
-                f"{self.base_url}proxies/proxy-credentials/download/",
-                params=params,
-                headers={
-                    'X-Api-Key': self.api_key,
-                    'User-Agent': 'Antic Browser v1.0.0'
-                },
-                timeout=30
-            )
-            response.raise_for_status()
-            
-            # Ответ в формате plain text со списком прокси
-            proxies_text = response.text.strip()
-            proxies = [p.strip() for p in proxies_text.split('\n') if p.strip()]
-            
-            log_message(f"Скачано {len(proxies)} прокси CyberYozh")
-            return True, proxies
-        except Exception as e:
-            log_message(f"Ошибка скачивания прокси CyberYozh: {str(e)}", "ERROR")
-            return False, str(e)
-
 # Глобальные переменные для API
 sx_api = SXOrgAPI()
 cyberyozh_api = CyberYozhAPI()
@@ -895,6 +294,7 @@ if saved_api_keys.get("sx_org"):
     sx_api.api_key = saved_api_keys["sx_org"]
 if saved_api_keys.get("cyberyozh"):
     cyberyozh_api.api_key = saved_api_keys["cyberyozh"]
+startup_profiler.mark("api_keys")
 
 # Глобальные переменные для UI
 current_page = "proxies"
@@ -998,553 +398,6 @@ class NotificationSystem:
 # Глобальная система уведомлений
 notification_system = None
 
-async def save_cookies(context: BrowserContext, profile: str) -> None:
-    """Сохранение cookies с улучшенной обработкой ошибок"""
-    try:
-        cookies = await context.cookies()
-        for cookie in cookies:
-            cookie.pop("sameSite", None)
-        
-        os.makedirs(COOKIES_DIR, exist_ok=True)
-        cookies_file = os.path.join(COOKIES_DIR, profile)
-        
-        with open(cookies_file, "w", encoding="utf-8") as f:
-            json.dump(obj=cookies, fp=f, indent=4)
-        
-        log_message(f"Cookies сохранены для профиля: {profile}")
-    except Exception as e:
-        log_message(f"Ошибка сохранения cookies: {str(e)}", "ERROR")
-
-def parse_netscape_cookies(netscape_cookie_str: str) -> list[dict]:
-    """Парсинг cookies в формате Netscape"""
-    cookies = []
-    lines = netscape_cookie_str.strip().split("\n")
-    for line in lines:
-        if not line.startswith("#") and line.strip():
-            parts = line.split()
-            if len(parts) == 7:
-                cookie = {
-                    "domain": parts[0],
-                    "httpOnly": parts[1].upper() == "TRUE",
-                    "path": parts[2],
-                    "secure": parts[3].upper() == "TRUE",
-                    "expires": float(parts[4]),
-                    "name": parts[5],
-                    "value": parts[6]
-                }
-                cookies.append(cookie)
-    return cookies
-
-@lru_cache(maxsize=256)
-def get_proxy_info(ip: str) -> dict:
-    """Получение информации о прокси по IP"""
-    try:
-        with geoip2.database.Reader(COUNTRY_DATABASE_PATH) as reader:
-            response = reader.country(ip)
-            country_code = response.country.iso_code
-    except:
-        country_code = "UNK"
-    
-    latitude = None
-    longitude = None
-    city = "UNK"
-    timezone = None
-    
-    # Пытаемся получить детальную информацию из City database если она есть
-    if os.path.exists(CITY_DATABASE_PATH):
-        try:
-            with geoip2.database.Reader(CITY_DATABASE_PATH) as reader:
-                response = reader.city(ip)
-                city = response.city.name if response.city.name else "UNK"
-                latitude = response.location.latitude
-                longitude = response.location.longitude
-                timezone = TimezoneFinder().timezone_at(lng=longitude, lat=latitude)
-        except:
-            pass
-    
-    result = {"country_code": country_code, "city": city, "timezone": timezone}
-    if latitude is not None and longitude is not None:
-        result["latitude"] = latitude
-        result["longitude"] = longitude
-    
-    return result
-
-async def run_proxy(protocol: str, ip: str, port: int, login: str, password: str):
-    """Запуск прокси сервера"""
-    try:
-        server = pproxy.Server("socks5://127.0.0.1:1337")
-        remote = pproxy.Connection(f"{protocol}://{ip}:{port}#{login}:{password}")
-        args = dict(rserver=[remote], verbose=print)
-        await server.start_server(args)
-    except Exception as e:
-        log_message(f"Ошибка запуска прокси сервера: {str(e)}", "ERROR")
-
-async def run_browser(user_agent: str, height: int, width: int, timezone: str, lang: str, proxy: str | bool, cookies: str | bool, webgl: bool, vendor: str, cpu: int, ram: int, is_touch: bool, profile: str) -> None:
-    """Запуск браузера с улучшенной обработкой ошибок и уведомлениями"""
-    log_message(f"Запускаем браузер для профиля: {profile}")
-    
-    try:
-        async with async_playwright() as p:
-            args = [
-                "--no-sandbox",
-                "--disable-setuid-sandbox",
-                "--disable-web-security",
-                "--ignore-certificate-errors",
-                "--disable-infobars",
-                "--disable-blink-features=AutomationControlled",
-                "--disable-dev-shm-usage",  # Для стабильности в режиме администратора
-                "--no-first-run",
-                "--disable-default-apps",
-                "--enable-features=NetworkService,NetworkServiceInProcess"  # DoNotTrack
-            ]
-            
-            if not webgl:
-                args.append("--disable-webgl")
-            
-            proxy_settings = None
-            proxy_task = None
-            proxy_ip = None
-            
-            if proxy:
-                try:
-                    protocol = proxy.split("://")[0]
-                    if "@" in proxy:
-                        splitted = proxy.split("://")[1].split("@")
-                        ip = splitted[1].split(":")[0]
-                        port = int(splitted[1].split(":")[1])
-                        username = splitted[0].split(":")[0]
-                        password = splitted[0].split(":")[1]
-                    else:
-                        splitted = proxy.split("://")[1].split(":")
-                        ip = splitted[0]
-                        port = int(splitted[1])
-                        username = ""
-                        password = ""
-                    
-                    proxy_ip = ip  # Сохраняем IP для автонастройки
-                    
-                    # Получаем GEO информацию о прокси
-                    try:
-                        proxy_geo = get_proxy_info(ip)
-                        country_code = proxy_geo.get("country_code", "US")
-                        
-                        # Автонастройка языка и timezone по GEO прокси
-                        if country_code in COUNTRY_SETTINGS:
-                            auto_settings = COUNTRY_SETTINGS[country_code]
-                            # Используем GEO timezone если он доступен, иначе дефолтный для страны
-                            timezone = proxy_geo.get("timezone") or auto_settings["timezone"]
-                            lang = auto_settings["lang"]
-                            log_message(f"Автонастройка под прокси: {country_code}, язык={lang}, timezone={timezone}")
-                        else:
-                            # Используем GEO timezone если он доступен
-                            if proxy_geo.get("timezone"):
-                                timezone = proxy_geo["timezone"]
-                                log_message(f"Использую GEO timezone: {timezone}")
-                    except Exception as e:
-                        log_message(f"Ошибка получения GEO данных прокси: {e}", "ERROR")
-                        
-                    if protocol == "http":
-                        proxy_settings = {
-                            "server": f"{ip}:{port}",
-                            "username": username,
-                            "password": password
-                        }
-                    else:
-                        proxy_task = asyncio.create_task(run_proxy(protocol, ip, port, username, password))
-                        proxy_settings = {
-                            "server": "socks5://127.0.0.1:1337"
-                        }
-                except Exception as e:
-                    log_message(f"Ошибка настройки прокси: {str(e)}", "ERROR")
-                    if notification_system:
-                        notification_system.show_notification("Ошибка прокси", f"Не удалось настроить прокси: {str(e)}", "error")
-            
-            # Загружаем расширение CyberYozh, если есть распакованная папка extensions/cyberyozh
-            extension_id = None
-            temp_user_data = None
-            try:
-                ext_dir = Path(__file__).parent / "extensions" / "cyberyozh"
-                if ext_dir.exists():
-                    args.extend([
-                        f"--disable-extensions-except={ext_dir}",
-                        f"--load-extension={ext_dir}"
-                    ])
-                    # ID расширения CyberYozh (вычислен из public key в manifest.json)
-                    extension_id = "paljcopanhinogelplkpgfnljiomaapc"
-                    
-                    # Создаем временную директорию для persistent context с закрепленным расширением
-                    import tempfile
-                    temp_user_data = tempfile.mkdtemp(prefix="antic_browser_")
-                    prefs_dir = Path(temp_user_data) / "Default"
-                    prefs_dir.mkdir(parents=True, exist_ok=True)
-                    
-                    # Создаем Preferences файл с закрепленным расширением в toolbar
-                    preferences = {
-                        "extensions": {
-                            "pinned_extensions": [extension_id],
-                            "toolbar": [extension_id]
-                        }
-                    }
-                    
-                    with open(prefs_dir / "Preferences", "w") as f:
-                        json.dump(preferences, f)
-                    
-                    log_message(f"Загружаем расширение CyberYozh из {ext_dir} с закреплением")
-                else:
-                    log_message("Папка расширения CyberYozh не найдена (extensions/cyberyozh), пропускаем загрузку")
-            except Exception as e:
-                log_message(f"Ошибка загрузки расширения: {e}", "ERROR")
-
-            # Получаем координаты для геолокации из GEO данных прокси
-            geolocation = None
-            if proxy_ip:
-                try:
-                    proxy_geo = get_proxy_info(proxy_ip)
-                    if "latitude" in proxy_geo and "longitude" in proxy_geo:
-                        geolocation = {
-                            "latitude": proxy_geo["latitude"],
-                            "longitude": proxy_geo["longitude"]
-                        }
-                        log_message(f"Геолокация установлена: {geolocation}")
-                except Exception as e:
-                    log_message(f"Ошибка получения координат: {e}", "ERROR")
-            
-            # Формируем Accept-Language заголовок
-            accept_language = f"{lang},{lang.split('-')[0]};q=0.9,en-US;q=0.8,en;q=0.7"
-            
-            # Используем persistent context если нужно закрепить расширение
-            if temp_user_data:
-                context = await p.chromium.launch_persistent_context(
-                    temp_user_data,
-                    headless=False,
-                    args=args,
-                    user_agent=user_agent,
-                    viewport={"width": width, "height": height},
-                    locale=lang,
-                    timezone_id=timezone,
-                    geolocation=geolocation,
-                    permissions=["geolocation"] if geolocation else None,
-                    extra_http_headers={"Accept-Language": accept_language},
-                    proxy=proxy_settings if proxy_settings else None
-                )
-                browser = None  # При persistent context нет отдельного объекта browser
-            else:
-                browser = await p.chromium.launch(headless=False, args=args)
-                context = await browser.new_context(
-                    user_agent=user_agent,
-                    viewport={"width": width, "height": height},
-                    locale=lang,
-                    timezone_id=timezone,
-                    has_touch=is_touch,
-                    geolocation=geolocation,
-                    permissions=["geolocation"] if geolocation else None,
-                    extra_http_headers={"Accept-Language": accept_language},
-                    proxy=proxy_settings if proxy_settings else None
-                )
-            
-            # Добавляем скрипты для маскировки
-            await context.add_init_script(f"""
-                Object.defineProperty(navigator, 'vendor', {{
-                    get: function() {{
-                        return '{vendor}';
-                    }}
-                }});
-            """)
-            
-            await context.add_init_script(f"""
-                Object.defineProperty(navigator, 'hardwareConcurrency', {{
-                    get: function() {{
-                        return {cpu};
-                    }}
-                }});
-            """)
-            
-            await context.add_init_script(f"""
-                Object.defineProperty(navigator, 'deviceMemory', {{
-                    get: function() {{
-                        return {ram};
-                    }}
-                }});
-            """)
-            
-            # Маскировка языков
-            await context.add_init_script(f"""
-                Object.defineProperty(navigator, 'language', {{
-                    get: function() {{
-                        return '{lang}';
-                    }}
-                }});
-                Object.defineProperty(navigator, 'languages', {{
-                    get: function() {{
-                        return ['{lang}', '{lang.split("-")[0]}', 'en-US', 'en'];
-                    }}
-                }});
-            """)
-            
-            # Блокировка WebRTC утечек IP
-            await context.add_init_script("""
-                // Отключаем enumerateDevices для WebRTC
-                if (navigator.mediaDevices && navigator.mediaDevices.enumerateDevices) {
-                    navigator.mediaDevices.enumerateDevices = function() {
-                        return Promise.resolve([]);
-                    };
-                }
-                
-                // Переопределяем RTCPeerConnection для маскировки IP
-                const original_RTCPeerConnection = window.RTCPeerConnection || window.webkitRTCPeerConnection || window.mozRTCPeerConnection;
-                if (original_RTCPeerConnection) {
-                    window.RTCPeerConnection = function(...args) {
-                        const pc = new original_RTCPeerConnection(...args);
-                        const original_createOffer = pc.createOffer;
-                        pc.createOffer = function() {
-                            return Promise.reject(new Error('WebRTC is disabled'));
-                        };
-                        return pc;
-                    };
-                }
-            """)
-            
-            # Загрузка cookies
-            cookies_parsed = []
-            if cookies and not os.path.isfile(os.path.join(COOKIES_DIR, profile)):
-                try:
-                    with open(cookies, "r", encoding="utf-8") as f:
-                        cookies_content = f.read()
-                        try:
-                            cookies_parsed = json.loads(cookies_content)
-                        except json.decoder.JSONDecodeError:
-                            cookies_parsed = parse_netscape_cookies(cookies_content)
-                except Exception as e:
-                    log_message(f"Ошибка загрузки cookies из файла: {str(e)}", "ERROR")
-                    
-            elif os.path.exists(os.path.join(COOKIES_DIR, profile)):
-                try:
-                    with open(os.path.join(COOKIES_DIR, profile), "r", encoding="utf-8") as f:
-                        cookies_parsed = json.loads(f.read())
-                except Exception as e:
-                    log_message(f"Ошибка загрузки сохраненных cookies: {str(e)}", "ERROR")
-                    cookies_parsed = []
-            
-            # Добавляем cookies в контекст
-            for cookie in cookies_parsed:
-                try:
-                    cookie["sameSite"] = "Strict"
-                    await context.add_cookies([cookie])
-                except Exception as e:
-                    log_message(f"Ошибка добавления cookie: {str(e)}", "ERROR")
-            
-            page = await context.new_page()
-            await page.evaluate("navigator.__proto__.webdriver = undefined;")
-            
-            # Показываем уведомление об успешном запуске
-            if notification_system:
-                notification_system.show_notification(
-                    "Браузер запущен", 
-                    f"Профиль '{profile}' успешно загружен", 
-                    "success"
-                )
-            
-            # Открываем вкладку whoer.net автоматически при старте профиля (после загрузки cookies)
-            try:
-                await page.goto("https://whoer.net/", timeout=30000, wait_until="domcontentloaded")
-                log_message("Открыта вкладка whoer.net")
-            except Exception as e:
-                log_message(f"Не удалось открыть whoer.net: {e}", "ERROR")
-                # В случае ошибки переходим на пустую страницу
-                try:
-                    await page.goto("about:blank", timeout=60000)
-                except Exception as e2:
-                    log_message(f"Не удалось открыть about:blank: {e2}", "ERROR")
-            
-            try:
-                await page.wait_for_event("close", timeout=0)
-            finally:
-                if proxy_task:
-                    proxy_task.cancel()
-                await save_cookies(context, profile)
-                
-                # Очищаем временную директорию
-                if temp_user_data:
-                    try:
-                        shutil.rmtree(temp_user_data, ignore_errors=True)
-                        log_message(f"Временная директория удалена: {temp_user_data}")
-                    except Exception as e:
-                        log_message(f"Не удалось удалить временную директорию: {e}", "ERROR")
-                
-                if notification_system:
-                    notification_system.show_notification(
-                        "Браузер закрыт", 
-                        f"Профиль '{profile}' завершен, cookies сохранены", 
-                        "info"
-                    )
-                    
-    except Exception as e:
-        log_message(f"Критическая ошибка браузера: {str(e)}", "ERROR")
-        if notification_system:
-            notification_system.show_notification(
-                "Критическая ошибка", 
-                f"Не удалось запустить браузер: {str(e)}", 
-                "error"
-            )
-
-# Улучшенная функция проверки прокси
-async def check_proxy_async(proxy: str) -> dict:
-    """Асинхронная проверка прокси: корректная поддержка HTTP/HTTPS и SOCKS5 (без использования кэша)"""
-    log_message(f"Проверяем прокси: {proxy}")
-    
-    # Всегда выполняем живую проверку; кэш не используем для чтения
-    
-    # Парсинг прокси
-    try:
-        if "://" in proxy:
-            protocol = proxy.split("://")[0]
-            rest = proxy.split("://")[1]
-        else:
-            protocol = "http"
-            rest = proxy
-            
-        if "@" in rest:
-            auth_part, server_part = rest.split("@", 1)
-            if ":" in auth_part:
-                username, password = auth_part.split(":", 1)
-            else:
-                username, password = auth_part, ""
-        else:
-            username, password = "", ""
-            server_part = rest
-            
-        if ":" in server_part:
-            ip, port = server_part.split(":", 1)
-            port = int(port)
-        else:
-            ip = server_part
-            port = 8080
-            
-    except Exception as e:
-        log_message(f"Ошибка парсинга прокси {proxy}: {str(e)}", "ERROR")
-        result = {"status": "error", "proxy_str": proxy, "error": f"Ошибка парсинга: {str(e)}"}
-        _proxy_check_cache[proxy] = result
-        return result
-    
-    # Формируем строку прокси
-    if username and password:
-        proxy_str = f"{protocol}://{username}:{password}@{ip}:{port}"
-    else:
-        proxy_str = f"{protocol}://{ip}:{port}"
-        
-    # Корректная поддержка SOCKS5 для requests (требует PySocks)
-    proxy_dict = {}
-    if protocol.startswith("socks"):
-        # Use socks5h to resolve DNS via proxy; normalize socks5_http -> socks5h
-        normalized = proxy_str.replace("socks5_http://", "socks5h://").replace("socks5://", "socks5h://")
-        proxy_dict = {
-            "http": normalized,
-            "https": normalized
-        }
-    else:
-        proxy_dict = {
-            "http": proxy_str,
-            "https": proxy_str
-        }
-    
-    # Список сервисов для проверки: сначала HTTP, затем HTTPS (уменьшаем блокировки)
-    check_services = [
-        ("http://api.ipify.org?format=json", "ip"),
-        ("https://api.ipify.org?format=json", "ip"),
-        ("http://httpbin.org/ip", "origin"),
-        ("https://httpbin.org/ip", "origin"),
-        ("http://checkip.amazonaws.com", None),
-        ("https://checkip.amazonaws.com", None),
-    ]
-    
-    # Проверяем прокси с повторными попытками
-    for attempt in range(3):
-        try:
-            for service_url, ip_field in check_services:
-                try:
-                    start_time = time.time()
-                    response = requests.get(
-                        service_url, 
-                        proxies=proxy_dict, 
-                        timeout=8,
-                        headers={'User-Agent': 'Antic Browser v1.0.0'}
-                    )
-                    latency = time.time() - start_time
-                    
-                    if response.status_code == 200:
-                        # Парсим IP в зависимости от сервиса
-                        try:
-                            if ip_field:
-                                data = response.json()
-                                returned_ip = data.get(ip_field, ip)
-                            else:
-                                returned_ip = response.text.strip()
-                        except:
-                            returned_ip = ip
-                        
-                        # Получаем геоданные - используем локальную базу GeoIP
-                        country = "UNK"
-                        city = "UNK"
-                        
-                        try:
-                            with geoip2.database.Reader(COUNTRY_DATABASE_PATH) as reader:
-                                geo_response = reader.country(returned_ip)
-                                country = geo_response.country.iso_code or "UNK"
-                            with geoip2.database.Reader(CITY_DATABASE_PATH) as reader:
-                                geo_response = reader.city(returned_ip)
-                                city = geo_response.city.name or "UNK"
-                        except Exception as _:
-                            pass
-                        
-                        result = {
-                            "status": "ok", 
-                            "country": country, 
-                            "city": city, 
-                            "type": protocol, 
-                            "proxy_str": proxy_str, 
-                            "latency": latency,
-                            "ip": returned_ip
-                        }
-                        
-                        _proxy_check_cache[proxy] = result
-                        
-                        # Сохраняем кэш
-                        try:
-                            with open(PROXY_CACHE_PATH, "w", encoding="utf-8") as f:
-                                json.dump(_proxy_check_cache, f, indent=4)
-                        except Exception as e:
-                            log_message(f"Ошибка сохранения кэша: {str(e)}", "ERROR")
-                            
-                        log_message(f"Прокси работает: {country}, {city}, IP: {returned_ip}, время: {latency:.2f}с")
-                        return result
-                        
-                except (requests.exceptions.RequestException, requests.exceptions.Timeout) as err:
-                    log_message(f"Ошибка запроса через прокси: {err}", "ERROR")
-                    # Пробуем следующий сервис
-                    continue
-            
-            # Если все сервисы не сработали, небольшая пауза
-            if attempt < 2:
-                await asyncio.sleep(1.5)
-                
-        except Exception as e:
-            log_message(f"Ошибка проверки на попытке {attempt + 1}: {str(e)}", "ERROR")
-            if attempt < 2:
-                await asyncio.sleep(1.5)
-    
-    # Если дошли сюда, значит все попытки неудачны
-    result = {"status": "error", "proxy_str": proxy_str, "error": "Прокси не отвечает или блокирует подключение"}
-    _proxy_check_cache[proxy] = result
-    
-    try:
-        with open(PROXY_CACHE_PATH, "w", encoding="utf-8") as f:
-            json.dump(_proxy_check_cache, f, indent=4)
-    except:
-        pass
-    
-    log_message(f"Прокси не работает: {proxy_str}", "ERROR")
-    return result
-
 def show_snackbar(page: ft.Page, message: str, color: ft.Colors = ft.Colors.BLUE):
     """Улучшенная функция показа snackbar"""
     try:
@@ -1565,51 +418,6 @@ def show_snackbar(page: ft.Page, message: str, color: ft.Colors = ft.Colors.BLUE
     except Exception as e:
         log_message(f"Ошибка показа snackbar: {str(e)}", "ERROR")
 
-def get_proxy():
-    """Получение списка прокси из файла"""
-    proxies = []
-    if os.path.isfile(PROXIES_FILE):
-        try:
-            with open(PROXIES_FILE, "r", encoding="utf-8") as f:
-                proxies = json.load(f)
-            log_message(f"Загружено {len(proxies)} прокси")
-        except Exception as e:
-            log_message(f"Ошибка загрузки прокси: {str(e)}", "ERROR")
-            proxies = []
-    else:
-        log_message("Файл прокси не найден")
-    return proxies
-
-def save_proxy_to_file(proxy_str: str):
-    """Сохранение прокси в файл"""
-    try:
-        proxies = get_proxy()
-        if proxy_str not in proxies:
-            proxies.append(proxy_str)
-            with open(PROXIES_FILE, "w", encoding="utf-8") as f:
-                json.dump(proxies, f, indent=4)
-            log_message(f"Прокси добавлен: {proxy_str}")
-            return True
-        return False
-    except Exception as e:
-        log_message(f"Ошибка сохранения прокси: {str(e)}", "ERROR")
-        return False
-
-def remove_proxy_from_file(proxy_str: str):
-    """Удаление прокси из файла"""
-    try:
-        proxies = get_proxy()
-        if proxy_str in proxies:
-            proxies.remove(proxy_str)
-            with open(PROXIES_FILE, "w", encoding="utf-8") as f:
-                json.dump(proxies, f, indent=4)
-            log_message(f"Прокси удален: {proxy_str}")
-            return True
-        return False
-    except Exception as e:
-        log_message(f"Ошибка удаления прокси: {str(e)}", "ERROR")
-        return False
-
 # Улучшенная функция обновления страницы
 def refresh_proxies_page():
     """Обновление страницы прокси с защитой от ошибок"""
@@ -1704,7 +512,7 @@ def save_proxy(page: ft.Page, add_button: ft.ElevatedButton):
     add_button.content = ft.ProgressRing(width=16, height=16, color=ft.Colors.WHITE)
     page.update()
     
-    def save_async():
+    async def save_async():
         try:
             ip = proxy_fields['ip'].value.strip() if proxy_fields['ip'].value else ""
             port = proxy_fields['port'].value.strip() if proxy_fields['port'].value else ""
@@ -1765,7 +573,7 @@ def save_proxy(page: ft.Page, add_button: ft.ElevatedButton):
                     show_snackbar(page, f"Прокси не добавлен: {error_msg}", ft.Colors.RED)
             
             # Запускаем асинхронную проверку
-            asyncio.run(check_and_save())
+            await check_and_save()
             
         except Exception as e:
             log_message(f"Ошибка сохранения прокси: {str(e)}", "ERROR")
@@ -1775,8 +583,8 @@ def save_proxy(page: ft.Page, add_button: ft.ElevatedButton):
             add_button.content = original_content
             page.update()
     
-    # Запускаем в отдельном потоке
-    threading.Thread(target=save_async, daemon=True).start()
+    # Запускаем в общем цикле проверок прокси
+    submit_check(save_async())
 
 # Улучшенная функция удаления прокси
 def delete_proxy(proxy: str, page: ft.Page):
@@ -1805,7 +613,7 @@ def check_proxy_button(proxy: str, page: ft.Page, button: ft.ElevatedButton):
     button.content = ft.ProgressRing(width=16, height=16, color=ft.Colors.WHITE)
     page.update()
     
-    def check_async():
+    async def check_async():
         try:
             # Асинхронная проверка
             async def check_and_update():
@@ -1823,7 +631,7 @@ def check_proxy_button(proxy: str, page: ft.Page, button: ft.ElevatedButton):
                 refresh_proxies_page()
             
             # Запускаем проверку
-            asyncio.run(check_and_update())
+            await check_and_update()
             
         except Exception as e:
             log_message(f"Ошибка проверки прокси: {str(e)}", "ERROR")
@@ -1833,8 +641,172 @@ def check_proxy_button(proxy: str, page: ft.Page, button: ft.ElevatedButton):
             button.content = original_content
             page.update()
     
-    # Запускаем в отдельном потоке
-    threading.Thread(target=check_async, daemon=True).start()
+    # Запускаем в общем цикле проверок прокси: без отдельного потока на каждый прокси
+    submit_check(check_async())
+
+PROXY_CHECK_STAGES = {
+    "parse": "некорректная строка",
+    "tcp": "порт недоступен",
+    "handshake": "ошибка рукопожатия",
+    "egress": "нет выхода в интернет",
+}
+
+# Фазы задержки проверки в порядке выполнения
+PROXY_TIMING_PHASES = {
+    "dns": "DNS",
+    "connect": "TCP",
+    "handshake": "рукопожатие",
+    "tls": "TLS",
+    "ttfb": "ответ сервиса",
+}
+
+def proxy_timings_tooltip(result: dict):
+    """Подсказка с разбивкой задержки по фазам (None, если данных нет)"""
+    timings = result.get("timings") or {}
+    lines = [f"{title[:1].upper() + title[1:]}: {timings[phase] * 1000:.0f} мс" for phase, title in PROXY_TIMING_PHASES.items() if phase in timings]
+    if "total" in timings:
+        lines.append(f"Запрос через прокси: {timings['total'] * 1000:.0f} мс")
+    if result.get("checked_at"):
+        lines.append(f"Проверено: {time.strftime('%d.%m %H:%M', time.localtime(result['checked_at']))}")
+    return "\n".join(lines) or None
+
+def describe_proxy_result(proxy: str, result: dict):
+    """Текст строки прокси, иконка и цвет статуса по результату проверки"""
+    display_text = f"{result.get('country', 'UNK')} | {result.get('city', 'UNK')} | {result.get('type', proxy.split('://')[0])}"
+    if result["status"] == "error":
+        display_text = f"Не работает | {proxy.split('://')[0]}"
+        # Уровень проверки, на котором прокси отвалился
+        stage_title = PROXY_CHECK_STAGES.get(result.get("stage"))
+        if stage_title:
+            display_text += f" | {stage_title}"
+    
+    latency = result.get('latency')
+    if latency and isinstance(latency, (int, float)):
+        display_text += f" | {latency:.2f}с"
+        # Самая долгая фаза - видно, тормозит прокси или сервис проверки
+        phases = {phase: value for phase, value in result.get("timings", {}).items() if phase in PROXY_TIMING_PHASES}
+        if phases:
+            slowest = max(phases, key=phases.get)
+            display_text += f" ({PROXY_TIMING_PHASES[slowest]} {phases[slowest]:.2f}с)"
+    
+    # Оценка качества по истории проверок
+    score = proxy_score(result)
+    if score is not None:
+        display_text += f" | ★ {score:.0f}"
+    
+    # Скорость, если её замеряли
+    throughput = result.get("throughput")
+    if throughput and throughput.get("download"):
+        display_text += f" | ↓ {throughput['download'] * 8 / 1_000_000:.1f} Мбит/с"
+        if throughput.get("upload"):
+            display_text += f" ↑ {throughput['upload'] * 8 / 1_000_000:.1f}"
+    
+    if result["status"] == "ok":
+        # Давно не перепроверялся - не показываем как заведомо рабочий
+        if result_is_stale(result):
+            return display_text, ft.Icons.SCHEDULE, ft.Colors.ORANGE
+        return display_text, ft.Icons.CHECK_CIRCLE, ft.Colors.GREEN
+    if result["status"] == "error":
+        return display_text, ft.Icons.ERROR, ft.Colors.RED
+    return display_text, ft.Icons.HELP_OUTLINE, ft.Colors.GREY
+
+# Замер скорости прокси с кнопки
+def measure_speed_button(proxy: str, page: ft.Page, button: ft.ElevatedButton):
+    """Замер скорости загрузки/отдачи через прокси"""
+    log_message(f"Замеряем скорость прокси с кнопки: {proxy}")
+    
+    original_content = button.content
+    button.content = ft.ProgressRing(width=16, height=16, color=ft.Colors.WHITE)
+    page.update()
+    
+    async def measure_async():
+        try:
+            result = await measure_proxy_throughput(proxy)
+            if result["status"] == "ok":
+                download = (result.get("download") or 0) * 8 / 1_000_000
+                upload = (result.get("upload") or 0) * 8 / 1_000_000
+                jitter = result.get("jitter", 0) * 8 / 1_000_000
+                show_snackbar(page, f"Скорость: загрузка {download:.1f} Мбит/с, отдача {upload:.1f} Мбит/с, разброс ±{jitter:.1f}", ft.Colors.GREEN)
+            else:
+                show_snackbar(page, result.get("error", "Не удалось замерить скорость"), ft.Colors.RED)
+            refresh_proxies_page()
+        except Exception as e:
+            log_message(f"Ошибка замера скорости: {str(e)}", "ERROR")
+            show_snackbar(page, f"Ошибка замера скорости: {str(e)}", ft.Colors.RED)
+        finally:
+            button.content = original_content
+            page.update()
+    
+    submit_check(measure_async())
+
+# Массовая проверка всех прокси из списка
+def update_proxy_row(page: ft.Page, proxy: str, result: dict):
+    """Обновление строки прокси в списке (без page.update); False, если строки нет"""
+    row = getattr(page, 'proxy_rows', {}).get(proxy)
+    if not row:
+        return False
+    title_text, status_icon = row
+    title_text.value, status_icon.name, status_icon.color = describe_proxy_result(proxy, result)
+    title_text.tooltip = proxy_timings_tooltip(result)
+    return True
+
+def check_all_proxies(page: ft.Page, button: ft.ElevatedButton, progress_text: ft.Text):
+    """Проверка всех прокси с прогрессом; строки списка обновляются по мере готовности"""
+    proxies = get_proxy()
+    if not proxies:
+        show_snackbar(page, "Нет прокси для проверки", ft.Colors.ORANGE)
+        return
+    
+    button.disabled = True
+    progress_text.value = f"Проверено 0 из {len(proxies)}"
+    page.update()
+    last_update = {"time": 0.0}
+    pending = {}
+    # Колбэки приходят из потока проверок - элементы UI меняем в потоке страницы (page.run_thread)
+    ui_lock = threading.Lock()
+    shown = {"done": 0}
+    
+    def apply_progress(results, done, total):
+        with ui_lock:
+            for proxy, result in results.items():
+                update_proxy_row(page, proxy, result)
+            if done >= shown["done"]:
+                shown["done"] = done
+                progress_text.value = f"Проверено {done} из {total}"
+            page.update()
+    
+    def finish_check(message, color):
+        with ui_lock:
+            button.disabled = False
+            page.update()
+        if message:
+            show_snackbar(page, message, color)
+    
+    def on_result(proxy, result):
+        pending[proxy] = result
+    
+    def on_progress(done, total):
+        # Перерисовываем не чаще 4 раз в секунду - при сотнях прокси UI не захлёбывается
+        now = time.time()
+        if done == total or now - last_update["time"] >= 0.25:
+            last_update["time"] = now
+            results = dict(pending)
+            pending.clear()
+            page.run_thread(apply_progress, results, done, total)
+    
+    async def run_check():
+        message, color = None, ft.Colors.GREEN
+        try:
+            results = await check_proxies_bulk(proxies, on_result, on_progress)
+            working = sum(1 for result in results.values() if result.get("status") == "ok")
+            message = f"Проверка завершена: работает {working} из {len(results)}"
+        except Exception as e:
+            log_message(f"Ошибка массовой проверки: {str(e)}", "ERROR")
+            message, color = f"Ошибка проверки: {str(e)}", ft.Colors.RED
+        finally:
+            page.run_thread(finish_check, message, color)
+    
+    submit_check(run_check())
 
 def open_api_help_url(e):
     """Открытие ссылки на получение API ключа с исправленным URL"""
@@ -2065,9 +1037,8 @@ def open_sx_org_page(page: ft.Page):
                     
                     if success:
                         show_snackbar(page, f"Прокси созданы! {len(result)} шт.", ft.Colors.GREEN)
-                        # Добавляем созданные прокси в список
-                        for proxy_str in result:
-                            save_proxy_to_file(proxy_str)
+                        # Добавляем созданные прокси в список одной транзакцией и ставим в проверку
+                        import_proxies(result, provider="sx", check=True)
                         
                         # Обновляем страницу прокси
                         refresh_proxies_page()
@@ -2240,16 +1211,18 @@ def open_sx_org_page(page: ft.Page):
             
             def import_async():
                 try:
-                    imported_count = 0
-                    
-                    for proxy_str in selected_proxies.values():
-                        if save_proxy_to_file(proxy_str):
-                            imported_count += 1
+                    # Одна транзакция на весь список; новые прокси сразу уходят в фоновую проверку
+                    report = import_proxies(selected_proxies.values(), provider="sx", check=True)
+                    imported_count = len(report["inserted"])
                     
+                    # Заведомо нерабочие эндпоинты (circuit breaker) и некорректные строки не импортируются
+                    skipped = report["dead"] + len(report["invalid"])
+                    if skipped:
+                        show_snackbar(page, f"Пропущено: нерабочих {report['dead']}, некорректных {len(report['invalid'])}", ft.Colors.ORANGE)
                     if imported_count > 0:
-                        show_snackbar(page, f"Импортировано {imported_count} прокси!", ft.Colors.GREEN)
+                        show_snackbar(page, f"Импортировано {imported_count} прокси (дублей: {report['duplicates']})", ft.Colors.GREEN)
                         refresh_proxies_page()
-                    else:
+                    elif not skipped:
                         show_snackbar(page, "Все выбранные прокси уже существуют", ft.Colors.ORANGE)
                 except Exception as ex:
                     log_message(f"Ошибка импорта прокси: {str(ex)}", "ERROR")
@@ -3104,16 +2077,18 @@ def open_cyberyozh_page(page: ft.Page):
             
             def import_async():
                 try:
-                    imported_count = 0
-                    
-                    for proxy_str in selected_proxies.values():
-                        if save_proxy_to_file(proxy_str):
-                            imported_count += 1
+                    # Одна транзакция на весь список; новые прокси сразу уходят в фоновую проверку
+                    report = import_proxies(selected_proxies.values(), provider="cyberyozh", check=True)
+                    imported_count = len(report["inserted"])
                     
+                    # Заведомо нерабочие эндпоинты (circuit breaker) и некорректные строки не импортируются
+                    skipped = report["dead"] + len(report["invalid"])
+                    if skipped:
+                        show_snackbar(page, f"Пропущено: нерабочих {report['dead']}, некорректных {len(report['invalid'])}", ft.Colors.ORANGE)
                     if imported_count > 0:
-                        show_snackbar(page, f"Импортировано {imported_count} прокси!", ft.Colors.GREEN)
+                        show_snackbar(page, f"Импортировано {imported_count} прокси (дублей: {report['duplicates']})", ft.Colors.GREEN)
                         hide_interface()
-                    else:
+                    elif not skipped:
                         show_snackbar(page, "Все выбранные прокси уже существуют", ft.Colors.ORANGE)
                 except Exception as ex:
                     log_message(f"Ошибка импорта прокси: {str(ex)}", "ERROR")
@@ -3339,18 +2314,19 @@ def get_proxies_content(page: ft.Page):
         
         # Создаем список прокси
         proxies = []
-        for proxy in get_proxy():
+        proxy_check_cache = get_proxy_check_cache()
+        # Элементы строк по прокси - для обновления на месте при массовой проверке
+        page.proxy_rows = {}
+        # Лучшие по оценке качества - сверху
+        for proxy in rank_proxies(get_proxy(), proxy_check_cache):
             try:
-                if proxy in _proxy_check_cache:
-                    result = _proxy_check_cache[proxy]
+                if proxy in proxy_check_cache:
+                    result = proxy_check_cache[proxy]
                 else:
                     result = {"status": "unchecked", "country": "UNK", "city": "UNK", "type": proxy.split("://")[0], "proxy_str": proxy}
                 
-                status_icon = ft.Icon(
-                    ft.Icons.CHECK_CIRCLE if result["status"] == "ok" else ft.Icons.ERROR if result["status"] == "error" else ft.Icons.HELP_OUTLINE,
-                    color=ft.Colors.GREEN if result["status"] == "ok" else ft.Colors.RED if result["status"] == "error" else ft.Colors.GREY,
-                    size=20
-                )
+                display_text, icon, color = describe_proxy_result(proxy, result)
+                status_icon = ft.Icon(icon, color=color, size=20)
                 
                 check_button = ft.ElevatedButton(
                     "Проверить",
@@ -3364,20 +2340,13 @@ def get_proxies_content(page: ft.Page):
                     on_click=lambda e, p=proxy: check_proxy_button(p, page, e.control)
                 )
                 
-                display_text = f"{result.get('country', 'UNK')} | {result.get('city', 'UNK')} | {result.get('type', proxy.split('://')[0])}"
-                if result["status"] == "error":
-                    display_text = f"Не работает | {proxy.split('://')[0]}"
-                
-                latency_text = ""
-                if result.get('latency'):
-                    latency = result['latency']
-                    if isinstance(latency, (int, float)):
-                        latency_text = f" | {latency:.2f}с"
+                title_text = ft.Text(display_text, size=14, weight=ft.FontWeight.W_500, tooltip=proxy_timings_tooltip(result))
+                page.proxy_rows[proxy] = (title_text, status_icon)
                 
                 proxy_row = ft.Container(
                     content=ft.Row([
                         ft.Column([
-                            ft.Text(display_text + latency_text, size=14, weight=ft.FontWeight.W_500),
+                            title_text,
                             ft.Text(proxy[:50] + "..." if len(proxy) > 50 else proxy, size=12, color=ft.Colors.GREY_600)
                         ], expand=True),
                         ft.Row([
@@ -3392,6 +2361,17 @@ def get_proxies_content(page: ft.Page):
                                 ),
                                 on_click=lambda e, p=proxy: delete_proxy(p, page)
                             ),
+                            ft.ElevatedButton(
+                                "Скорость",
+                                bgcolor=ft.Colors.TEAL,
+                                color=ft.Colors.WHITE,
+                                style=ft.ButtonStyle(
+                                    padding=ft.padding.all(10),
+                                    text_style=ft.TextStyle(size=13),
+                                    shape=ft.RoundedRectangleBorder(radius=8)
+                                ),
+                                on_click=lambda e, p=proxy: measure_speed_button(p, page, e.control)
+                            ),
                             check_button,
                             status_icon
                         ], spacing=10)
@@ -3455,6 +2435,22 @@ def get_proxies_content(page: ft.Page):
             expand=True  # растягивается по ширине
         )
 
+        # Массовая проверка всего списка
+        check_all_progress = ft.Text("", size=13, color=ft.Colors.GREY_600)
+        check_all_button = ft.ElevatedButton(
+            content=ft.Row([
+                ft.Icon(ft.Icons.PLAYLIST_ADD_CHECK, color=ft.Colors.WHITE, size=16),
+                ft.Text("Проверить все", color=ft.Colors.WHITE, size=13)
+            ], spacing=6, alignment=ft.MainAxisAlignment.CENTER),
+            bgcolor=ft.Colors.BLUE,
+            style=ft.ButtonStyle(
+                padding=ft.padding.all(10),
+                shape=ft.RoundedRectangleBorder(radius=8)
+            ),
+            on_click=lambda e: check_all_proxies(page, e.control, check_all_progress),
+            disabled=not proxies
+        )
+        
         # Маленькая текстовая кнопка PSB (как ссылка)
         psb_button = ft.TextButton(
             content=ft.Row([
@@ -3502,7 +2498,10 @@ def get_proxies_content(page: ft.Page):
                 # Список прокси
                 ft.Container(
                     content=ft.Column([
-                        ft.Text(f"Список прокси ({len(proxies)})", size=18, weight=ft.FontWeight.W_600, color=ft.Colors.BLACK87),
+                        ft.Row([
+                            ft.Text(f"Список прокси ({len(proxies)})", size=18, weight=ft.FontWeight.W_600, color=ft.Colors.BLACK87),
+                            ft.Row([check_all_progress, check_all_button], spacing=10)
+                        ], alignment=ft.MainAxisAlignment.SPACE_BETWEEN),
                         ft.Container(height=15),
                         ft.Column(
                             controls=proxies if proxies else [
@@ -3608,6 +2607,7 @@ def main(page: ft.Page):
     global main_page_ref, notification_system
     main_page_ref = page
     
+    startup_profiler.mark("ft_app")
     log_message("Запуск главной функции...")
     
     try:
@@ -3619,6 +2619,7 @@ def main(page: ft.Page):
         
         # Инициализируем систему уведомлений
         notification_system = NotificationSystem(page)
+        set_notification_handler(notification_system.show_notification)
         
         log_message("Настройки страницы установлены")
         
@@ -3640,25 +2641,68 @@ def main(page: ft.Page):
         # Запускаем проверку обновлений в отдельном потоке
         threading.Thread(target=check_updates_background, daemon=True).start()
         
+        # Обновляем список User Agents в фоне (по истечении TTL кэша)
+        threading.Thread(target=refresh_user_agents, daemon=True).start()
+        
+        # Загружаем недостающие базы GeoIP в фоне, прогресс - через уведомления
+        def provision_geo_background():
+            provision_geo_databases(notification_system.show_notification)
+            # Таблица IP-диапазонов для пакетного GEO при импорте прокси: готовим здесь,
+            # а не при первом импорте (построение занимает десятки секунд)
+            get_ip_range_table()
+        
+        threading.Thread(target=provision_geo_background, daemon=True).start()
+        
+        # Обновлённые файлы баз GeoIP подхватываются без перезапуска
+        geo_service.start_watching()
+        
+        # Хосты прокси резолвятся заранее: проверки, мост pproxy и GEO берут IP из DNS-кэша.
+        # В фоне: список читается из базы прокси (открытие, миграция proxies.json) - не до первой отрисовки
+        threading.Thread(target=prefetch_proxy_hosts, daemon=True).start()
+        
+        # Фоновая перепроверка прокси по TTL; строки списка обновляются по мере готовности
+        monitor_update = {"time": 0.0, "timer": None}
+        monitor_lock = threading.Lock()
+        
+        def flush_monitor_update():
+            with monitor_lock:
+                monitor_update["timer"] = None
+                monitor_update["time"] = time.time()
+            page.update()
+        
+        def apply_monitor_result(proxy, result):
+            if update_proxy_row(page, proxy, result):
+                with monitor_lock:
+                    wait = monitor_update["time"] + 0.25 - time.time()
+                    if wait > 0:
+                        # Пропущенную перерисовку откладываем, а не теряем: иначе последние
+                        # строки пачки висят неотрисованными до чужого page.update()
+                        if monitor_update["timer"] is None:
+                            timer = threading.Timer(wait, page.run_thread, args=(flush_monitor_update,))
+                            timer.daemon = True
+                            monitor_update["timer"] = timer
+                            timer.start()
+                        return
+                    monitor_update["time"] = time.time()
+                page.update()
+        
+        def on_monitor_result(proxy, result):
+            # Монитор вызывает из потока проверок - строку меняем в потоке страницы
+            page.run_thread(apply_monitor_result, proxy, result)
+        
+        proxy_monitor.add_listener(on_monitor_result)
+        proxy_monitor.start()
+        
         def config_load(profile: str):
             """Загрузка конфигурации с улучшенной обработкой"""
             log_message(f"Загружаем конфигурацию: {profile}")
             try:
-                config_file = os.path.join(CONFIG_DIR, profile)
-                with open(config_file, "r", encoding="utf-8") as f:
-                    config = json.load(f)
-                
-                user_agent = config["user-agent"] if config["user-agent"] else random.choice(USER_AGENTS)
+                config = load_profile(profile)
                 log_message("Конфигурация загружена, запускаем браузер...")
                 
                 # Запускаем браузер в отдельном потоке
                 def run_browser_thread():
-                    asyncio.run(run_browser(
-                        user_agent, config["screen_height"], config["screen_width"], 
-                        config["timezone"], config["lang"], config["proxy"], 
-                        config["cookies"], config["webgl"], config["vendor"], 
-                        config["cpu"], config["ram"], config["is_touch"], profile
-                    ))
+                    asyncio.run(launch_profile(profile, config))
                 
                 threading.Thread(target=run_browser_thread, daemon=True).start()
                 
@@ -3670,8 +2714,7 @@ def main(page: ft.Page):
             """Удаление профиля с улучшенной обработкой"""
             log_message(f"Удаляем профиль: {profile}")
             try:
-                config_file = os.path.join(CONFIG_DIR, profile)
-                os.remove(config_file)
+                remove_profile(profile)
                 page.controls.clear()
                 page.controls = get_config_content()
                 page.update()
@@ -3687,12 +2730,10 @@ def main(page: ft.Page):
             configs = []
             
             try:
-                for cfg in os.listdir(CONFIG_DIR):
+                for cfg in list_profiles():
                     if cfg.endswith('.json'):
                         try:
-                            config_file = os.path.join(CONFIG_DIR, cfg)
-                            with open(config_file, "r", encoding="utf-8") as f:
-                                config = json.load(f)
+                            config = load_profile(cfg)
                             
                             config_row = ft.Container(
                                 content=ft.Row([
@@ -3789,7 +2830,7 @@ def main(page: ft.Page):
             log_message("Сохраняем конфигурацию...")
             try:
                 profile_name = config_fields['profile_name'].value
-                user_agent_value = config_fields['user_agent'].value if config_fields['user_agent'].value else random.choice(USER_AGENTS)
+                user_agent_value = config_fields['user_agent'].value if config_fields['user_agent'].value else random.choice(get_user_agents())
                 screen_value = config_fields['screen'].value if config_fields['screen'].value else "1920×1080"
                 timezone_value = config_fields['timezone'].value if config_fields['timezone'].value else "Europe/Moscow"
                 language_value = config_fields['language'].value if config_fields['language'].value else "ru-RU"
@@ -3803,22 +2844,20 @@ def main(page: ft.Page):
                 
                 log_message(f"Сохраняем профиль: {profile_name}")
                 
-                config_file = os.path.join(CONFIG_DIR, f"{profile_name}.json")
-                with open(config_file, "w", encoding="utf-8") as f:
-                    json.dump({
-                        "user-agent": user_agent_value,
-                        "screen_height": int(screen_value.split("×")[1]),
-                        "screen_width": int(screen_value.split("×")[0]),
-                        "timezone": timezone_value,
-                        "lang": language_value,
-                        "proxy": proxy_value,
-                        "cookies": cookies_value,
-                        "webgl": webgl_value,
-                        "vendor": vendor_value,
-                        "cpu": cpu_threads_value,
-                        "ram": ram_value,
-                        "is_touch": is_touch_value
-                    }, f, indent=4)
+                save_profile(profile_name, {
+                    "user-agent": user_agent_value,
+                    "screen_height": int(screen_value.split("×")[1]),
+                    "screen_width": int(screen_value.split("×")[0]),
+                    "timezone": timezone_value,
+                    "lang": language_value,
+                    "proxy": proxy_value,
+                    "cookies": cookies_value,
+                    "webgl": webgl_value,
+                    "vendor": vendor_value,
+                    "cpu": cpu_threads_value,
+                    "ram": ram_value,
+                    "is_touch": is_touch_value
+                })
                 
                 log_message("Конфигурация сохранена")
                 page.controls.clear()
@@ -3834,24 +2873,43 @@ def main(page: ft.Page):
             log_message("Открываем страницу создания конфигурации...")
             
             try:
-                # Определяем номер профиля
-                n = 1
-                while True:
-                    config_file = os.path.join(CONFIG_DIR, f"Profile {n}.json")
-                    if not os.path.isfile(config_file):
-                        break
-                    else:
-                        n += 1
-                
-                log_message(f"Создаем форму для профиля: Profile {n}")
+                # Определяем имя профиля
+                profile_name = next_profile_name()
+                log_message(f"Создаем форму для профиля: {profile_name}")
                 
                 # Создаем все поля
-                profile_name_field = ft.TextField(label="Имя профиля", value=f"Profile {n}")
-                user_agent_field = ft.TextField(label="User Agent", value=random.choice(USER_AGENTS))
+                profile_name_field = ft.TextField(label="Имя профиля", value=profile_name)
+                user_agent_field = ft.TextField(label="User Agent", value=random.choice(get_user_agents()))
                 screen_dropdown = ft.Dropdown(label="Экран", value="1920×1080", options=[ft.dropdown.Option(screen) for screen in SCREENS])
-                timezone_dropdown = ft.Dropdown(label="Часовой пояс", value="Europe/Moscow", options=[ft.dropdown.Option(timezone) for timezone in TIMEZONES])
+                timezone_dropdown = ft.Dropdown(label="Часовой пояс", value="Europe/Moscow", options=[ft.dropdown.Option(timezone) for timezone in get_timezones()])
                 language_dropdown = ft.Dropdown(label="Язык", value="ru-RU", options=[ft.dropdown.Option(lang) for lang in LANGUAGES])
-                proxy_dropdown = ft.Dropdown(label="Прокси", options=[ft.dropdown.Option(proxy) for proxy in get_proxy()])
+                # Прокси по убыванию оценки качества, оценка - в подписи
+                proxy_check_cache = get_proxy_check_cache()
+                ranked_proxies = rank_proxies(get_proxy(), proxy_check_cache)
+                proxy_scores = {proxy: proxy_score(proxy_check_cache.get(proxy)) for proxy in ranked_proxies}
+                proxy_dropdown = ft.Dropdown(label="Прокси", options=[
+                    # Заведомо нерабочие (circuit breaker разомкнут) видны, но не выбираются
+                    ft.dropdown.Option(key=proxy, text=f"✕ не работает | {proxy}", disabled=True)
+                    if proxy_breaker.is_open(proxy) else
+                    ft.dropdown.Option(key=proxy, text=f"★ {score:.0f} | {proxy}" if score is not None else proxy)
+                    for proxy, score in proxy_scores.items()
+                ])
+                
+                def pick_best_proxy(e):
+                    """Подстановка рабочего прокси с лучшей оценкой"""
+                    proxy = best_proxy([proxy for proxy in ranked_proxies if not proxy_breaker.is_open(proxy)], proxy_check_cache)
+                    if proxy:
+                        proxy_dropdown.value = proxy
+                        page.update()
+                    else:
+                        show_snackbar(page, "Нет проверенных рабочих прокси", ft.Colors.ORANGE)
+                
+                best_proxy_button = ft.IconButton(
+                    icon=ft.Icons.STAR,
+                    icon_color=ft.Colors.AMBER,
+                    tooltip="Выбрать лучший прокси",
+                    on_click=pick_best_proxy
+                )
                 cookies_field = ft.TextField(label="Путь к куки")
                 webgl_switch = ft.Switch(label="WebGL", value=True)
                 vendor_field = ft.TextField(label="Производитель", value="Google Inc.")
@@ -3868,20 +2926,12 @@ def main(page: ft.Page):
                     page.update()
                     
                     def do_refresh():
-                        global USER_AGENTS
                         try:
-                            # Пытаемся обновить список
-                            resp = requests.get("https://raw.githubusercontent.com/microlinkhq/top-user-agents/refs/heads/master/src/index.json", timeout=10)
-                            if resp.status_code == 200:
-                                try:
-                                    data = resp.json()
-                                    if isinstance(data, list) and data:
-                                        USER_AGENTS = data
-                                except Exception:
-                                    pass
+                            # Обновляем список через кэш (условный запрос)
+                            user_agents = refresh_user_agents(force=True)
                             # Устанавливаем случайный UA из списка
-                            if USER_AGENTS:
-                                user_agent_field.value = random.choice(USER_AGENTS)
+                            if user_agents:
+                                user_agent_field.value = random.choice(user_agents)
                                 show_snackbar(page, "User Agent обновлён", ft.Colors.GREEN)
                             else:
                                 show_snackbar(page, "Не удалось получить список User Agents", ft.Colors.ORANGE)
@@ -3948,7 +2998,7 @@ def main(page: ft.Page):
                     ft.Container(height=15),
                     
                     # Прокси и cookies
-                    ft.Row([proxy_dropdown, cookies_field], spacing=15),
+                    ft.Row([proxy_dropdown, best_proxy_button, cookies_field], spacing=15),
                     
                     ft.Container(height=15),
                     
@@ -4041,6 +3091,10 @@ def main(page: ft.Page):
         log_message("Добавляем начальное содержимое...")
         page.add(*get_config_content())
         log_message("Начальное содержимое добавлено")
+        startup_profiler.mark("first_render")
+        log_startup_report()
+        if startup_profiler.enabled:
+            startup_profiler.write_report(STARTUP_PROFILE_PATH, {"lazy_imports": lazy_import_report()})
         
         # Показываем приветственное уведомление
         if notification_system:
@@ -4058,54 +3112,8 @@ def main(page: ft.Page):
             padding=20
         ))
 
-def initialize_directories():
-    """Инициализация директорий и файлов"""
-    try:
-        # Создаем необходимые директории
-        os.makedirs(CONFIG_DIR, exist_ok=True)
-        os.makedirs(COOKIES_DIR, exist_ok=True)
-        log_message("Директории созданы")
-        
-        # Создаем файлы если их нет
-        if not os.path.isfile(PROXIES_FILE):
-            with open(PROXIES_FILE, "w", encoding="utf-8") as f:
-                json.dump([], f)
-            log_message("Файл прокси создан")
-        
-        if not os.path.isfile(PROXY_CACHE_PATH):
-            with open(PROXY_CACHE_PATH, "w", encoding="utf-8") as f:
-                json.dump({}, f)
-            log_message("Файл кэша прокси создан")
-        
-        # Загружаем базы данных GeoIP
-        if not os.path.isfile(COUNTRY_DATABASE_PATH):
-            try:
-                log_message("Загружаем базу стран...")
-                response = requests.get("https://git.io/GeoLite2-Country.mmdb", timeout=30)
-                response.raise_for_status()
-                with open(COUNTRY_DATABASE_PATH, "wb") as file:
-                    file.write(response.content)
-                log_message("База стран загружена")
-            except Exception as e:
-                log_message(f"Не удалось загрузить базу стран: {str(e)}", "ERROR")
-                
-        if not os.path.isfile(CITY_DATABASE_PATH):
-            try:
-                log_message("Загружаем базу городов...")
-                response = requests.get("https://git.io/GeoLite2-City.mmdb", timeout=30)
-                response.raise_for_status()
-                with open(CITY_DATABASE_PATH, "wb") as file:
-                    file.write(response.content)
-                log_message("База городов загружена")
-            except Exception as e:
-                log_message(f"Не удалось загрузить базу городов: {str(e)}", "ERROR")
-        
-        return True
-    except Exception as e:
-        log_message(f"Ошибка инициализации: {str(e)}", "ERROR")
-        return False
-
 if __name__ == "__main__":
+    startup_profiler.mark("module_init")
     try:
         log_message("=" * 60)
         log_message("🚀 ЗАПУСК УЛУЧШЕННОЙ ВЕРСИИ ANTIC BROWSER V1.0.0")
@@ -4122,6 +3130,7 @@ if __name__ == "__main__":
         if not initialize_directories():
             log_message("Критическая ошибка инициализации!", "ERROR")
             sys.exit(1)
+        startup_profiler.mark("initialize_directories")
         
         log_message("🚀 ЗАПУСКАЕМ УЛУЧШЕННОЕ ПРИЛОЖЕНИЕ")
         
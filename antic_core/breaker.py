@@ -0,0 +1,149 @@
+# ============================================================
+# CIRCUIT BREAKER ПРОКСИ: ОБЩИЙ РЕЕСТР НЕРАБОЧИХ ЭНДПОИНТОВ И ПРОКСИ
+# ============================================================
+import time
+import threading
+
+from .results import proxy_results
+from .utils import log_message, canonical_proxy_key, proxy_endpoint
+
+BREAKER_COOLDOWN = 60             # Первая пауза после отказа, дальше удваивается
+BREAKER_COOLDOWN_MAX = 30 * 60    # Потолок паузы
+BREAKER_FAILURE_THRESHOLD = 1     # Отказов подряд до размыкания (проверка сама по себе многоуровневая)
+
+CLOSED = "closed"        # Работает - пропускаем
+OPEN = "open"            # Недавно отказал - сразу отказываем, без запросов
+HALF_OPEN = "half_open"  # Пауза вышла - пропускаем одну пробную попытку
+
+def proxy_credential_key(proxy: str) -> str:
+    """Ключ конкретного прокси: эндпоинт вместе с логином и паролем"""
+    try:
+        return canonical_proxy_key(proxy)
+    except ValueError:
+        return proxy.strip()
+
+class _Circuit:
+    """Состояние одного эндпоинта"""
+    __slots__ = ("state", "failures", "opens", "opened_at", "cooldown", "reason")
+
+    def __init__(self):
+        self.state = CLOSED
+        self.failures = 0
+        self.opens = 0
+        self.opened_at = 0.0
+        self.cooldown = 0.0
+        self.reason = None
+
+class ProxyCircuitBreaker:
+    """Реестр circuit breaker'ов прокси, общий для проверки, запуска и импорта.
+
+    Цепи двух видов: эндпоинта (host:port) - размыкается, только если недоступен сам
+    эндпоинт (нет TCP, таймаут), и отключает все прокси шлюза; и конкретного прокси
+    (с логином и паролем) - для прочих отказов (407, нет выхода в интернет, истёк
+    срок у провайдера), которые не касаются других логинов того же шлюза.
+    После отказа цепь размыкается (OPEN) и allow() отвечает False без сети,
+    пока не выйдет пауза; затем одна попытка пропускается (HALF_OPEN). Успех
+    замыкает цепи прокси, новый отказ размыкает с удвоенной паузой. При первом
+    обращении реестр заполняется свежими отказами из кэша результатов проверки.
+    """
+    def __init__(self):
+        self._circuits = {}
+        self._lock = threading.Lock()
+        self._seeded = False
+
+    def _seed(self):
+        """Отказы из кэша результатов, пауза которых ещё не вышла (под блокировкой)"""
+        self._seeded = True
+        try:
+            results = proxy_results.snapshot()
+        except Exception as e:
+            log_message(f"Circuit breaker: не удалось прочитать кэш прокси: {str(e)}", "ERROR")
+            return
+        now = time.time()
+        for proxy, result in results.items():
+            if result.get("status") != "error" or not result.get("checked_at"):
+                continue
+            key = proxy_endpoint(proxy) if result.get("unreachable") else proxy_credential_key(proxy)
+            circuit = self._circuits.setdefault(key, _Circuit())
+            opens = max(result.get("failures", 1), 1)
+            cooldown = min(BREAKER_COOLDOWN * 2 ** (opens - 1), BREAKER_COOLDOWN_MAX)
+            if result["checked_at"] + cooldown > now and result["checked_at"] > circuit.opened_at:
+                circuit.state, circuit.failures, circuit.opens = OPEN, opens, opens
+                circuit.opened_at, circuit.cooldown = result["checked_at"], cooldown
+                circuit.reason = result.get("error")
+
+    def _keys(self, proxy):
+        """Ключи цепей прокси: эндпоинта и самого прокси"""
+        return proxy_endpoint(proxy), proxy_credential_key(proxy)
+
+    def _get(self, proxy):
+        """Разомкнутые (не CLOSED) цепи прокси: сначала эндпоинта, затем самого прокси (под блокировкой)"""
+        if not self._seeded:
+            self._seed()
+        circuits = (self._circuits.get(key) for key in self._keys(proxy))
+        return [circuit for circuit in circuits if circuit is not None and circuit.state != CLOSED]
+
+    def allow(self, proxy: str) -> bool:
+        """Можно ли сейчас использовать прокси (в HALF_OPEN - одна пробная попытка за паузу)"""
+        with self._lock:
+            circuits = self._get(proxy)
+            now = time.time()
+            if any(now < circuit.opened_at + circuit.cooldown for circuit in circuits):
+                return False
+            # Паузы вышли: пропускаем одну попытку, следующая - после ещё одной паузы
+            for circuit in circuits:
+                circuit.state = HALF_OPEN
+                circuit.opened_at = now
+            return True
+
+    def state(self, proxy: str) -> str:
+        """Состояние прокси без побочных эффектов (самая строгая из его цепей)"""
+        with self._lock:
+            circuits = self._get(proxy)
+            if not circuits:
+                return CLOSED
+            now = time.time()
+            if any(circuit.state == OPEN and now < circuit.opened_at + circuit.cooldown for circuit in circuits):
+                return OPEN
+            return HALF_OPEN
+
+    def is_open(self, proxy: str) -> bool:
+        """Прокси заведомо нерабочий (пауза после отказа не вышла)"""
+        return self.state(proxy) == OPEN
+
+    def reason(self, proxy: str):
+        """Причина последнего отказа"""
+        with self._lock:
+            circuits = self._get(proxy)
+            return circuits[0].reason if circuits else None
+
+    def record_success(self, proxy: str):
+        """Успешное использование: цепи эндпоинта и прокси замыкаются"""
+        with self._lock:
+            if self._get(proxy):
+                log_message(f"Circuit breaker: {proxy_endpoint(proxy)} снова работает")
+            for key in self._keys(proxy):
+                self._circuits.pop(key, None)
+
+    def record_failure(self, proxy: str, reason: str | None = None, unreachable: bool = False):
+        """Отказ прокси: после BREAKER_FAILURE_THRESHOLD подряд (или в HALF_OPEN) цепь размыкается.
+
+        unreachable - недоступен сам эндпоинт: размыкается цепь host:port, иначе - только этого прокси.
+        """
+        with self._lock:
+            if not self._seeded:
+                self._seed()
+            endpoint, credential_key = self._keys(proxy)
+            circuit = self._circuits.setdefault(endpoint if unreachable else credential_key, _Circuit())
+            circuit.failures += 1
+            circuit.reason = reason or circuit.reason
+            if circuit.state == HALF_OPEN or circuit.failures >= BREAKER_FAILURE_THRESHOLD:
+                circuit.opens += 1
+                circuit.state = OPEN
+                circuit.opened_at = time.time()
+                circuit.cooldown = min(BREAKER_COOLDOWN * 2 ** (circuit.opens - 1), BREAKER_COOLDOWN_MAX)
+                target = endpoint if unreachable else f"прокси на {endpoint}"
+                log_message(f"Circuit breaker: {target} отключён на {circuit.cooldown:.0f}с ({circuit.reason})")
+
+# Глобальный реестр circuit breaker'ов прокси
+proxy_breaker = ProxyCircuitBreaker()
@@ -0,0 +1,145 @@
+# ============================================================
+# ПОИСК УПАКОВАННОЙ ПАПКИ playwright-browsers (в .exe она в _internal)
+# Работает с PyInstaller --onedir, кроссплатформенно (Windows, macOS, Linux)
+# ============================================================
+import os
+import sys
+import json
+import platform
+from pathlib import Path
+
+# Определяем имя папки Chromium в зависимости от ОС
+SYSTEM = platform.system()
+if SYSTEM == 'Windows':
+    CHROMIUM_SUBPATH = "chrome-win"
+    CHROMIUM_EXECUTABLE = "chrome.exe"
+elif SYSTEM == 'Darwin':  # macOS
+    CHROMIUM_SUBPATH = "chrome-mac"
+    CHROMIUM_EXECUTABLE = "Chromium.app"
+else:  # Linux
+    CHROMIUM_SUBPATH = "chrome-linux"
+    CHROMIUM_EXECUTABLE = "chrome"
+
+# Манифест найденного Chromium: пока бандл не менялся, папки не сканируются
+BROWSERS_MANIFEST_NAME = "playwright_browsers_manifest.json"
+
+_browsers_path = None
+_configured = False
+
+def get_app_dir():
+    """Папка приложения: рядом с .exe или корень исходников"""
+    if getattr(sys, 'frozen', False):
+        return Path(sys.executable).parent
+    return Path(__file__).resolve().parent.parent
+
+def get_search_paths():
+    """Кандидаты на папку playwright-browsers"""
+    app_dir = get_app_dir()
+    if getattr(sys, 'frozen', False):
+        return [
+            app_dir / "_internal" / "playwright-browsers",
+            app_dir / "playwright-browsers",
+        ]
+    return [app_dir / "playwright-browsers"]
+
+def file_signature(path):
+    """Подпись файла для проверки манифеста: (mtime в нс, размер)"""
+    stat = os.stat(path)
+    return [stat.st_mtime_ns, stat.st_size]
+
+def find_playwright_browsers_json():
+    """Путь к browsers.json драйвера Playwright (без импорта самого playwright)"""
+    try:
+        import importlib.util
+        spec = importlib.util.find_spec("playwright")
+        if spec and spec.submodule_search_locations:
+            path = Path(list(spec.submodule_search_locations)[0]) / "driver" / "package" / "browsers.json"
+            if path.exists():
+                return path
+    except Exception:
+        pass
+    return None
+
+def load_browsers_manifest(driver_browsers_json):
+    """Чтение манифеста; None, если бандл Chromium или драйвер Playwright изменились"""
+    try:
+        with open(get_app_dir() / BROWSERS_MANIFEST_NAME, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+        if manifest.get("system") != SYSTEM:
+            return None
+        if manifest.get("executable_signature") != file_signature(manifest["executable"]):
+            return None
+        driver_signature = file_signature(driver_browsers_json) if driver_browsers_json else None
+        if manifest.get("driver_signature") != driver_signature:
+            return None
+        return manifest
+    except Exception:
+        return None
+
+def scan_playwright_browsers():
+    """Поиск папки chromium-* с исполняемым файлом для текущей ОС"""
+    for p in get_search_paths():
+        if p.exists():
+            for chromium_dir in os.listdir(p):
+                if chromium_dir.startswith("chromium-"):
+                    # На macOS это .app бандл, на Windows/Linux - исполняемый файл
+                    executable = p / chromium_dir / CHROMIUM_SUBPATH / CHROMIUM_EXECUTABLE
+                    if executable.exists():
+                        return p, chromium_dir, executable
+    return None, None, None
+
+def check_driver_compatibility(chromium_dir, driver_browsers_json):
+    """Сверка ревизии упакованного Chromium с ревизией, которую ждёт драйвер Playwright"""
+    revision = chromium_dir.split("-", 1)[1]
+    if not driver_browsers_json:
+        return revision, None, None
+    try:
+        with open(driver_browsers_json, "r", encoding="utf-8") as f:
+            browsers = json.load(f).get("browsers", [])
+        driver_revision = next((b.get("revision") for b in browsers if b.get("name") == "chromium"), None)
+    except Exception:
+        return revision, None, None
+    return revision, driver_revision, driver_revision == revision
+
+def configure_playwright_browsers():
+    """Поиск упакованного Chromium и установка PLAYWRIGHT_BROWSERS_PATH (один раз за процесс)"""
+    global _browsers_path, _configured
+    if _configured:
+        return _browsers_path
+    _configured = True
+    
+    driver_browsers_json = find_playwright_browsers_json()
+    browsers_manifest = load_browsers_manifest(driver_browsers_json)
+    if browsers_manifest:
+        _browsers_path = Path(browsers_manifest["browsers_path"])
+        print(f"Chromium из манифеста: ревизия {browsers_manifest['revision']}")
+    else:
+        _browsers_path, chromium_dir, executable = scan_playwright_browsers()
+        if _browsers_path:
+            revision, driver_revision, compatible = check_driver_compatibility(chromium_dir, driver_browsers_json)
+            if compatible is False:
+                print(f"ВНИМАНИЕ: Chromium ревизии {revision}, а драйвер Playwright ожидает {driver_revision}")
+            try:
+                with open(get_app_dir() / BROWSERS_MANIFEST_NAME, "w", encoding="utf-8") as f:
+                    json.dump({
+                        "system": SYSTEM,
+                        "browsers_path": str(_browsers_path),
+                        "executable": str(executable),
+                        "executable_signature": file_signature(executable),
+                        "revision": revision,
+                        "driver_revision": driver_revision,
+                        "driver_compatible": compatible,
+                        "driver_signature": file_signature(driver_browsers_json) if driver_browsers_json else None
+                    }, f, indent=4)
+            except Exception as e:
+                print(f"Не удалось сохранить манифест браузеров: {e}")
+
+    if not _browsers_path:
+        # Если не нашли упакованные браузеры, используем стандартное расположение Playwright
+        print("Используем стандартное расположение браузеров Playwright...")
+        # Playwright установит браузеры в стандартное место, путь не нужно задавать
+    else:
+        # Устанавливаем правильный путь только если нашли упакованные браузеры
+        os.environ["PLAYWRIGHT_BROWSERS_PATH"] = str(_browsers_path)
+        print(f"Playwright браузер найден: {_browsers_path}")
+    return _browsers_path
@@ -0,0 +1,120 @@
+# ============================================================
+# НАСТРОЙКИ ЯДРА: ВЕРСИЯ, ПУТИ, КОНСТАНТЫ, API КЛЮЧИ
+# ============================================================
+import os
+import json
+
+from .utils import log_message, lazy_import
+
+CURRENT_VERSION = "1.0.0"
+GITHUB_REPO = "CJ-aezakmi/brows"
+UPDATE_CHECK_URL = f"https://api.github.com/repos/{GITHUB_REPO}/releases/latest"
+
+# Пути к файлам (корень приложения - папка над пакетом antic_core)
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+COUNTRY_DATABASE_PATH = os.path.join(BASE_DIR, "GeoLite2-Country.mmdb")
+CITY_DATABASE_PATH = os.path.join(BASE_DIR, "GeoLite2-City.mmdb")
+GEO_RANGES_CACHE_PATH = os.path.join(BASE_DIR, "geo_ranges.npz")  # Таблица IP-диапазонов для enrich()
+GEO_CACHE_PATH = os.path.join(BASE_DIR, "geo_cache.sqlite3")  # Кэш ответов get_proxy_info между запусками
+PROXY_CACHE_PATH = os.path.join(BASE_DIR, "proxy_cache.json")
+PROXY_JOURNAL_PATH = os.path.join(BASE_DIR, "proxy_cache.journal.jsonl")  # Изменения кэша прокси после снимка
+CONFIG_DIR = os.path.join(BASE_DIR, "config")
+COOKIES_DIR = os.path.join(BASE_DIR, "cookies")
+PROXIES_FILE = os.path.join(BASE_DIR, "proxies.json")  # Прежний список прокси - переносится в PROXY_DB_PATH
+PROXY_DB_PATH = os.path.join(BASE_DIR, "proxies.sqlite3")  # Список прокси с индексами
+API_KEYS_FILE = os.path.join(BASE_DIR, "api_keys.json")  # Файл для сохранения API ключей
+USER_AGENTS_CACHE_PATH = os.path.join(BASE_DIR, "user_agents_cache.json")
+EXTENSIONS_DIR = os.path.join(BASE_DIR, "extensions")
+
+# Базы GeoIP: (название, URL, путь)
+GEOIP_DATABASES = (
+    ("База стран", "https://git.io/GeoLite2-Country.mmdb", COUNTRY_DATABASE_PATH),
+    ("База городов", "https://git.io/GeoLite2-City.mmdb", CITY_DATABASE_PATH),
+)
+
+# Константы
+SCREENS = ("800×600", "960×540", "1024×768", "1152×864", "1280×720", "1280×768", "1280×800", "1280×1024", "1366×768", "1408×792", "1440×900", "1400×1050", "1440×1080", "1536×864", "1600×900", "1600×1024", "1600×1200", "1680×1050", "1920×1080", "1920×1200", "2048×1152", "2560×1080", "2560×1440", "3440×1440")
+LANGUAGES = ("en-US", "en-GB", "fr-FR", "ru-RU", "es-ES", "pl-PL", "pt-PT", "nl-NL", "zh-CN")
+
+# Маппинг стран к языкам и timezone (для автонастройки под GEO прокси)
+COUNTRY_SETTINGS = {
+    "US": {"lang": "en-US", "timezone": "America/New_York"},
+    "GB": {"lang": "en-GB", "timezone": "Europe/London"},
+    "FR": {"lang": "fr-FR", "timezone": "Europe/Paris"},
+    "DE": {"lang": "de-DE", "timezone": "Europe/Berlin"},
+    "RU": {"lang": "ru-RU", "timezone": "Europe/Moscow"},
+    "ES": {"lang": "es-ES", "timezone": "Europe/Madrid"},
+    "IT": {"lang": "it-IT", "timezone": "Europe/Rome"},
+    "PL": {"lang": "pl-PL", "timezone": "Europe/Warsaw"},
+    "PT": {"lang": "pt-PT", "timezone": "Europe/Lisbon"},
+    "NL": {"lang": "nl-NL", "timezone": "Europe/Amsterdam"},
+    "CN": {"lang": "zh-CN", "timezone": "Asia/Shanghai"},
+    "JP": {"lang": "ja-JP", "timezone": "Asia/Tokyo"},
+    "KR": {"lang": "ko-KR", "timezone": "Asia/Seoul"},
+    "BR": {"lang": "pt-BR", "timezone": "America/Sao_Paulo"},
+    "CA": {"lang": "en-US", "timezone": "America/Toronto"},
+    "AU": {"lang": "en-AU", "timezone": "Australia/Sydney"},
+    "IN": {"lang": "en-IN", "timezone": "Asia/Kolkata"},
+    "TR": {"lang": "tr-TR", "timezone": "Europe/Istanbul"},
+    "MX": {"lang": "es-MX", "timezone": "America/Mexico_City"},
+    "AR": {"lang": "es-AR", "timezone": "America/Argentina/Buenos_Aires"},
+    "UA": {"lang": "uk-UA", "timezone": "Europe/Kiev"},
+    "SE": {"lang": "sv-SE", "timezone": "Europe/Stockholm"},
+    "NO": {"lang": "no-NO", "timezone": "Europe/Oslo"},
+    "DK": {"lang": "da-DK", "timezone": "Europe/Copenhagen"},
+    "FI": {"lang": "fi-FI", "timezone": "Europe/Helsinki"},
+}
+
+def get_timezones():
+    """Список часовых поясов (pytz загружается при первом вызове)"""
+    return lazy_import("pytz").common_timezones
+
+# Функции для управления API ключами
+def load_api_keys():
+    """Загрузка сохраненных API ключей"""
+    try:
+        if os.path.isfile(API_KEYS_FILE):
+            with open(API_KEYS_FILE, "r", encoding="utf-8") as f:
+                keys = json.load(f)
+                log_message("API ключи загружены")
+                return keys
+    except Exception as e:
+        log_message(f"Ошибка загрузки API ключей: {str(e)}", "ERROR")
+    return {"sx_org": "", "cyberyozh": ""}
+
+def save_api_key(service: str, key: str):
+    """Сохранение API ключа"""
+    try:
+        keys = load_api_keys()
+        keys[service] = key
+        with open(API_KEYS_FILE, "w", encoding="utf-8") as f:
+            json.dump(keys, f, indent=4)
+        log_message(f"API ключ для {service} сохранен")
+        return True
+    except Exception as e:
+        log_message(f"Ошибка сохранения API ключа: {str(e)}", "ERROR")
+        return False
+
+def initialize_directories():
+    """Инициализация директорий и файлов"""
+    try:
+        # Создаем необходимые директории
+        os.makedirs(CONFIG_DIR, exist_ok=True)
+        os.makedirs(COOKIES_DIR, exist_ok=True)
+        log_message("Директории созданы")
+        
+        # Создаем файлы если их нет (список прокси - в SQLite, создаётся при первом обращении)
+        if not os.path.isfile(PROXY_CACHE_PATH):
+            with open(PROXY_CACHE_PATH, "w", encoding="utf-8") as f:
+                json.dump({}, f)
+            log_message("Файл кэша прокси создан")
+        
+        # Базы GeoIP загружаются в фоне после показа окна (provision_geo_databases)
+        missing = [title for title, _, path in GEOIP_DATABASES if not os.path.isfile(path)]
+        if missing:
+            log_message(f"Базы GeoIP будут загружены в фоне: {', '.join(missing)}")
+        
+        return True
+    except Exception as e:
+        log_message(f"Ошибка инициализации: {str(e)}", "ERROR")
+        return False
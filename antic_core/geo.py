@@ -0,0 +1,439 @@
+# ============================================================
+# GEO: ОПРЕДЕЛЕНИЕ СТРАНЫ/ГОРОДА/TIMEZONE ПО IP, ЗАГРУЗКА БАЗ GEOLITE2
+# ============================================================
+import os
+import json
+import sqlite3
+import threading
+from collections import OrderedDict
+
+import requests
+
+from .config import COUNTRY_DATABASE_PATH, CITY_DATABASE_PATH, GEO_CACHE_PATH, GEOIP_DATABASES
+from .resolver import dns_cache
+from .utils import log_message, lazy_import
+
+class GeoService:
+    """Общий для процесса пул читателей GeoIP: базы открыты один раз через mmap, чтение потокобезопасно.
+    
+    Новая версия файла базы подхватывается без перезапуска: читатель открывается
+    в фоне и подменяется атомарно, старый закрывается после паузы, чтобы
+    успели завершиться начатые на нём запросы.
+    """
+    RETIRE_DELAY = 30  # Секунд до закрытия заменённого читателя
+    
+    def __init__(self, country_path=COUNTRY_DATABASE_PATH, city_path=CITY_DATABASE_PATH):
+        self.country_path = country_path
+        self.city_path = city_path
+        # path -> (reader, database_type, build_epoch, подпись файла); кортеж меняется целиком
+        self._databases = {}
+        self._lock = threading.Lock()
+        self._watch_stop = None
+    
+    def _open_mode(self):
+        """MODE_MMAP_EXT (mmap + C-расширение), если оно собрано, иначе чистый MODE_MMAP"""
+        geoip2_database = lazy_import("geoip2.database")
+        try:
+            lazy_import("maxminddb.extension")
+            return geoip2_database.MODE_MMAP_EXT
+        except ImportError:
+            return geoip2_database.MODE_MMAP
+    
+    @staticmethod
+    def _signature(path):
+        """Подпись файла базы: (mtime в нс, размер, inode) или None, если файла нет"""
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+    
+    def _open(self, path):
+        """Открытие базы и чтение метаданных (без блокировки пула)"""
+        signature = self._signature(path)
+        if signature is None:
+            return None
+        try:
+            reader = lazy_import("geoip2.database").Reader(path, mode=self._open_mode())
+            metadata = reader.metadata()
+        except Exception as e:
+            log_message(f"Не удалось открыть базу GeoIP {os.path.basename(path)}: {str(e)}", "ERROR")
+            return None
+        return (reader, metadata.database_type, metadata.build_epoch, signature)
+    
+    def _database(self, path):
+        """Запись открытой базы (открывается при первом обращении) или None"""
+        database = self._databases.get(path)
+        if database is not None:
+            return database
+        if not os.path.isfile(path):
+            return None
+        with self._lock:
+            database = self._databases.get(path)
+            if database is None:
+                database = self._open(path)
+                if database is None:
+                    return None
+                self._databases[path] = database
+                log_message(f"База GeoIP открыта: {os.path.basename(path)}")
+        return database
+    
+    def get_reader(self, path):
+        """Открытый читатель базы (None, если файла ещё нет)"""
+        database = self._database(path)
+        return database[0] if database is not None else None
+    
+    def build_epochs(self):
+        """Версии открытых баз (build_epoch); None для базы, которой ещё нет"""
+        versions = []
+        for path in (self.country_path, self.city_path):
+            database = self._database(path)
+            versions.append(database[2] if database is not None else None)
+        return tuple(versions)
+    
+    def reload(self, path):
+        """Открытие новой версии базы и атомарная подмена читателя; True, если база подменена"""
+        database = self._open(path)
+        if database is None:
+            return False
+        with self._lock:
+            previous = self._databases.get(path)
+            self._databases[path] = database
+        if previous is not None:
+            # Запросы, уже взявшие старый читатель, дорабатывают на нём
+            timer = threading.Timer(self.RETIRE_DELAY, self._close_reader, args=(previous[0],))
+            timer.daemon = True
+            timer.start()
+        # Кэши GEO привязаны к build_epoch и сбросятся сами, если версия базы сменилась
+        log_message(f"База GeoIP перезагружена: {os.path.basename(path)} (build_epoch {database[2]})")
+        return True
+    
+    def check_for_updates(self):
+        """Перезагрузка открытых баз, файлы которых изменились на диске"""
+        reloaded = False
+        for path in (self.country_path, self.city_path):
+            database = self._databases.get(path)
+            if database is None:
+                # Ещё не открытая база откроется при первом запросе
+                continue
+            signature = self._signature(path)
+            if signature is not None and signature != database[3]:
+                reloaded = self.reload(path) or reloaded
+        return reloaded
+    
+    def start_watching(self, interval=60):
+        """Фоновое слежение за файлами баз (повторный вызов ничего не делает)"""
+        if self._watch_stop is not None:
+            return
+        stop = self._watch_stop = threading.Event()
+        
+        def watch():
+            while not stop.wait(interval):
+                try:
+                    self.check_for_updates()
+                except Exception as e:
+                    log_message(f"Ошибка проверки обновления баз GeoIP: {str(e)}", "ERROR")
+        
+        threading.Thread(target=watch, daemon=True).start()
+    
+    def stop_watching(self):
+        """Остановка слежения за файлами баз"""
+        if self._watch_stop is not None:
+            self._watch_stop.set()
+            self._watch_stop = None
+    
+    @staticmethod
+    def _close_reader(reader):
+        """Закрытие читателя с подавлением ошибок"""
+        try:
+            reader.close()
+        except Exception:
+            pass
+    
+    def country(self, ip: str) -> str:
+        """ISO-код страны по IP или 'UNK'"""
+        database = self._database(self.country_path)
+        if database is None:
+            return "UNK"
+        reader, database_type = database[0], database[1]
+        try:
+            # Если вместо базы стран подложена City база, страну берём из неё
+            if "City" in database_type:
+                return reader.city(ip).country.iso_code or "UNK"
+            return reader.country(ip).country.iso_code or "UNK"
+        except Exception:
+            return "UNK"
+    
+    def city(self, ip: str):
+        """Ответ City базы (город, координаты) или None"""
+        reader = self.get_reader(self.city_path)
+        if reader is None:
+            return None
+        try:
+            return reader.city(ip)
+        except Exception:
+            return None
+    
+    def close(self):
+        """Закрытие всех открытых баз"""
+        self.stop_watching()
+        with self._lock:
+            for database in self._databases.values():
+                self._close_reader(database[0])
+            self._databases.clear()
+
+# Глобальный сервис GEO, общий для всех вызовов
+geo_service = GeoService()
+
+# Общий TimezoneFinder: полигоны часовых поясов загружаются один раз за процесс.
+# С in_memory=True данные читаются в память целиком (быстрее, но +~100 МБ RAM)
+TIMEZONE_FINDER_IN_MEMORY = False
+_timezone_finder = None
+_timezone_finder_lock = threading.Lock()
+
+def get_timezone_finder():
+    """Общий экземпляр TimezoneFinder (создаётся при первом вызове)"""
+    global _timezone_finder
+    if _timezone_finder is None:
+        with _timezone_finder_lock:
+            if _timezone_finder is None:
+                timezonefinder = lazy_import("timezonefinder")
+                _timezone_finder = timezonefinder.TimezoneFinder(in_memory=TIMEZONE_FINDER_IN_MEMORY)
+                log_message(f"TimezoneFinder инициализирован (in_memory={TIMEZONE_FINDER_IN_MEMORY})")
+    return _timezone_finder
+
+def timezone_at(latitude, longitude):
+    """Часовой пояс по координатам или None"""
+    return timezones_at([(latitude, longitude)])[0]
+
+def timezones_at(coordinates):
+    """Пакетное определение часовых поясов для списка пар (широта, долгота)"""
+    finder = get_timezone_finder()
+    resolved = {}
+    result = []
+    # Один захват блокировки на всю пачку: TimezoneFinder читает общие буферы
+    with _timezone_finder_lock:
+        for latitude, longitude in coordinates:
+            if latitude is None or longitude is None:
+                result.append(None)
+                continue
+            key = (latitude, longitude)
+            if key not in resolved:
+                try:
+                    resolved[key] = finder.timezone_at(lng=longitude, lat=latitude)
+                except Exception:
+                    resolved[key] = None
+            result.append(resolved[key])
+    return result
+
+class GeoCache:
+    """Кэш GEO-ответов по IP: LRU в памяти перед SQLite на диске, сбрасывается при смене версии баз (build_epoch)"""
+    def __init__(self, path=GEO_CACHE_PATH, memory_size=4096):
+        self.path = path
+        self.memory_size = memory_size
+        self._memory = OrderedDict()
+        self._epoch = None
+        self._db = None
+        self._disk_failed = False
+        self._lock = threading.Lock()
+    
+    def _connect(self):
+        """Соединение с SQLite (открывается при первом обращении); None, если диск недоступен"""
+        if self._db is None and not self._disk_failed:
+            try:
+                db = sqlite3.connect(self.path, check_same_thread=False)
+                db.execute("PRAGMA journal_mode=WAL")
+                db.execute("CREATE TABLE IF NOT EXISTS geo (ip TEXT PRIMARY KEY, info TEXT NOT NULL)")
+                db.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+                db.commit()
+                self._db = db
+            except Exception as e:
+                # Без диска работаем только с LRU в памяти
+                self._disk_failed = True
+                log_message(f"GEO кэш на диске недоступен: {str(e)}", "ERROR")
+        return self._db
+    
+    def _check_epoch(self, epoch):
+        """Сброс кэша, если базы GeoIP сменились (вызывается под блокировкой)"""
+        if epoch == self._epoch:
+            return
+        self._memory.clear()
+        self._epoch = epoch
+        db = self._connect()
+        if db is None:
+            return
+        try:
+            row = db.execute("SELECT value FROM meta WHERE key = 'epoch'").fetchone()
+            if row is None or row[0] != epoch:
+                with db:
+                    db.execute("DELETE FROM geo")
+                    db.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('epoch', ?)", (epoch,))
+                if row is not None:
+                    log_message("Базы GeoIP обновились - GEO кэш сброшен")
+        except Exception as e:
+            log_message(f"Ошибка проверки версии GEO кэша: {str(e)}", "ERROR")
+    
+    def get(self, ip, epoch):
+        """Закэшированный ответ для IP или None"""
+        with self._lock:
+            self._check_epoch(epoch)
+            info = self._memory.get(ip)
+            if info is not None:
+                self._memory.move_to_end(ip)
+                return info
+            db = self._connect()
+            if db is None:
+                return None
+            try:
+                row = db.execute("SELECT info FROM geo WHERE ip = ?", (ip,)).fetchone()
+            except Exception as e:
+                log_message(f"Ошибка чтения GEO кэша: {str(e)}", "ERROR")
+                return None
+            if row is None:
+                return None
+            info = json.loads(row[0])
+            self._remember(ip, info)
+            return info
+    
+    def put(self, ip, epoch, info):
+        """Сохранение ответа для IP в память и на диск"""
+        with self._lock:
+            self._check_epoch(epoch)
+            self._remember(ip, info)
+            db = self._connect()
+            if db is None:
+                return
+            try:
+                with db:
+                    db.execute("INSERT OR REPLACE INTO geo (ip, info) VALUES (?, ?)", (ip, json.dumps(info)))
+            except Exception as e:
+                log_message(f"Ошибка записи GEO кэша: {str(e)}", "ERROR")
+    
+    def _remember(self, ip, info):
+        """Добавление в LRU с вытеснением самых старых записей"""
+        self._memory[ip] = info
+        self._memory.move_to_end(ip)
+        while len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
+    
+    def clear(self):
+        """Полный сброс кэша (память и диск)"""
+        with self._lock:
+            self._memory.clear()
+            db = self._connect()
+            if db is not None:
+                try:
+                    with db:
+                        db.execute("DELETE FROM geo")
+                except Exception as e:
+                    log_message(f"Ошибка очистки GEO кэша: {str(e)}", "ERROR")
+
+# Глобальный кэш GEO-ответов
+geo_cache = GeoCache()
+
+def get_proxy_info(ip: str) -> dict:
+    """Получение информации о прокси по IP или имени хоста (с кэшем между запусками)"""
+    # Имя хоста провайдера -> IP через DNS-кэш: базы GeoIP ищут только по адресу
+    ip = dns_cache.lookup(ip)
+    # Ключ версии - build_epoch обеих баз: новая база автоматически обнуляет кэш
+    epoch = json.dumps(geo_service.build_epochs())
+    cached = geo_cache.get(ip, epoch)
+    if cached is not None:
+        return dict(cached)
+    
+    country_code = geo_service.country(ip)
+    
+    latitude = None
+    longitude = None
+    city = "UNK"
+    timezone = None
+    
+    # Пытаемся получить детальную информацию из City database если она есть
+    response = geo_service.city(ip)
+    if response is not None:
+        try:
+            city = response.city.name if response.city.name else "UNK"
+            latitude = response.location.latitude
+            longitude = response.location.longitude
+            timezone = timezone_at(latitude, longitude)
+        except:
+            pass
+    
+    result = {"country_code": country_code, "city": city, "timezone": timezone}
+    if latitude is not None and longitude is not None:
+        result["latitude"] = latitude
+        result["longitude"] = longitude
+    
+    geo_cache.put(ip, epoch, result)
+    return dict(result)
+
+def download_geo_database(url: str, path: str, progress_callback=None):
+    """Потоковая загрузка базы GeoIP во временный файл с докачкой и атомарной заменой"""
+    part_path = path + ".part"
+    downloaded = os.path.getsize(part_path) if os.path.isfile(part_path) else 0
+    headers = {'User-Agent': 'Antic Browser v1.0.0'}
+    if downloaded:
+        headers["Range"] = f"bytes={downloaded}-"
+    
+    with requests.get(url, headers=headers, stream=True, timeout=30) as response:
+        if response.status_code == 416:
+            # Недокачанный файл не совпадает с сервером - начинаем заново
+            os.remove(part_path)
+            return download_geo_database(url, path, progress_callback)
+        response.raise_for_status()
+        
+        total_size = int(response.headers.get("content-length", 0))
+        if response.status_code == 206:
+            mode = "ab"
+            total_size += downloaded
+            log_message(f"Докачиваем {os.path.basename(path)} с {downloaded} байт")
+        else:
+            mode = "wb"
+            downloaded = 0
+        
+        with open(part_path, mode) as f:
+            for chunk in response.iter_content(chunk_size=256 * 1024):
+                if chunk:
+                    f.write(chunk)
+                    downloaded += len(chunk)
+                    if progress_callback and total_size > 0:
+                        progress_callback(downloaded / total_size * 100)
+    
+    # Проверяем, что скачан именно mmdb, и только потом подменяем файл
+    try:
+        lazy_import("geoip2.database").Reader(part_path).close()
+    except Exception:
+        os.remove(part_path)
+        raise
+    os.replace(part_path, path)
+
+def provision_geo_databases(notify=None):
+    """Фоновая загрузка отсутствующих баз GeoIP с уведомлениями о прогрессе"""
+    for title, url, path in GEOIP_DATABASES:
+        if os.path.isfile(path):
+            continue
+        log_message(f"Загружаем: {title}...")
+        if notify:
+            notify(title, "Загрузка началась", "info")
+        
+        reported = {"step": 0}
+        def on_progress(progress, title=title, reported=reported):
+            step = int(progress // 25)
+            if reported["step"] < step < 4:
+                reported["step"] = step
+                log_message(f"{title}: загружено {step * 25}%")
+                if notify:
+                    notify(title, f"Загружено {step * 25}%", "info")
+        
+        try:
+            download_geo_database(url, path, on_progress)
+            log_message(f"{title} загружена")
+            if notify:
+                notify(title, "Загрузка завершена", "success")
+        except Exception as e:
+            log_message(f"Не удалось загрузить {title.lower()}: {str(e)}", "ERROR")
+            if notify:
+                notify(title, f"Не удалось загрузить: {str(e)}", "error")
+    
+    # Отдельный сброс кэша не нужен: у скачанных баз новый build_epoch,
+    # и ответы "UNK", полученные без баз, get_proxy_info больше не вернёт
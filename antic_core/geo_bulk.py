@@ -0,0 +1,254 @@
+# ============================================================
+# МАССОВОЕ GEO-ОБОГАЩЕНИЕ: ВЕКТОРНЫЙ ПОИСК ПО ТАБЛИЦЕ IPv4-ДИАПАЗОНОВ
+# ============================================================
+import os
+import socket
+import threading
+
+from .config import CITY_DATABASE_PATH, GEO_RANGES_CACHE_PATH
+from .geo import geo_service, timezones_at
+from .utils import log_message, lazy_import
+
+class IPRangeTable:
+    """Отсортированная таблица IPv4-диапазонов из City базы (колонки NumPy + справочники строк)"""
+    COLUMNS = ("starts", "ends", "country_idx", "city_idx", "latitude", "longitude", "timezone_idx")
+
+    def __init__(self, build_epoch, countries, cities, timezones, **columns):
+        self.build_epoch = build_epoch
+        np = lazy_import("numpy")
+        # Справочники как массивы object - чтобы раскрывать индексы векторно
+        self.countries = np.array(countries, dtype=object)
+        self.cities = np.array(cities, dtype=object)
+        self.timezones = np.array(timezones, dtype=object)
+        for name in self.COLUMNS:
+            setattr(self, name, columns[name])
+
+    def __len__(self):
+        return len(self.starts)
+
+    @classmethod
+    def build(cls, mmdb_path=CITY_DATABASE_PATH):
+        """Построение таблицы обходом всех сетей City базы (долго - десятки секунд)"""
+        np = lazy_import("numpy")
+        maxminddb = lazy_import("maxminddb")
+        log_message(f"Строим таблицу IP-диапазонов из {os.path.basename(mmdb_path)}...")
+
+        # Строки храним индексами в справочниках; индекс 0 - "нет данных"
+        countries, cities, timezones = ["UNK"], ["UNK"], [None]
+        country_ids, city_ids, timezone_ids = {}, {}, {}
+        starts, ends, country_idx, city_idx, latitude, longitude, timezone_idx = [], [], [], [], [], [], []
+
+        def intern(value, ids, values):
+            if not value:
+                return 0
+            index = ids.get(value)
+            if index is None:
+                index = ids[value] = len(values)
+                values.append(value)
+            return index
+
+        with maxminddb.open_database(mmdb_path) as reader:
+            build_epoch = reader.metadata().build_epoch
+            for network, record in reader:
+                if network.version != 4 or not record:
+                    continue
+                location = record.get("location") or {}
+                starts.append(int(network.network_address))
+                ends.append(int(network.broadcast_address))
+                country_idx.append(intern((record.get("country") or {}).get("iso_code"), country_ids, countries))
+                city_idx.append(intern(((record.get("city") or {}).get("names") or {}).get("en"), city_ids, cities))
+                latitude.append(location.get("latitude", np.nan))
+                longitude.append(location.get("longitude", np.nan))
+                timezone_idx.append(intern(location.get("time_zone"), timezone_ids, timezones))
+
+        starts = np.array(starts, dtype=np.uint32)
+        order = np.argsort(starts, kind="stable")
+        columns = {
+            "starts": starts[order],
+            "ends": np.array(ends, dtype=np.uint32)[order],
+            "country_idx": np.array(country_idx, dtype=np.uint16)[order],
+            "city_idx": np.array(city_idx, dtype=np.uint32)[order],
+            "latitude": np.array(latitude, dtype=np.float32)[order],
+            "longitude": np.array(longitude, dtype=np.float32)[order],
+            "timezone_idx": np.array(timezone_idx, dtype=np.uint16)[order],
+        }
+        columns = cls._merge_adjacent(columns)
+        table = cls(build_epoch, countries, cities, timezones, **columns)
+        log_message(f"Таблица IP-диапазонов построена: {len(table)} диапазонов")
+        return table
+
+    @staticmethod
+    def _merge_adjacent(columns):
+        """Склейка соседних диапазонов с одинаковыми данными (таблица становится заметно меньше)"""
+        np = lazy_import("numpy")
+        starts, ends = columns["starts"], columns["ends"]
+        if len(starts) < 2:
+            return columns
+        same = starts[1:].astype(np.int64) == ends[:-1].astype(np.int64) + 1
+        for name in ("country_idx", "city_idx", "timezone_idx"):
+            same &= columns[name][1:] == columns[name][:-1]
+        for name in ("latitude", "longitude"):
+            a, b = columns[name][1:], columns[name][:-1]
+            same &= (a == b) | (np.isnan(a) & np.isnan(b))
+        keep = np.concatenate(([True], ~same))
+        first = np.flatnonzero(keep)
+        last = np.concatenate((first[1:] - 1, [len(starts) - 1]))
+        merged = {name: column[first] for name, column in columns.items()}
+        merged["ends"] = ends[last]
+        return merged
+
+    def save(self, path=GEO_RANGES_CACHE_PATH):
+        """Сохранение таблицы в .npz (атомарно)"""
+        np = lazy_import("numpy")
+        tmp_path = path + ".tmp.npz"
+        np.savez(
+            tmp_path,
+            build_epoch=np.array(self.build_epoch),
+            countries=np.array(self.countries, dtype=str),
+            cities=np.array(self.cities[1:], dtype=str),
+            timezones=np.array(self.timezones[1:], dtype=str),
+            **{name: getattr(self, name) for name in self.COLUMNS}
+        )
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path=GEO_RANGES_CACHE_PATH):
+        """Чтение таблицы из .npz"""
+        np = lazy_import("numpy")
+        with np.load(path, allow_pickle=False) as data:
+            return cls(
+                int(data["build_epoch"]),
+                data["countries"].tolist(),
+                ["UNK"] + data["cities"].tolist(),
+                [None] + data["timezones"].tolist(),
+                **{name: data[name] for name in cls.COLUMNS}
+            )
+
+    def lookup(self, ip_ints):
+        """Индексы строк таблицы для массива IPv4 (uint32); -1, если IP ни в один диапазон не попал"""
+        np = lazy_import("numpy")
+        rows = np.searchsorted(self.starts, ip_ints, side="right") - 1
+        found = rows >= 0
+        found[found] = ip_ints[found] <= self.ends[rows[found]]
+        rows[~found] = -1
+        return rows
+
+# Таблица диапазонов, общая для процесса
+_ip_range_table = None
+_ip_range_table_lock = threading.Lock()
+
+def get_ip_range_table(build=True, service=None, blocking=True):
+    """Таблица диапазонов: из кэша .npz, а при смене базы (build_epoch) - перестраивается.
+
+    blocking=False - не ждать загрузки/построения в другом потоке (тогда None).
+    """
+    service = service or geo_service
+    if not _ip_range_table_lock.acquire(blocking=blocking):
+        return None
+    try:
+        return _load_ip_range_table(build, service)
+    finally:
+        _ip_range_table_lock.release()
+
+def _load_ip_range_table(build, service):
+    """Актуальная таблица из памяти, кэша .npz или City базы (под блокировкой)"""
+    global _ip_range_table
+    city_path = service.city_path
+    if not os.path.isfile(city_path):
+        return None
+    reader = service.get_reader(city_path)
+    epoch = reader.metadata().build_epoch if reader else None
+    if _ip_range_table is not None and _ip_range_table.build_epoch == epoch:
+        return _ip_range_table
+
+    if os.path.isfile(GEO_RANGES_CACHE_PATH):
+        try:
+            table = IPRangeTable.load(GEO_RANGES_CACHE_PATH)
+            if table.build_epoch == epoch:
+                _ip_range_table = table
+                log_message(f"Таблица IP-диапазонов загружена из кэша: {len(table)} диапазонов")
+                return _ip_range_table
+        except Exception as e:
+            log_message(f"Ошибка чтения кэша IP-диапазонов: {str(e)}", "ERROR")
+
+    if not build:
+        return None
+    try:
+        table = IPRangeTable.build(city_path)
+        table.save(GEO_RANGES_CACHE_PATH)
+        _ip_range_table = table
+    except Exception as e:
+        log_message(f"Ошибка построения таблицы IP-диапазонов: {str(e)}", "ERROR")
+        return None
+    return _ip_range_table
+
+def _ipv4_to_int(ip):
+    """IPv4 строка -> int; -1 для IPv6 и некорректных адресов"""
+    try:
+        return int.from_bytes(socket.inet_pton(socket.AF_INET, ip), "big")
+    except (OSError, TypeError):
+        return -1
+
+def enrich(ips, table=None, service=None):
+    """Пакетное GEO-обогащение: страна, город, координаты и timezone для списка IP.
+
+    Дубли убираются, результат - колонки NumPy, выровненные по колонке "ip"
+    (уникальные IP в порядке первого появления). IPv4 ищутся векторно по таблице
+    диапазонов, IPv6 - поштучно через geo_service. Таблицу enrich() не строит и не
+    ждёт: пока её готовит фоновый поток (или её нет), все IP идут поштучно.
+    """
+    np = lazy_import("numpy")
+    service = service or geo_service
+    unique_ips = list(dict.fromkeys(ips))
+    count = len(unique_ips)
+    country = np.full(count, "UNK", dtype=object)
+    city = np.full(count, "UNK", dtype=object)
+    latitude = np.full(count, np.nan, dtype=np.float32)
+    longitude = np.full(count, np.nan, dtype=np.float32)
+    timezone = np.full(count, None, dtype=object)
+
+    if table is None:
+        table = get_ip_range_table(build=False, service=service, blocking=False)
+
+    ip_ints = np.fromiter((_ipv4_to_int(ip) for ip in unique_ips), dtype=np.int64, count=count)
+    rows = np.full(count, -1, dtype=np.int64)
+    fallback = np.ones(count, dtype=bool)
+    if table is not None:
+        # Таблица покрывает всю IPv4 часть базы - промах по ней значит промах и в базе
+        fallback = ip_ints < 0
+        ipv4 = ip_ints >= 0
+        rows[ipv4] = table.lookup(ip_ints[ipv4].astype(np.uint32))
+        hit = rows >= 0
+        hit_rows = rows[hit]
+        country[hit] = table.countries[table.country_idx[hit_rows]]
+        city[hit] = table.cities[table.city_idx[hit_rows]]
+        latitude[hit] = table.latitude[hit_rows]
+        longitude[hit] = table.longitude[hit_rows]
+        timezone[hit] = table.timezones[table.timezone_idx[hit_rows]]
+
+    # Запасной путь: IPv6 и некорректные адреса (или вся пачка, если таблицы нет)
+    for i in np.flatnonzero(fallback):
+        response = service.city(unique_ips[i])
+        if response is not None:
+            country[i] = response.country.iso_code or "UNK"
+            city[i] = response.city.name or "UNK"
+            if response.location.latitude is not None:
+                latitude[i] = response.location.latitude
+                longitude[i] = response.location.longitude
+            timezone[i] = response.location.time_zone
+        else:
+            country[i] = service.country(unique_ips[i])
+
+    # Timezone по координатам для строк, где база его не указала
+    missing = np.flatnonzero((timezone == None) & ~np.isnan(latitude))
+    if len(missing):
+        timezone[missing] = timezones_at(zip(latitude[missing].tolist(), longitude[missing].tolist()))
+
+    return {
+        "ip": np.array(unique_ips, dtype=object),
+        "country": country,
+        "city": city,
+        "latitude": latitude,
+        "longitude": longitude,
+        "timezone": timezone,
+    }
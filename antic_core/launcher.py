@@ -0,0 +1,416 @@
+# ============================================================
+# ЗАПУСК БРАУЗЕРА: PLAYWRIGHT + ЛОКАЛЬНЫЙ SOCKS-МОСТ PPROXY
+# ============================================================
+import os
+import json
+import shutil
+import asyncio
+import warnings
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from .breaker import proxy_breaker
+from .browsers import configure_playwright_browsers
+from .config import COOKIES_DIR, EXTENSIONS_DIR, COUNTRY_SETTINGS
+from .geo import get_proxy_info
+from .resolver import dns_cache
+from .utils import log_message, lazy_import, notify
+
+if TYPE_CHECKING:
+    from playwright.async_api import BrowserContext
+
+warnings.filterwarnings("ignore", category=UserWarning, module="pproxy")
+
+# Сетевые ошибки Chromium, которые означают отказ прокси, а не сайта
+PROXY_NET_ERRORS = (
+    "ERR_PROXY_CONNECTION_FAILED",
+    "ERR_TUNNEL_CONNECTION_FAILED",
+    "ERR_SOCKS_CONNECTION_FAILED",
+    "ERR_PROXY_AUTH_UNSUPPORTED",
+    "ERR_PROXY_CERTIFICATE_INVALID",
+    "ERR_NO_SUPPORTED_PROXIES",
+)
+# Из них - что до самого прокси нет соединения. Прочие (туннель, авторизация) зависят
+# от логина и отключают только этот прокси: за тем же host:port работают другие логины
+PROXY_UNREACHABLE_ERRORS = (
+    "ERR_PROXY_CONNECTION_FAILED",
+)
+
+async def save_cookies(context: "BrowserContext", profile: str) -> None:
+    """Сохранение cookies с улучшенной обработкой ошибок"""
+    try:
+        cookies = await context.cookies()
+        for cookie in cookies:
+            cookie.pop("sameSite", None)
+        
+        os.makedirs(COOKIES_DIR, exist_ok=True)
+        cookies_file = os.path.join(COOKIES_DIR, profile)
+        
+        with open(cookies_file, "w", encoding="utf-8") as f:
+            json.dump(obj=cookies, fp=f, indent=4)
+        
+        log_message(f"Cookies сохранены для профиля: {profile}")
+    except Exception as e:
+        log_message(f"Ошибка сохранения cookies: {str(e)}", "ERROR")
+
+def parse_netscape_cookies(netscape_cookie_str: str) -> list[dict]:
+    """Парсинг cookies в формате Netscape"""
+    cookies = []
+    lines = netscape_cookie_str.strip().split("\n")
+    for line in lines:
+        if not line.startswith("#") and line.strip():
+            parts = line.split()
+            if len(parts) == 7:
+                cookie = {
+                    "domain": parts[0],
+                    "httpOnly": parts[1].upper() == "TRUE",
+                    "path": parts[2],
+                    "secure": parts[3].upper() == "TRUE",
+                    "expires": float(parts[4]),
+                    "name": parts[5],
+                    "value": parts[6]
+                }
+                cookies.append(cookie)
+    return cookies
+
+async def run_proxy(protocol: str, ip: str, port: int, login: str, password: str):
+    """Запуск прокси сервера"""
+    try:
+        pproxy = lazy_import("pproxy")
+        server = pproxy.Server("socks5://127.0.0.1:1337")
+        remote = pproxy.Connection(f"{protocol}://{ip}:{port}#{login}:{password}")
+        args = dict(rserver=[remote], verbose=print)
+        await server.start_server(args)
+    except Exception as e:
+        log_message(f"Ошибка запуска прокси сервера: {str(e)}", "ERROR")
+
+async def run_browser(user_agent: str, height: int, width: int, timezone: str, lang: str, proxy: str | bool, cookies: str | bool, webgl: bool, vendor: str, cpu: int, ram: int, is_touch: bool, profile: str) -> None:
+    """Запуск браузера с улучшенной обработкой ошибок и уведомлениями"""
+    log_message(f"Запускаем браузер для профиля: {profile}")
+    
+    # Заведомо нерабочий прокси - не тратим запуск Chromium
+    if proxy and not proxy_breaker.allow(proxy):
+        reason = proxy_breaker.reason(proxy) or "недавняя проверка не прошла"
+        log_message(f"Запуск отменён: прокси {proxy} недоступен ({reason})", "ERROR")
+        notify("Прокси не работает", f"Профиль '{profile}' не запущен: {reason}", "error")
+        return
+    
+    configure_playwright_browsers()
+    
+    try:
+        async_playwright = lazy_import("playwright.async_api").async_playwright
+        async with async_playwright() as p:
+            args = [
+                "--no-sandbox",
+                "--disable-setuid-sandbox",
+                "--disable-web-security",
+                "--ignore-certificate-errors",
+                "--disable-infobars",
+                "--disable-blink-features=AutomationControlled",
+                "--disable-dev-shm-usage",  # Для стабильности в режиме администратора
+                "--no-first-run",
+                "--disable-default-apps",
+                "--enable-features=NetworkService,NetworkServiceInProcess"  # DoNotTrack
+            ]
+            
+            if not webgl:
+                args.append("--disable-webgl")
+            
+            proxy_settings = None
+            proxy_task = None
+            proxy_ip = None
+            
+            if proxy:
+                try:
+                    protocol = proxy.split("://")[0]
+                    if "@" in proxy:
+                        splitted = proxy.split("://")[1].split("@")
+                        ip = splitted[1].split(":")[0]
+                        port = int(splitted[1].split(":")[1])
+                        username = splitted[0].split(":")[0]
+                        password = splitted[0].split(":")[1]
+                    else:
+                        splitted = proxy.split("://")[1].split(":")
+                        ip = splitted[0]
+                        port = int(splitted[1])
+                        username = ""
+                        password = ""
+                    
+                    # Хост провайдера -> IP из DNS-кэша (предзагружен при старте):
+                    # мост pproxy и GEO не ждут системный резолвер
+                    try:
+                        resolved = (await dns_cache.resolve(ip))[0]
+                        if ":" not in resolved:
+                            ip = resolved
+                    except OSError as e:
+                        log_message(f"Не удалось определить адрес прокси {ip}: {e}", "ERROR")
+                    
+                    proxy_ip = ip  # Сохраняем IP для автонастройки
+                    
+                    # Получаем GEO информацию о прокси
+                    try:
+                        proxy_geo = get_proxy_info(ip)
+                        country_code = proxy_geo.get("country_code", "US")
+                        
+                        # Автонастройка языка и timezone по GEO прокси
+                        if country_code in COUNTRY_SETTINGS:
+                            auto_settings = COUNTRY_SETTINGS[country_code]
+                            # Используем GEO timezone если он доступен, иначе дефолтный для страны
+                            timezone = proxy_geo.get("timezone") or auto_settings["timezone"]
+                            lang = auto_settings["lang"]
+                            log_message(f"Автонастройка под прокси: {country_code}, язык={lang}, timezone={timezone}")
+                        else:
+                            # Используем GEO timezone если он доступен
+                            if proxy_geo.get("timezone"):
+                                timezone = proxy_geo["timezone"]
+                                log_message(f"Использую GEO timezone: {timezone}")
+                    except Exception as e:
+                        log_message(f"Ошибка получения GEO данных прокси: {e}", "ERROR")
+                        
+                    if protocol == "http":
+                        proxy_settings = {
+                            "server": f"{ip}:{port}",
+                            "username": username,
+                            "password": password
+                        }
+                    else:
+                        proxy_task = asyncio.create_task(run_proxy(protocol, ip, port, username, password))
+                        proxy_settings = {
+                            "server": "socks5://127.0.0.1:1337"
+                        }
+                except Exception as e:
+                    log_message(f"Ошибка настройки прокси: {str(e)}", "ERROR")
+                    notify("Ошибка прокси", f"Не удалось настроить прокси: {str(e)}", "error")
+            
+            # Загружаем расширение CyberYozh, если есть распакованная папка extensions/cyberyozh
+            extension_id = None
+            temp_user_data = None
+            try:
+                ext_dir = Path(EXTENSIONS_DIR) / "cyberyozh"
+                if ext_dir.exists():
+                    args.extend([
+                        f"--disable-extensions-except={ext_dir}",
+                        f"--load-extension={ext_dir}"
+                    ])
+                    # ID расширения CyberYozh (вычислен из public key в manifest.json)
+                    extension_id = "paljcopanhinogelplkpgfnljiomaapc"
+                    
+                    # Создаем временную директорию для persistent context с закрепленным расширением
+                    import tempfile
+                    temp_user_data = tempfile.mkdtemp(prefix="antic_browser_")
+                    prefs_dir = Path(temp_user_data) / "Default"
+                    prefs_dir.mkdir(parents=True, exist_ok=True)
+                    
+                    # Создаем Preferences файл с закрепленным расширением в toolbar
+                    preferences = {
+                        "extensions": {
+                            "pinned_extensions": [extension_id],
+                            "toolbar": [extension_id]
+                        }
+                    }
+                    
+                    with open(prefs_dir / "Preferences", "w") as f:
+                        json.dump(preferences, f)
+                    
+                    log_message(f"Загружаем расширение CyberYozh из {ext_dir} с закреплением")
+                else:
+                    log_message("Папка расширения CyberYozh не найдена (extensions/cyberyozh), пропускаем загрузку")
+            except Exception as e:
+                log_message(f"Ошибка загрузки расширения: {e}", "ERROR")
+
+            # Получаем координаты для геолокации из GEO данных прокси
+            geolocation = None
+            if proxy_ip:
+                try:
+                    proxy_geo = get_proxy_info(proxy_ip)
+                    if "latitude" in proxy_geo and "longitude" in proxy_geo:
+                        geolocation = {
+                            "latitude": proxy_geo["latitude"],
+                            "longitude": proxy_geo["longitude"]
+                        }
+                        log_message(f"Геолокация установлена: {geolocation}")
+                except Exception as e:
+                    log_message(f"Ошибка получения координат: {e}", "ERROR")
+            
+            # Формируем Accept-Language заголовок
+            accept_language = f"{lang},{lang.split('-')[0]};q=0.9,en-US;q=0.8,en;q=0.7"
+            
+            # Используем persistent context если нужно закрепить расширение
+            if temp_user_data:
+                context = await p.chromium.launch_persistent_context(
+                    temp_user_data,
+                    headless=False,
+                    args=args,
+                    user_agent=user_agent,
+                    viewport={"width": width, "height": height},
+                    locale=lang,
+                    timezone_id=timezone,
+                    geolocation=geolocation,
+                    permissions=["geolocation"] if geolocation else None,
+                    extra_http_headers={"Accept-Language": accept_language},
+                    proxy=proxy_settings if proxy_settings else None
+                )
+                browser = None  # При persistent context нет отдельного объекта browser
+            else:
+                browser = await p.chromium.launch(headless=False, args=args)
+                context = await browser.new_context(
+                    user_agent=user_agent,
+                    viewport={"width": width, "height": height},
+                    locale=lang,
+                    timezone_id=timezone,
+                    has_touch=is_touch,
+                    geolocation=geolocation,
+                    permissions=["geolocation"] if geolocation else None,
+                    extra_http_headers={"Accept-Language": accept_language},
+                    proxy=proxy_settings if proxy_settings else None
+                )
+            
+            # Добавляем скрипты для маскировки
+            await context.add_init_script(f"""
+                Object.defineProperty(navigator, 'vendor', {{
+                    get: function() {{
+                        return '{vendor}';
+                    }}
+                }});
+            """)
+            
+            await context.add_init_script(f"""
+                Object.defineProperty(navigator, 'hardwareConcurrency', {{
+                    get: function() {{
+                        return {cpu};
+                    }}
+                }});
+            """)
+            
+            await context.add_init_script(f"""
+                Object.defineProperty(navigator, 'deviceMemory', {{
+                    get: function() {{
+                        return {ram};
+                    }}
+                }});
+            """)
+            
+            # Маскировка языков
+            await context.add_init_script(f"""
+                Object.defineProperty(navigator, 'language', {{
+                    get: function() {{
+                        return '{lang}';
+                    }}
+                }});
+                Object.defineProperty(navigator, 'languages', {{
+                    get: function() {{
+                        return ['{lang}', '{lang.split("-")[0]}', 'en-US', 'en'];
+                    }}
+                }});
+            """)
+            
+            # Блокировка WebRTC утечек IP
+            await context.add_init_script("""
+                // Отключаем enumerateDevices для WebRTC
+                if (navigator.mediaDevices && navigator.mediaDevices.enumerateDevices) {
+                    navigator.mediaDevices.enumerateDevices = function() {
+                        return Promise.resolve([]);
+                    };
+                }
+                
+                // Переопределяем RTCPeerConnection для маскировки IP
+                const original_RTCPeerConnection = window.RTCPeerConnection || window.webkitRTCPeerConnection || window.mozRTCPeerConnection;
+                if (original_RTCPeerConnection) {
+                    window.RTCPeerConnection = function(...args) {
+                        const pc = new original_RTCPeerConnection(...args);
+                        const original_createOffer = pc.createOffer;
+                        pc.createOffer = function() {
+                            return Promise.reject(new Error('WebRTC is disabled'));
+                        };
+                        return pc;
+                    };
+                }
+            """)
+            
+            # Загрузка cookies
+            cookies_parsed = []
+            if cookies and not os.path.isfile(os.path.join(COOKIES_DIR, profile)):
+                try:
+                    with open(cookies, "r", encoding="utf-8") as f:
+                        cookies_content = f.read()
+                        try:
+                            cookies_parsed = json.loads(cookies_content)
+                        except json.decoder.JSONDecodeError:
+                            cookies_parsed = parse_netscape_cookies(cookies_content)
+                except Exception as e:
+                    log_message(f"Ошибка загрузки cookies из файла: {str(e)}", "ERROR")
+                    
+            elif os.path.exists(os.path.join(COOKIES_DIR, profile)):
+                try:
+                    with open(os.path.join(COOKIES_DIR, profile), "r", encoding="utf-8") as f:
+                        cookies_parsed = json.loads(f.read())
+                except Exception as e:
+                    log_message(f"Ошибка загрузки сохраненных cookies: {str(e)}", "ERROR")
+                    cookies_parsed = []
+            
+            # Добавляем cookies в контекст
+            for cookie in cookies_parsed:
+                try:
+                    cookie["sameSite"] = "Strict"
+                    await context.add_cookies([cookie])
+                except Exception as e:
+                    log_message(f"Ошибка добавления cookie: {str(e)}", "ERROR")
+            
+            page = await context.new_page()
+            await page.evaluate("navigator.__proto__.webdriver = undefined;")
+            
+            # Показываем уведомление об успешном запуске
+            notify(
+                "Браузер запущен", 
+                f"Профиль '{profile}' успешно загружен", 
+                "success"
+            )
+            
+            # Открываем вкладку whoer.net автоматически при старте профиля (после загрузки cookies)
+            try:
+                await page.goto("https://whoer.net/", timeout=30000, wait_until="domcontentloaded")
+                log_message("Открыта вкладка whoer.net")
+                if proxy:
+                    proxy_breaker.record_success(proxy)
+            except Exception as e:
+                log_message(f"Не удалось открыть whoer.net: {e}", "ERROR")
+                # Ошибки самого прокси (а не сайта) размыкают его цепь. Эндпоинт целиком - только
+                # если до него нет соединения; с мостом pproxy Chromium подключается к локальному
+                # мосту, и ошибка не говорит об эндпоинте
+                if proxy and any(code in str(e) for code in PROXY_NET_ERRORS):
+                    unreachable = not proxy_task and any(code in str(e) for code in PROXY_UNREACHABLE_ERRORS)
+                    proxy_breaker.record_failure(proxy, f"Браузер: {str(e).splitlines()[0]}", unreachable=unreachable)
+                # В случае ошибки переходим на пустую страницу
+                try:
+                    await page.goto("about:blank", timeout=60000)
+                except Exception as e2:
+                    log_message(f"Не удалось открыть about:blank: {e2}", "ERROR")
+            
+            try:
+                await page.wait_for_event("close", timeout=0)
+            finally:
+                if proxy_task:
+                    proxy_task.cancel()
+                await save_cookies(context, profile)
+                
+                # Очищаем временную директорию
+                if temp_user_data:
+                    try:
+                        shutil.rmtree(temp_user_data, ignore_errors=True)
+                        log_message(f"Временная директория удалена: {temp_user_data}")
+                    except Exception as e:
+                        log_message(f"Не удалось удалить временную директорию: {e}", "ERROR")
+                
+                notify(
+                    "Браузер закрыт", 
+                    f"Профиль '{profile}' завершен, cookies сохранены", 
+                    "info"
+                )
+                    
+    except Exception as e:
+        log_message(f"Критическая ошибка браузера: {str(e)}", "ERROR")
+        notify(
+            "Критическая ошибка", 
+            f"Не удалось запустить браузер: {str(e)}", 
+            "error"
+        )
@@ -0,0 +1,220 @@
+# ============================================================
+# ФОНОВЫЙ МОНИТОР ПРОКСИ: ПЕРЕПРОВЕРКА ПО TTL С ПРИОРИТЕТАМИ
+# ============================================================
+import time
+import asyncio
+import threading
+
+from .breaker import proxy_breaker
+from .profiles import list_profiles, load_profile
+from .proxies import check_proxies_bulk, get_check_budget, get_proxy, submit_check
+from .results import proxy_results
+from .utils import log_message
+
+HEALTH_TTL = 30 * 60             # Рабочий прокси перепроверяется, когда результат старше этого
+HEALTH_RETRY_BASE = 5 * 60       # Первая перепроверка нерабочего; дальше интервал удваивается
+HEALTH_RETRY_MAX = 6 * 60 * 60   # Потолок интервала для нерабочих
+HEALTH_PRIORITY_FRESHNESS = 5 * 60  # Перед запуском профиля результат должен быть не старше этого
+HEALTH_MAX_IN_FLIGHT = 8         # Монитор занимает не больше стольких слотов общего бюджета
+HEALTH_SCAN_INTERVAL = 60        # Как часто перечитывать список прокси и профилей
+
+# Приоритеты очереди: меньше - раньше
+PRIORITY_LAUNCH = 0    # Профиль сейчас запускается
+PRIORITY_PROFILE = 1   # Прокси назначен профилю
+PRIORITY_IMPORTED = 2  # Только что импортирован (enqueue)
+PRIORITY_OTHER = 3     # Остальные прокси из списка
+
+def result_due_at(result) -> float:
+    """Время следующей перепроверки: TTL для рабочих, экспоненциальная задержка для нерабочих"""
+    if not result or "checked_at" not in result:
+        return 0
+    if result.get("status") == "ok":
+        return result["checked_at"] + HEALTH_TTL
+    failures = max(result.get("failures", 1), 1)
+    return result["checked_at"] + min(HEALTH_RETRY_BASE * 2 ** (failures - 1), HEALTH_RETRY_MAX)
+
+def result_is_stale(result) -> bool:
+    """Результат рабочего прокси устарел (старше HEALTH_TTL или без времени проверки)"""
+    if not result or result.get("status") != "ok":
+        return False
+    return time.time() - result.get("checked_at", 0) > HEALTH_TTL
+
+class ProxyHealthMonitor:
+    """Фоновая перепроверка прокси в общем event loop проверок.
+
+    Рабочие прокси перепроверяются по истечении HEALTH_TTL, нерабочие - с
+    экспоненциальной задержкой. Прокси запускаемых профилей идут вне очереди.
+    Проверки делят общий бюджет с массовой проверкой (get_check_budget).
+    """
+    def __init__(self):
+        self._future = None
+        self._loop = None
+        self._wake = None
+        self._stopped = False
+        self._rescan = False
+        self._launching = set()
+        self._imported = set()
+        self._listeners = []
+        self._lock = threading.Lock()
+
+    def start(self):
+        """Запуск монитора (повторный вызов ничего не делает)"""
+        with self._lock:
+            if self._future is not None and not self._future.done():
+                return
+            self._stopped = False
+            self._future = submit_check(self.run())
+        log_message("Монитор прокси запущен")
+
+    def stop(self):
+        """Остановка монитора"""
+        with self._lock:
+            self._stopped = True
+        self._notify()
+
+    def add_listener(self, callback):
+        """callback(proxy, result) - после каждой фоновой проверки (вызывается в потоке проверок)"""
+        self._listeners.append(callback)
+
+    def prioritize(self, proxies):
+        """Проверить прокси вне очереди, если их результат старше HEALTH_PRIORITY_FRESHNESS"""
+        if isinstance(proxies, str):
+            proxies = [proxies]
+        with self._lock:
+            self._launching.update(proxy for proxy in proxies if proxy)
+        self._notify()
+
+    def enqueue(self, proxies):
+        """Новые прокси (например, после импорта): проверить раньше остальных, без ожидания скана.
+
+        Если монитор не запущен (CLI, воркеры без UI), прокси проверяются разово в общем
+        цикле проверок - возвращается Future этой проверки, иначе None.
+        """
+        if isinstance(proxies, str):
+            proxies = [proxies]
+        proxies = [proxy for proxy in proxies if proxy]
+        if not proxies:
+            return None
+        with self._lock:
+            running = self._future is not None and not self._future.done() and not self._stopped
+            if running:
+                self._imported.update(proxies)
+                self._rescan = True
+        if not running:
+            return submit_check(check_proxies_bulk(proxies))
+        self._notify()
+        return None
+
+    def _notify(self):
+        """Разбудить цикл монитора (из любого потока)"""
+        if self._loop is not None and self._wake is not None:
+            try:
+                self._loop.call_soon_threadsafe(self._wake.set)
+            except RuntimeError:
+                pass
+
+    def _candidates(self) -> dict:
+        """Прокси из списка и из профилей: proxy -> приоритет"""
+        candidates = {proxy: PRIORITY_OTHER for proxy in get_proxy(verbose=False)}
+        try:
+            for profile in list_profiles():
+                try:
+                    proxy = load_profile(profile).get("proxy")
+                except Exception:
+                    continue
+                if proxy:
+                    candidates[proxy] = PRIORITY_PROFILE
+        except Exception as e:
+            log_message(f"Монитор прокси: ошибка чтения профилей: {str(e)}", "ERROR")
+        return candidates
+
+    def _due(self, candidates, in_flight):
+        """Очередь проверок [(приоритет, срок, proxy)] и время ближайшего следующего срока"""
+        now = time.time()
+        results = proxy_results.snapshot()
+        with self._lock:
+            launching = set(self._launching)
+            imported = set(self._imported)
+        due, next_due = [], now + HEALTH_SCAN_INTERVAL
+        for proxy in launching:
+            candidates.setdefault(proxy, PRIORITY_LAUNCH)
+        for proxy in imported:
+            candidates[proxy] = min(candidates.get(proxy, PRIORITY_IMPORTED), PRIORITY_IMPORTED)
+        for proxy, priority in candidates.items():
+            if proxy in in_flight:
+                continue
+            result = proxy_results.get(proxy) if proxy in launching else results.get(proxy)
+            due_at = result_due_at(result)
+            if proxy in imported and due_at > now:
+                # Уже проверен (например, при импорте с проверкой) - обычный порядок
+                with self._lock:
+                    self._imported.discard(proxy)
+            if proxy in launching:
+                priority = PRIORITY_LAUNCH
+                due_at = min(due_at, (result or {}).get("checked_at", 0) + HEALTH_PRIORITY_FRESHNESS)
+                if due_at > now:
+                    # Результат свежий - запуск профиля проверки не требует
+                    with self._lock:
+                        self._launching.discard(proxy)
+                    continue
+            if due_at <= now and priority != PRIORITY_LAUNCH and proxy_breaker.is_open(proxy):
+                # Эндпоинт недавно отказал (например, при запуске браузера) - ждём паузу breaker'а
+                continue
+            if due_at <= now:
+                due.append((priority, due_at, proxy))
+            else:
+                next_due = min(next_due, due_at)
+        due.sort()
+        return due, next_due
+
+    async def _check(self, budget, proxy):
+        """Одна фоновая проверка"""
+        try:
+            result = await budget.check(proxy)
+        except Exception as e:
+            log_message(f"Монитор прокси: ошибка проверки {proxy}: {str(e)}", "ERROR")
+            return
+        finally:
+            with self._lock:
+                self._launching.discard(proxy)
+                self._imported.discard(proxy)
+        for callback in self._listeners:
+            try:
+                callback(proxy, result)
+            except Exception as e:
+                log_message(f"Ошибка обработчика монитора прокси: {str(e)}", "ERROR")
+
+    async def run(self):
+        """Цикл монитора: выбрать просроченные результаты, проверить, уснуть до следующего срока"""
+        self._loop = asyncio.get_running_loop()
+        self._wake = asyncio.Event()
+        budget = get_check_budget()
+        in_flight = {}
+        candidates, scanned_at = {}, None
+        try:
+            while not self._stopped:
+                self._wake.clear()
+                with self._lock:
+                    rescan, self._rescan = self._rescan, False
+                if rescan or scanned_at is None or time.monotonic() - scanned_at >= HEALTH_SCAN_INTERVAL:
+                    candidates = await asyncio.to_thread(self._candidates)
+                    scanned_at = time.monotonic()
+
+                due, next_due = self._due(dict(candidates), in_flight)
+                for _, _, proxy in due[:max(HEALTH_MAX_IN_FLIGHT - len(in_flight), 0)]:
+                    task = asyncio.create_task(self._check(budget, proxy))
+                    in_flight[proxy] = task
+                    task.add_done_callback(lambda _, proxy=proxy: (in_flight.pop(proxy, None), self._wake.set()))
+
+                try:
+                    await asyncio.wait_for(self._wake.wait(), max(next_due - time.time(), 1))
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            for task in list(in_flight.values()):
+                task.cancel()
+            await asyncio.to_thread(proxy_results.flush)
+            log_message("Монитор прокси остановлен")
+
+# Глобальный монитор прокси
+proxy_monitor = ProxyHealthMonitor()
@@ -0,0 +1,55 @@
+# ============================================================
+# ПРОФИЛИ БРАУЗЕРА: ФАЙЛЫ config/*.json И ЗАПУСК ПО ПРОФИЛЮ
+# ============================================================
+import os
+import json
+import random
+
+from .config import CONFIG_DIR
+from .launcher import run_browser
+from .useragents import get_user_agents
+from .utils import log_message
+
+def list_profiles():
+    """Список файлов профилей в папке config"""
+    return [cfg for cfg in os.listdir(CONFIG_DIR) if cfg.endswith('.json')]
+
+def load_profile(profile: str) -> dict:
+    """Чтение конфигурации профиля"""
+    with open(os.path.join(CONFIG_DIR, profile), "r", encoding="utf-8") as f:
+        return json.load(f)
+
+def save_profile(profile_name: str, config: dict):
+    """Сохранение конфигурации профиля в config/<имя>.json"""
+    os.makedirs(CONFIG_DIR, exist_ok=True)
+    with open(os.path.join(CONFIG_DIR, f"{profile_name}.json"), "w", encoding="utf-8") as f:
+        json.dump(config, f, indent=4)
+    log_message(f"Профиль сохранен: {profile_name}")
+
+def remove_profile(profile: str):
+    """Удаление файла профиля"""
+    os.remove(os.path.join(CONFIG_DIR, profile))
+    log_message(f"Профиль удален: {profile}")
+
+def next_profile_name() -> str:
+    """Первое свободное имя вида 'Profile N'"""
+    n = 1
+    while os.path.isfile(os.path.join(CONFIG_DIR, f"Profile {n}.json")):
+        n += 1
+    return f"Profile {n}"
+
+async def launch_profile(profile: str, config: dict | None = None) -> None:
+    """Запуск браузера с настройками профиля"""
+    if config is None:
+        config = load_profile(profile)
+    if config.get("proxy"):
+        # Прокси запускаемого профиля монитор перепроверяет вне очереди
+        from .monitor import proxy_monitor
+        proxy_monitor.prioritize(config["proxy"])
+    user_agent = config["user-agent"] if config["user-agent"] else random.choice(get_user_agents())
+    await run_browser(
+        user_agent, config["screen_height"], config["screen_width"],
+        config["timezone"], config["lang"], config["proxy"],
+        config["cookies"], config["webgl"], config["vendor"],
+        config["cpu"], config["ram"], config["is_touch"], profile
+    )
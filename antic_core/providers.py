@@ -0,0 +1,559 @@
+# ============================================================
+# КЛИЕНТЫ ПРОВАЙДЕРОВ ПРОКСИ: SX.ORG И CYBERYOZH
+# ============================================================
+import json
+import time
+
+import requests
+
+from .breaker import proxy_breaker
+from .geo_bulk import enrich
+from .resolver import dns_cache
+from .utils import log_message
+
+# SX.ORG API класс с улучшенной обработкой ошибок
+class SXOrgAPI:
+    def __init__(self):
+        self.base_url = "https://api.sx.org/"
+        self.api_key = ""
+        self.countries = []
+        self.states = []
+        self.cities = []
+        self.ports = []
+        self.balance = "0.00"
+        self.authenticated = False
+        log_message("SXOrgAPI инициализирован")
+    
+    def validate_key(self, api_key):
+        log_message(f"Проверяем API ключ: {api_key[:10]}...")
+        self.api_key = api_key
+        try:
+            # Используем более надежный способ запроса с повторными попытками
+            for attempt in range(3):
+                try:
+                    response = requests.get(
+                        f"{self.base_url}v2/plan/info", 
+                        params={"apiKey": api_key}, 
+                        timeout=15,
+                        headers={'User-Agent': 'Antic Browser v1.0.0'}
+                    )
+                    response.raise_for_status()
+                    data = response.json()
+                    break
+                except requests.exceptions.RequestException as e:
+                    if attempt == 2:
+                        raise e
+                    time.sleep(1)
+            
+            if not data.get('success'):
+                self.authenticated = False
+                log_message("API ключ неверный")
+                return False, "Неверный API ключ или недостаточно прав"
+            
+            # Получаем баланс
+            resp_balance = requests.get(
+                f"{self.base_url}v2/user/balance", 
+                params={"apiKey": api_key}, 
+                timeout=15,
+                headers={'User-Agent': 'Antic Browser v1.0.0'}
+            )
+            resp_balance.raise_for_status()
+            balance_data = resp_balance.json()
+            self.balance = balance_data.get('balance', '0.00') if balance_data.get('success') else '0.00'
+            
+            # Получаем страны
+            resp_countries = requests.get(
+                f"{self.base_url}v2/dir/countries", 
+                params={"apiKey": api_key}, 
+                timeout=15,
+                headers={'User-Agent': 'Antic Browser v1.0.0'}
+            )
+            resp_countries.raise_for_status()
+            countries_data = resp_countries.json()
+            if countries_data.get('success'):
+                self.countries = countries_data['countries']
+                priority_countries = {"United States", "Russia", "Germany", "United Kingdom", "Canada"}
+                prioritized = [c for c in self.countries if c['name'] in priority_countries]
+                others = [c for c in self.countries if c['name'] not in priority_countries]
+                others.sort(key=lambda x: x['name'])
+                self.countries = prioritized + others
+                log_message(f"Загружено {len(self.countries)} стран")
+            
+            self.authenticated = True
+            log_message(f"API ключ валиден, баланс: ${self.balance}")
+            return True, f"Баланс: ${self.balance}"
+        except Exception as e:
+            self.authenticated = False
+            log_message(f"Ошибка валидации API: {str(e)}", "ERROR")
+            return False, str(e)
+    
+    def get_states(self, country_id):
+        log_message(f"Получаем штаты для страны ID: {country_id}")
+        try:
+            resp = requests.get(
+                f"{self.base_url}v2/dir/states", 
+                params={"apiKey": self.api_key, "countryId": country_id}, 
+                timeout=15,
+                headers={'User-Agent': 'Antic Browser v1.0.0'}
+            )
+            resp.raise_for_status()
+            data = resp.json()
+            if data.get('success'):
+                self.states = sorted(data['states'], key=lambda x: x['name'])
+                log_message(f"Загружено {len(self.states)} штатов")
+                return True, self.states
+            log_message("Ошибка получения штатов")
+            return False, "Ошибка получения штатов"
+        except Exception as e:
+            log_message(f"Исключение при получении штатов: {str(e)}", "ERROR")
+            return False, str(e)
+    
+    def get_cities(self, state_id, country_id):
+        log_message(f"Получаем города для штата ID: {state_id}")
+        try:
+            resp = requests.get(
+                f"{self.base_url}v2/dir/cities", 
+                params={"apiKey": self.api_key, "stateId": state_id, "countryId": country_id}, 
+                timeout=15,
+                headers={'User-Agent': 'Antic Browser v1.0.0'}
+            )
+            resp.raise_for_status()
+            data = resp.json()
+            if data.get('success'):
+                self.cities = sorted(data['cities'], key=lambda x: x['name'])
+                log_message(f"Загружено {len(self.cities)} городов")
+                return True, self.cities
+            log_message("Ошибка получения городов")
+            return False, "Ошибка получения городов"
+        except Exception as e:
+            log_message(f"Исключение при получении городов: {str(e)}", "ERROR")
+            return False, str(e)
+    
+    def create_proxy(self, country_code, state_name, city_name, connection_type, proxy_types, proxy_name):
+        log_message(f"Создаем прокси: {proxy_name}")
+        try:
+            type_map = {"keep-connection": 2, "rotate-connection": 3}
+            type_id = type_map.get(connection_type)
+            
+            proxy_type_id = 1 if "residential" in proxy_types else 3 if "mobile" in proxy_types else 4 if "corporate" in proxy_types else 2
+            
+            data = {
+                "country_code": country_code,
+                "state": state_name,
+                "city": city_name,
+                "type_id": type_id,
+                "proxy_type_id": proxy_type_id,
+                "server_port_type_id": 0,
+                "name": proxy_name
+            }
+            
+            headers = {
+                "Content-Type": "application/json",
+                "User-Agent": "Antic Browser v1.0.0"
+            }
+            
+            resp = requests.post(
+                f"{self.base_url}v2/proxy/create-port", 
+                params={"apiKey": self.api_key}, 
+                headers=headers, 
+                data=json.dumps(data), 
+                timeout=30
+            )
+            resp.raise_for_status()
+            result = resp.json()
+            
+            if result.get('success'):
+                proxy_data = result.get('data', [result]) if isinstance(result.get('data'), list) else [result.get('data')]
+                proxies = []
+                for p in proxy_data:
+                    proxy_str = f"http://{p.get('login')}:{p.get('password')}@{p.get('server')}:{p.get('port')}"
+                    proxies.append(proxy_str)
+                log_message(f"Создано {len(proxies)} прокси")
+                return True, proxies
+            else:
+                log_message(f"Ошибка создания прокси: {result.get('message', 'Неизвестная ошибка')}")
+                return False, result.get('message', 'Неизвестная ошибка')
+        except Exception as e:
+            log_message(f"Исключение при создании прокси: {str(e)}", "ERROR")
+            return False, str(e)
+    
+    def get_ports(self):
+        log_message("Получаем список портов")
+        try:
+            resp = requests.get(
+                f"{self.base_url}v2/proxy/ports", 
+                params={"apiKey": self.api_key}, 
+                timeout=15,
+                headers={'User-Agent': 'Antic Browser v1.0.0'}
+            )
+            resp.raise_for_status()
+            data = resp.json()
+            if data.get('success'):
+                self.ports = data['message'].get('proxies', [])
+                log_message(f"Загружено {len(self.ports)} портов")
+                return True, self.ports
+            log_message(f"Ошибка получения портов: {data.get('message', 'Неизвестная ошибка')}")
+            return False, data.get('message', 'Неизвестная ошибка')
+        except Exception as e:
+            log_message(f"Исключение при получении портов: {str(e)}", "ERROR")
+            return False, str(e)
+
+# CyberYozh API класс с улучшенной обработкой ошибок
+class CyberYozhAPI:
+    def __init__(self):
+        self.base_url = "https://app.cyberyozh.com/api/v1/"
+        self.api_key = ""
+        self.balance = 0
+        self.countries = []
+        self.proxies = []
+        self.authenticated = False
+        log_message("CyberYozhAPI инициализирован")
+    
+    def validate_key(self, api_key):
+        log_message(f"Проверяем API ключ CyberYozh: {api_key[:10]}...")
+        self.api_key = api_key
+        try:
+            # Баланс доступен только на v2
+            response = requests.get(
+                "https://app.cyberyozh.com/api/v2/users/balance/", 
+                headers={
+                    'X-Api-Key': api_key,  # Правильный заголовок с заглавными буквами
+                    'User-Agent': 'Antic Browser v1.0.0'
+                },
+                timeout=15
+            )
+            response.raise_for_status()
+            
+            # Ответ возвращает просто число: "1.71$"
+            balance_text = response.text.strip()
+            try:
+                # Убираем символ $ и конвертируем в число
+                self.balance = float(balance_text.replace('$', '').strip())
+            except:
+                self.balance = balance_text
+            
+            self.authenticated = True
+            log_message(f"API ключ CyberYozh валиден, баланс: {self.balance}")
+            return True, f"Баланс: ${self.balance}"
+        except Exception as e:
+            self.authenticated = False
+            log_message(f"Ошибка валидации API CyberYozh: {str(e)}", "ERROR")
+            return False, str(e)
+    
+    def get_countries(self):
+        """Получение списка доступных стран из магазина прокси"""
+        log_message("Получаем список стран CyberYozh")
+        try:
+            response = requests.get(
+                f"{self.base_url}proxies/shop/",
+                headers={
+                    'X-Api-Key': self.api_key,
+                    'User-Agent': 'Antic Browser v1.0.0'
+                },
+                timeout=15
+            )
+            response.raise_for_status()
+            data = response.json()
+            
+            # Парсим данные магазина и извлекаем уникальные страны
+            countries = []
+            if isinstance(data, dict) and 'results' in data:
+                # Извлекаем уникальные коды стран
+                country_codes = set()
+                for item in data['results']:
+                    if 'country_code' in item:
+                        country_codes.add(item['country_code'])
+                countries = sorted(list(country_codes))
+            
+            self.countries = countries
+            log_message(f"Загружено {len(countries)} стран CyberYozh")
+            return True, countries
+        except Exception as e:
+            log_message(f"Ошибка получения стран CyberYozh: {str(e)}", "ERROR")
+            return False, str(e)
+    
+    def create_proxy(self, proxy_id, auto_renew=False):
+        """Покупка прокси по ID продукта из магазина"""
+        log_message(f"Покупаем прокси CyberYozh: id={proxy_id}, auto_renew={auto_renew}")
+        try:
+            # API v1 PurchaseRequest schema: array of objects with 'id' (uuid) and 'auto_renew'
+            data = [{
+                "id": proxy_id,
+                "auto_renew": auto_renew
+            }]
+            
+            response = requests.post(
+                f"{self.base_url}proxies/shop/buy_proxies/",
+                json=data,
+                headers={
+                    'X-Api-Key': self.api_key,
+                    'Content-Type': 'application/json',
+                    'User-Agent': 'Antic Browser v1.0.0'
+                },
+                timeout=30
+            )
+            # Обрабатываем дружелюбные сообщения
+            if response.status_code >= 400:
+                try:
+                    err = response.json()
+                except:
+                    err = {"detail": response.text}
+                msg = err.get('message') or err.get('detail') or 'Ошибка запроса'
+                return False, translate_cyberyozh_message(msg)
+
+            result = response.json()
+            
+            log_message(f"Прокси куплен успешно: {result}")
+            # Возвращаем дружелюбное сообщение, если есть статус/сообщение
+            try:
+                if isinstance(result, list) and result:
+                    item = result[0]
+                    status = item.get('status')
+                    msg = item.get('message')
+                    friendly = translate_cyberyozh_message(msg) if msg else None
+                    if status and friendly:
+                        return False if status == 'canceled' else True, friendly
+            except Exception:
+                pass
+            return True, 'Покупка успешно инициирована'
+        except Exception as e:
+            log_message(f"Ошибка покупки прокси CyberYozh: {str(e)}", "ERROR")
+            return False, str(e)
+    
+    def get_shop_proxies(self, country_code=None, access_type=None, category=None):
+        """Получение списка доступных прокси в магазине"""
+        log_message(f"Получаем список прокси в магазине CyberYozh")
+        try:
+            params = {}
+            if country_code:
+                params['country_code'] = country_code
+            if access_type:
+                params['access_type'] = access_type
+            if category:
+                params['category'] = category
+            
+            response = requests.get(
+                f"{self.base_url}proxies/shop/",
+                params=params,
+                headers={
+                    'X-Api-Key': self.api_key,
+                    'User-Agent': 'Antic Browser v1.0.0'
+                },
+                timeout=15
+            )
+            response.raise_for_status()
+            result = response.json()
+            
+            proxies = result.get('results', []) if isinstance(result, dict) else result
+            log_message(f"Найдено {len(proxies)} прокси в магазине")
+            return True, proxies
+        except Exception as e:
+            log_message(f"Ошибка получения магазина CyberYozh: {str(e)}", "ERROR")
+            return False, str(e)
+    
+    def get_proxies(self, protocol='http', type_format='full_url'):
+        """Получение списка купленных прокси из истории"""
+        log_message(f"Получаем купленные прокси CyberYozh (protocol={protocol}, format={type_format})")
+        try:
+            response = requests.get(
+                f"{self.base_url}proxies/history/",
+                headers={
+                    'X-Api-Key': self.api_key,
+                    'User-Agent': 'Antic Browser v1.0.0'
+                },
+                timeout=15
+            )
+            response.raise_for_status()
+            result = response.json()
+            
+            # Парсим результат
+            proxies_list = result.get('results', []) if isinstance(result, dict) else result
+            
+            # Форматируем прокси в нужный формат с метаданными
+            formatted_proxies = []
+            for proxy in proxies_list:
+                # Получаем данные подключения
+                login = proxy.get('connection_login')
+                password = proxy.get('connection_password')
+                host = proxy.get('connection_host')
+                port = proxy.get('connection_port')
+                complete = all([login, password, host, port])
+                
+                # Формируем строку прокси
+                proxy_str = f"{protocol}://{login}:{password}@{host}:{port}"
+                
+                # Проверяем статус и срок действия; такие прокси отключаем во всём приложении
+                # (только их - через тот же host:port работают прокси с другими логинами)
+                if proxy.get('system_status') != 'active':
+                    log_message(f"Пропускаем прокси с статусом: {proxy.get('system_status')}")
+                    if complete:
+                        proxy_breaker.record_failure(proxy_str, f"CyberYozh: статус {proxy.get('system_status')}")
+                    continue
+                if proxy.get('expired', False):
+                    log_message(f"Пропускаем истекший прокси: {proxy.get('id')}")
+                    if complete:
+                        proxy_breaker.record_failure(proxy_str, "CyberYozh: срок действия истёк")
+                    continue
+                
+                if not complete:
+                    log_message(f"Пропускаем прокси с неполными данными: {proxy.get('id')}")
+                    continue
+                
+                # Добавляем с метаданными для UI (геолокацию без страны от API - ниже, одной пачкой)
+                formatted_proxies.append({
+                    'proxy': proxy_str,
+                    'host': host,
+                    'port': port,
+                    'country': proxy.get('country_code') or 'Unknown',
+                    'city': 'Unknown',
+                    'type': proxy.get('access_type', 'Unknown'),
+                    'category': proxy.get('category', ''),
+                    'expired_at': proxy.get('access_expires_at', ''),
+                    'ip': proxy.get('public_ipaddress') or host
+                })
+            
+            # Если API не вернул страну или вернул Unknown, определяем по GeoIP
+            self._enrich_geo(formatted_proxies)
+            for item in formatted_proxies:
+                log_message(f"Добавлен прокси: {item['host']}:{item['port']} [{item['country']}]")
+            
+            log_message(f"Загружено {len(formatted_proxies)} активных прокси CyberYozh")
+            return True, formatted_proxies
+        except Exception as e:
+            log_message(f"Ошибка получения прокси CyberYozh: {str(e)}", "ERROR")
+            return False, str(e)
+    
+    def _enrich_geo(self, proxies):
+        """Страна и город для прокси без страны от API: пакетно через enrich(), а не по одному IP"""
+        unknown = [item for item in proxies if item['country'] == 'Unknown']
+        if not unknown:
+            return
+        try:
+            # enrich() ищет по адресам: имена хостов резолвим через DNS-кэш (параллельно)
+            dns_cache.prefetch(item['ip'] for item in unknown)
+            addresses = {item['ip']: dns_cache.lookup(item['ip']) for item in unknown}
+            geo = enrich(addresses.values())
+            found = dict(zip(geo["ip"].tolist(), zip(geo["country"].tolist(), geo["city"].tolist())))
+            for item in unknown:
+                item['country'], item['city'] = found.get(addresses[item['ip']], ('UNK', 'Unknown'))
+            log_message(f"Определена геолокация для {len(unknown)} прокси CyberYozh")
+        except Exception as e:
+            log_message(f"Не удалось определить геолокацию прокси CyberYozh: {str(e)}", "ERROR")
+            for item in unknown:
+                item['country'] = 'UNK'
+
+def translate_cyberyozh_message(msg: str) -> str:
+    """Переводит системные ответы CyberYozh в понятные русские сообщения."""
+    if not msg:
+        return "Неизвестная ошибка"
+    text = msg.strip()
+    mapping = {
+        "Not enough money.": "Недостаточно средств",
+        "Request was throttled.": "Слишком много запросов. Попробуйте позже",
+        "Invalid API Key": "Неверный API ключ",
+        "Bad Request": "Некорректный запрос",
+        "Unauthorized": "Неавторизовано",
+        "Forbidden": "Доступ запрещён",
+        "Not Found": "Элемент не найден",
+        "Too Many Requests": "Слишком много запросов",
+        "Internal Server Error": "Внутренняя ошибка сервера",
+    }
+    # Точное совпадение
+    if text in mapping:
+        return mapping[text]
+    # Эвристики
+    if "money" in text.lower():
+        return "Недостаточно средств"
+    if "throttle" in text.lower() or "too many" in text.lower():
+        return "Слишком много запросов. Попробуйте позже"
+    return text
+    
+    def get_proxies(self, protocol='http', type_format='full_url'):
+            """Получение списка купленных прокси с credentials"""
+            log_message(f"Получаем список купленных прокси CyberYozh (protocol={protocol}, format={type_format})")
+            try:
+                # Используем /proxies/history/ который возвращает полную информацию
+                response = requests.get(
+                    f"{self.base_url}proxies/history/",
+                    headers={
+                        'X-Api-Key': self.api_key,
+                        'User-Agent': 'Antic Browser v1.0.0'
+                    },
+                    timeout=15
+                )
+                response.raise_for_status()
+                result = response.json()
+            
+                proxies = []
+                # Парсим ответ с полной информацией о прокси
+                if isinstance(result, dict) and 'results' in result:
+                    for item in result['results']:
+                        try:
+                            # Пропускаем истекшие прокси
+                            if item.get('expired', False):
+                                continue
+                        
+                            # Извлекаем данные для подключения
+                            host = item.get('connection_host', '')
+                            port = item.get('connection_port', '')
+                            login = item.get('connection_login', '')
+                            password = item.get('connection_password', '')
+                        
+                            # Определяем протокол из URL или используем заданный
+                            url = item.get('url', '')
+                            if url.startswith('socks5://') or url.startswith('socks5_http://'):
+                                proxy_protocol = 'socks5'
+                            else:
+                                proxy_protocol = protocol
+                        
+                            # Формируем прокси в нужном формате
+                            if type_format == 'full_url':
+                                proxy_str = f"{proxy_protocol}://{login}:{password}@{host}:{port}"
+                            elif type_format == 'ip_port_user_pass':
+                                proxy_str = f"{host}:{port}:{login}:{password}"
+                            elif type_format == 'user_pass_at_ip_port':
+                                proxy_str = f"{login}:{password}@{host}:{port}"
+                            else:
+                                proxy_str = f"{proxy_protocol}://{login}:{password}@{host}:{port}"
+                        
+                            proxies.append(proxy_str)
+                        except Exception as e:
+                            log_message(f"Ошибка парсинга прокси: {str(e)}", "ERROR")
+                            continue
+            
+                log_message(f"Получено {len(proxies)} прокси CyberYozh")
+                return True, proxies if proxies else []
+            except Exception as e:
+                log_message(f"Ошибка получения прокси CyberYozh: {str(e)}", "ERROR")
+                return False, str(e)
+    
+    def download_proxies_txt(self, protocol='http', type_format='full_url'):
+        """Скачивание всех прокси в текстовом формате (для импорта)"""
+        log_message(f"Скачиваем прокси CyberYozh в TXT формате (protocol={protocol}, format={type_format})")
+        try:
+            params = {
+                'type_format': type_format
+            }
+            if protocol:
+                params['protocol'] = protocol
+            
+            response = requests.get(
+                f"{self.base_url}proxies/proxy-credentials/download/",
+                params=params,
+                headers={
+                    'X-Api-Key': self.api_key,
+                    'User-Agent': 'Antic Browser v1.0.0'
+                },
+                timeout=30
+            )
+            response.raise_for_status()
+            
+            # Ответ в формате plain text со списком прокси
+            proxies_text = response.text.strip()
+            proxies = [p.strip() for p in proxies_text.split('\n') if p.strip()]
+            
+            log_message(f"Скачано {len(proxies)} прокси CyberYozh")
+            return True, proxies
+        except Exception as e:
+            log_message(f"Ошибка скачивания прокси CyberYozh: {str(e)}", "ERROR")
+            return False, str(e)
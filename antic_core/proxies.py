@@ -0,0 +1,677 @@
+# ============================================================
+# ПРОКСИ: СПИСОК (proxy_store), ПРОВЕРКА РАБОТОСПОСОБНОСТИ, КЭШ РЕЗУЛЬТАТОВ
+# ============================================================
+import time
+import base64
+import socket
+import statistics
+import asyncio
+import weakref
+import threading
+from contextlib import asynccontextmanager
+from urllib.parse import urlsplit
+
+from .breaker import proxy_breaker
+from .geo import geo_service
+from .resolver import dns_cache
+from .results import proxy_results
+from .scoring import record_check
+from .store import proxy_store
+from .utils import log_message, lazy_import, parse_proxy
+
+def get_proxy_check_cache():
+    """Копия результатов проверки прокси: proxy -> результат (запись - через proxy_results)"""
+    return proxy_results.snapshot()
+
+# Общий event loop для проверок прокси: все проверки идут в одном фоновом потоке
+_checker_loop = None
+_checker_loop_lock = threading.Lock()
+
+def get_checker_loop():
+    """Event loop проверок (запускается в фоновом потоке при первом обращении)"""
+    global _checker_loop
+    if _checker_loop is None:
+        with _checker_loop_lock:
+            if _checker_loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name="proxy-checker", daemon=True).start()
+                _checker_loop = loop
+    return _checker_loop
+
+def submit_check(coro):
+    """Запуск корутины в общем цикле проверок из любого потока (возвращает concurrent.futures.Future)"""
+    return asyncio.run_coroutine_threadsafe(coro, get_checker_loop())
+
+def proxy_client_url(proxy_str: str, protocol: str) -> str:
+    """URL прокси для клиента: SOCKS5 всегда как socks5h, SOCKS4 - как socks4 (4a включает транспорт)"""
+    if protocol.startswith("socks4"):
+        return proxy_str.replace("socks4a://", "socks4://")
+    if protocol.startswith("socks"):
+        return proxy_str.replace("socks5_http://", "socks5h://").replace("socks5://", "socks5h://")
+    return proxy_str
+
+# Список сервисов для проверки: сначала HTTP, затем HTTPS (уменьшаем блокировки)
+# Соседние сервисы на разных хостах: запасной запрос уходит не туда, где застрял первый
+CHECK_SERVICES = [
+    ("http://api.ipify.org?format=json", "ip"),
+    ("http://httpbin.org/ip", "origin"),
+    ("http://checkip.amazonaws.com", None),
+    ("https://api.ipify.org?format=json", "ip"),
+    ("https://httpbin.org/ip", "origin"),
+    ("https://checkip.amazonaws.com", None),
+]
+CHECK_TIMEOUT = 8    # Таймаут одного запроса к сервису
+CHECK_DEADLINE = 10  # Жёсткий предел на всю проверку прокси
+HEDGE_DELAY = 1.0    # Через сколько секунд без ответа запускать запасной запрос
+PREFLIGHT_TIMEOUT = 3  # Таймаут TCP-подключения и рукопожатия с прокси
+
+# SSL-контекст общий для всех клиентов: загрузка сертификатов на каждый клиент
+# занимает десятки миллисекунд и блокирует event loop
+_ssl_context = None
+
+def get_ssl_context():
+    """Общий SSL-контекст для проверок (создаётся при первом обращении)"""
+    global _ssl_context
+    if _ssl_context is None:
+        _ssl_context = lazy_import("httpx").create_ssl_context()
+    return _ssl_context
+
+def proxy_client(proxy_str: str, protocol: str, timeout=CHECK_TIMEOUT):
+    """httpx.AsyncClient, работающий через прокси"""
+    httpx = lazy_import("httpx")
+    options = {"timeout": timeout, "headers": {'User-Agent': 'Antic Browser v1.0.0'}}
+    if protocol.startswith("socks4"):
+        # httpx сам умеет только SOCKS5 - SOCKS4 через транспорт httpx-socks
+        # (rdns: SOCKS4a, имя сервиса резолвит прокси, как и у socks5h)
+        transport = lazy_import("httpx_socks").AsyncProxyTransport.from_url(
+            proxy_client_url(proxy_str, protocol), rdns=True, verify=get_ssl_context())
+        return httpx.AsyncClient(transport=transport, **options)
+    return httpx.AsyncClient(proxy=proxy_client_url(proxy_str, protocol), verify=get_ssl_context(), **options)
+
+# Улучшенная функция проверки прокси
+async def check_proxy_async(proxy: str, save_cache: bool = True) -> dict:
+    """Асинхронная проверка прокси на httpx: HTTP/HTTPS и SOCKS5 без блокировки event loop (без использования кэша)"""
+    log_message(f"Проверяем прокси: {proxy}")
+    
+    # Всегда выполняем живую проверку; кэш не используем для чтения
+    
+    # Парсинг прокси
+    try:
+        protocol, ip, port, username, password = parse_proxy(proxy)
+    except Exception as e:
+        log_message(f"Ошибка парсинга прокси {proxy}: {str(e)}", "ERROR")
+        result = {"status": "error", "proxy_str": proxy, "stage": "parse", "error": f"Ошибка парсинга: {str(e)}"}
+        # Как и прочие исходы - с временем проверки и счётчиком неудач (иначе монитор перепроверяет без паузы)
+        return await _store_check_result(proxy, result, save_cache)
+    
+    # Формируем строку прокси
+    if username and password:
+        proxy_str = f"{protocol}://{username}:{password}@{ip}:{port}"
+    else:
+        proxy_str = f"{protocol}://{ip}:{port}"
+    
+    # Фазы задержки: dns, connect, handshake (до прокси), tls, ttfb и total (запрос через прокси)
+    timings = {}
+    progress = {"stage": "tcp"}
+    try:
+        # Один жёсткий предел на всю проверку: DNS, подключение, рукопожатие и запросы через прокси
+        result = await asyncio.wait_for(
+            _check_live(proxy, protocol, ip, port, username, password, proxy_str, timings, progress), CHECK_DEADLINE)
+    except asyncio.TimeoutError:
+        stage = progress["stage"]
+        if stage == "tcp" and "connect" in timings:
+            stage = "handshake"
+        result = {"status": "error", "proxy_str": proxy_str, "stage": stage,
+                  "error": f"Проверка не уложилась в {CHECK_DEADLINE}с"}
+        if stage != "egress":
+            # До прокси не достучались за весь срок - эндпоинт недоступен
+            result["unreachable"] = True
+        log_message(f"Проверка прокси {proxy_str} прервана по таймауту {CHECK_DEADLINE}с ({stage})", "ERROR")
+    return await _store_check_result(proxy, result, save_cache)
+
+async def _check_live(proxy, protocol, ip, port, username, password, proxy_str, timings, progress):
+    """Живая проверка без записи результата: предпроверка, затем внешний IP через прокси.
+    
+    progress["stage"] - текущий уровень (для результата при прерывании по дедлайну).
+    """
+    # Уровни 0-1: TCP и рукопожатие с прокси - мёртвые прокси отсеиваются за миллисекунды,
+    # не нагружая сервисы проверки IP
+    stage, error, unreachable = await _preflight(protocol, ip, port, username, password, timings)
+    if error:
+        result = {"status": "error", "proxy_str": proxy_str, "stage": stage, "error": error}
+        if unreachable:
+            # Эндпоинт недоступен целиком (нет TCP, таймаут) - не зависит от логина
+            result["unreachable"] = True
+        log_message(f"Прокси не работает ({stage}): {proxy_str} - {error}", "ERROR")
+        return result
+    
+    # Уровень 2: внешний IP через прокси
+    progress["stage"] = "egress"
+    result = None
+    try:
+        # Клиенту - уже известный адрес прокси, без повторного резолва
+        # (HTTPS-прокси оставляем по имени: оно нужно для TLS до прокси)
+        client_proxy_str = proxy_str
+        if not protocol.startswith("https"):
+            address = (await dns_cache.resolve(ip))[0]
+            if address != ip and ":" not in address:
+                client_proxy_str = proxy_str.replace(f"@{ip}:", f"@{address}:") if "@" in proxy_str else f"{protocol}://{address}:{port}"
+        # Один клиент на проверку: запросы гонки идут через общий пул соединений с прокси
+        async with proxy_client(client_proxy_str, protocol) as client:
+            result = await _check_with_client(client, proxy, protocol, proxy_str, ip, timings)
+    except Exception as e:
+        log_message(f"Ошибка проверки прокси {proxy_str}: {str(e)}", "ERROR")
+    
+    if result is None:
+        # Ни один сервис не ответил
+        result = {"status": "error", "proxy_str": proxy_str, "stage": "egress", "error": "Прокси не отвечает или блокирует подключение"}
+        log_message(f"Прокси не работает: {proxy_str}", "ERROR")
+    
+    return result
+
+async def _store_check_result(proxy, result, save_cache):
+    """Запись результата в хранилище (save_cache - сбросить на диск сразу, не дожидаясь пачки)"""
+    # Замер скорости делается отдельно и редко - повторная проверка его не стирает
+    previous = proxy_results.get(proxy) or {}
+    if result.get("status") == "ok" and "throughput" in previous:
+        result["throughput"] = previous["throughput"]
+    # Время проверки и число неудач подряд - для планирования перепроверок
+    result["checked_at"] = time.time()
+    result["failures"] = 0 if result.get("status") == "ok" else previous.get("failures", 0) + 1
+    # Скользящая статистика: одна удачная проверка не скрывает нестабильный прокси
+    result["stats"] = record_check(previous.get("stats"), result)
+    proxy_results.put(proxy, result)
+    proxy_store.record_check(proxy, result)
+    # Вердикт проверки - пробная попытка для circuit breaker. Цепь host:port размыкает только
+    # недоступность эндпоинта; отказ логину (407, SOCKS auth) или выходу в интернет
+    # отключает только этот прокси - другие прокси шлюза не затрагиваются
+    if result.get("status") == "ok":
+        proxy_breaker.record_success(proxy)
+    else:
+        proxy_breaker.record_failure(proxy, result.get("error"), unreachable=bool(result.get("unreachable")))
+    
+    # Сбрасываем в пуле потоков, чтобы запись файла не тормозила остальные проверки
+    if save_cache:
+        await asyncio.to_thread(proxy_results.flush)
+    
+    return result
+
+async def _preflight(protocol, ip, port, username, password, timings):
+    """Уровни 0-1 проверки: TCP-подключение и рукопожатие с прокси.
+    
+    Возвращает (уровень, ошибка, эндпоинт недоступен); ошибка None - можно проверять
+    внешний IP. В timings записываются фазы dns, connect и handshake (секунды).
+    """
+    try:
+        started = time.perf_counter()
+        # Хост прокси - через общий DNS-кэш (предзагружается при старте)
+        addresses = await asyncio.wait_for(dns_cache.resolve(ip), PREFLIGHT_TIMEOUT)
+        timings["dns"] = time.perf_counter() - started
+        address = addresses[0]
+        
+        started = time.perf_counter()
+        reader, writer = await asyncio.wait_for(asyncio.open_connection(address, port), PREFLIGHT_TIMEOUT)
+        timings["connect"] = time.perf_counter() - started
+    except asyncio.TimeoutError:
+        return "tcp", f"Нет ответа на {ip}:{port} за {PREFLIGHT_TIMEOUT}с", True
+    except (OverflowError, ValueError, UnicodeError) as e:
+        # Адрес, который не пропускает сокет (порт вне диапазона, пустая метка хоста) - ошибка строки прокси
+        return "parse", f"Некорректный адрес прокси {ip}:{port}: {str(e) or type(e).__name__}", False
+    except socket.gaierror as e:
+        return "tcp", str(e), True
+    except OSError as e:
+        return "tcp", f"Порт {ip}:{port} недоступен: {e.strerror or str(e)}", True
+    
+    started = time.perf_counter()
+    unreachable = False
+    try:
+        if protocol.startswith("socks5"):
+            error = await asyncio.wait_for(_socks5_handshake(reader, writer, username, password), PREFLIGHT_TIMEOUT)
+        elif protocol.startswith("socks4"):
+            error = await asyncio.wait_for(_socks4_handshake(reader, writer, username), PREFLIGHT_TIMEOUT)
+        elif protocol == "http":
+            error = await asyncio.wait_for(_http_connect_handshake(reader, writer, username, password), PREFLIGHT_TIMEOUT)
+        else:
+            # HTTPS-прокси требует TLS до прокси - рукопожатие проверит уровень 2
+            error = None
+        if not error and not protocol.startswith("https"):
+            timings["handshake"] = time.perf_counter() - started
+    except asyncio.TimeoutError:
+        error = f"Прокси не ответил на рукопожатие за {PREFLIGHT_TIMEOUT}с"
+        unreachable = True
+    except (OSError, asyncio.IncompleteReadError) as e:
+        error = f"Прокси закрыл соединение при рукопожатии: {str(e) or type(e).__name__}"
+    finally:
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except Exception:
+            pass
+    return ("handshake", error, unreachable) if error else (None, None, False)
+
+async def _socks5_handshake(reader, writer, username, password):
+    """Приветствие SOCKS5 и авторизация логином/паролем (RFC 1928/1929); ошибка или None"""
+    methods = b"\x00\x02" if username else b"\x00"
+    writer.write(b"\x05" + bytes([len(methods)]) + methods)
+    await writer.drain()
+    version, method = await reader.readexactly(2)
+    if version != 5:
+        return "Это не SOCKS5 прокси"
+    if method == 0xFF:
+        return "Прокси не принял ни один способ авторизации"
+    if method == 0x02:
+        user, secret = username.encode(), password.encode()
+        writer.write(b"\x01" + bytes([len(user)]) + user + bytes([len(secret)]) + secret)
+        await writer.drain()
+        _, status = await reader.readexactly(2)
+        if status != 0:
+            return "Неверный логин или пароль прокси"
+    return None
+
+async def _socks4_handshake(reader, writer, username):
+    """Запрос CONNECT SOCKS4a к сервису проверки (логин - user id, без пароля); ошибка или None"""
+    target = urlsplit(CHECK_SERVICES[0][0])
+    port = target.port or (443 if target.scheme == "https" else 80)
+    # Адрес 0.0.0.1 - признак SOCKS4a: имя хоста цели идёт после user id
+    writer.write(b"\x04\x01" + port.to_bytes(2, "big") + b"\x00\x00\x00\x01"
+                 + username.encode() + b"\x00" + target.hostname.encode() + b"\x00")
+    await writer.drain()
+    version, status = (await reader.readexactly(8))[:2]
+    if version != 0:
+        return "Это не SOCKS4 прокси"
+    if status in (0x5C, 0x5D):
+        return "Прокси не принял идентификатор пользователя"
+    # Отказ 0x5B бывает и у рабочих SOCKS4 без поддержки 4a - решит уровень 2
+    return None
+
+async def _http_connect_handshake(reader, writer, username, password):
+    """CONNECT через HTTP-прокси с Basic-авторизацией; ошибка или None"""
+    target = f"{urlsplit(CHECK_SERVICES[0][0]).hostname}:443"
+    request = f"CONNECT {target} HTTP/1.1\r\nHost: {target}\r\n"
+    if username:
+        token = base64.b64encode(f"{username}:{password}".encode()).decode()
+        request += f"Proxy-Authorization: Basic {token}\r\n"
+    writer.write((request + "\r\n").encode())
+    await writer.drain()
+    status_line = await reader.readline()
+    if not status_line:
+        # Часть прокси молча рвёт CONNECT до недоступной цели - решит уровень 2
+        return None
+    parts = status_line.decode("latin-1").split()
+    if len(parts) < 2 or not parts[0].startswith("HTTP/"):
+        return "Это не HTTP прокси"
+    if parts[1] == "407":
+        return "Неверный логин или пароль прокси"
+    # Прочие коды (например, запрет CONNECT) не значат, что прокси мёртв - решит уровень 2
+    return None
+
+def _trace_timings(events):
+    """Фазы tls и ttfb по событиям трассировки httpcore [(имя, момент)]"""
+    timings = {}
+    started = {}
+    moments = {}
+    for name, moment in events:
+        base, _, state = name.rpartition(".")
+        phase = base.rsplit(".", 1)[-1]
+        moments[(phase, state)] = moment
+        if state == "started":
+            started[base] = moment
+        elif state == "complete" and base in started and phase == "start_tls":
+            # TLS может быть дважды: до HTTPS-прокси и до сервиса
+            timings["tls"] = timings.get("tls", 0.0) + moment - started.pop(base)
+    # Последний запрос в событиях - сам запрос к сервису (до него может быть CONNECT)
+    request_sent = moments.get(("send_request_headers", "started"))
+    response_received = moments.get(("receive_response_headers", "complete"))
+    if request_sent is not None and response_received is not None:
+        timings["ttfb"] = response_received - request_sent
+    return timings
+
+async def _probe(client, service_url, ip_field, ip):
+    """Один запрос к сервису проверки IP: (внешний IP, задержка, фазы tls/ttfb) или исключение"""
+    events = []
+    
+    async def trace(name, info):
+        events.append((name, time.perf_counter()))
+    
+    start_time = time.perf_counter()
+    response = await client.get(service_url, extensions={"trace": trace})
+    latency = time.perf_counter() - start_time
+    if response.status_code != 200:
+        raise ValueError(f"{service_url} ответил {response.status_code}")
+    
+    # Парсим IP в зависимости от сервиса
+    try:
+        if ip_field:
+            returned_ip = response.json().get(ip_field, ip)
+        else:
+            returned_ip = response.text.strip()
+    except Exception:
+        returned_ip = ip
+    return returned_ip, latency, _trace_timings(events)
+
+async def _race_probes(client, ip):
+    """Гонка запросов к сервисам: первый ответ побеждает, остальные отменяются.
+    
+    Запасной запрос запускается, если за HEDGE_DELAY ответа нет, или сразу после
+    ошибки предыдущего. None - ответа нет; общий предел CHECK_DEADLINE ставит check_proxy_async.
+    """
+    services = iter(CHECK_SERVICES)
+    pending = set()
+    
+    def launch():
+        service = next(services, None)
+        if service is None:
+            return
+        pending.add(asyncio.create_task(_probe(client, service[0], service[1], ip)))
+    
+    launch()
+    try:
+        while pending:
+            done, _ = await asyncio.wait(pending, timeout=HEDGE_DELAY, return_when=asyncio.FIRST_COMPLETED)
+            if not done:
+                # Ответа нет - подстраховываемся запросом к следующему сервису
+                launch()
+                continue
+            for task in done:
+                pending.discard(task)
+                try:
+                    return task.result()
+                except Exception as err:
+                    log_message(f"Ошибка запроса через прокси: {err!r}", "ERROR")
+                    launch()
+        return None
+    finally:
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+async def _check_with_client(client, proxy, protocol, proxy_str, ip, timings):
+    """Проверка через клиент с прокси: внешний IP, GEO и задержка; результат или None"""
+    answer = await _race_probes(client, ip)
+    if answer is None:
+        return None
+    returned_ip, latency, probe_timings = answer
+    timings.update(probe_timings)
+    timings["total"] = latency
+    
+    # Получаем геоданные - используем локальную базу GeoIP
+    country = "UNK"
+    city = "UNK"
+    
+    try:
+        country = geo_service.country(returned_ip)
+        geo_response = geo_service.city(returned_ip)
+        if geo_response is not None:
+            city = geo_response.city.name or "UNK"
+    except Exception:
+        pass
+    
+    log_message(f"Прокси работает: {country}, {city}, IP: {returned_ip}, время: {latency:.2f}с")
+    return {
+        "status": "ok", 
+        "country": country, 
+        "city": city, 
+        "type": protocol, 
+        "proxy_str": proxy_str, 
+        "latency": latency,
+        "timings": {phase: round(value, 4) for phase, value in timings.items()},
+        "ip": returned_ip
+    }
+
+# Замер пропускной способности (необязательный, по кнопке): сервис отдаёт и
+# принимает THROUGHPUT_SIZE байт, скорость считается от первого байта ответа
+THROUGHPUT_DOWNLOAD_URL = "https://speed.cloudflare.com/__down?bytes={size}"
+THROUGHPUT_UPLOAD_URL = "https://speed.cloudflare.com/__up"
+THROUGHPUT_SIZE = 5 * 1024 * 1024
+THROUGHPUT_MAX_DURATION = 15  # Дольше не качаем: скорость считаем по полученному
+THROUGHPUT_WINDOW = 0.25      # Окно замера для разброса скорости (jitter)
+THROUGHPUT_CHUNK = 64 * 1024
+
+async def _measure_download(client, url):
+    """Скачивание через прокси: (байт, секунд от первого байта, скорости по окнам)"""
+    received = 0
+    window_rates = []
+    async with client.stream("GET", url) as response:
+        response.raise_for_status()
+        first_byte = None
+        window_start = window_bytes = 0
+        async for chunk in response.aiter_raw(THROUGHPUT_CHUNK):
+            now = time.perf_counter()
+            if first_byte is None:
+                first_byte = window_start = now
+            received += len(chunk)
+            window_bytes += len(chunk)
+            if now - window_start >= THROUGHPUT_WINDOW:
+                window_rates.append(window_bytes / (now - window_start))
+                window_start, window_bytes = now, 0
+            if now - first_byte >= THROUGHPUT_MAX_DURATION:
+                break
+    elapsed = time.perf_counter() - first_byte if first_byte is not None else 0.0
+    return received, elapsed, window_rates
+
+async def _measure_upload(client, url, size):
+    """Отправка size байт через прокси: (байт, секунд)"""
+    # Тело целиком в памяти: потоковое (chunked) тело рвут часть HTTP-прокси
+    payload = bytes(size)
+    started = time.perf_counter()
+    response = await client.post(url, content=payload, headers={"Content-Type": "application/octet-stream"})
+    response.raise_for_status()
+    return size, time.perf_counter() - started
+
+async def measure_proxy_throughput(proxy: str, size: int = THROUGHPUT_SIZE,
+                                   download_url: str = THROUGHPUT_DOWNLOAD_URL,
+                                   upload_url: str = THROUGHPUT_UPLOAD_URL,
+                                   save_cache: bool = True) -> dict:
+    """Замер скорости прокси: загрузка, отдача (байт/с) и разброс скорости загрузки.
+    
+    Результат сохраняется в кэш проверок рядом с задержкой (ключ "throughput").
+    upload_url=None - только загрузка.
+    """
+    log_message(f"Замеряем скорость прокси: {proxy}")
+    try:
+        protocol, ip, port, username, password = parse_proxy(proxy)
+    except Exception as e:
+        return {"status": "error", "error": f"Ошибка парсинга: {str(e)}"}
+    proxy_str = f"{protocol}://{username}:{password}@{ip}:{port}" if username and password else f"{protocol}://{ip}:{port}"
+    
+    httpx = lazy_import("httpx")
+    timeout = httpx.Timeout(CHECK_TIMEOUT, read=CHECK_TIMEOUT, write=THROUGHPUT_MAX_DURATION * 2)
+    try:
+        async with proxy_client(proxy_str, protocol, timeout) as client:
+            received, elapsed, window_rates = await _measure_download(client, download_url.format(size=size))
+            upload = None
+            if upload_url:
+                sent, upload_elapsed = await _measure_upload(client, upload_url, size)
+                upload = sent / upload_elapsed if upload_elapsed > 0 else None
+    except Exception as e:
+        log_message(f"Ошибка замера скорости {proxy_str}: {e!r}", "ERROR")
+        return {"status": "error", "error": f"Ошибка замера скорости: {str(e) or type(e).__name__}"}
+    
+    download = received / elapsed if elapsed > 0 else None
+    # Разброс скорости по окнам - насколько «рвано» идёт поток
+    jitter = statistics.pstdev(window_rates) if len(window_rates) > 1 else 0.0
+    result = {
+        "status": "ok",
+        "download": download,
+        "upload": upload,
+        "jitter": jitter,
+        "bytes": received,
+        "measured_at": time.time(),
+    }
+    
+    proxy_results.update(proxy, {"status": "unchecked", "proxy_str": proxy_str, "type": protocol}, throughput=result)
+    if save_cache:
+        await asyncio.to_thread(proxy_results.flush)
+    
+    def mbit(rate):
+        return f"{rate * 8 / 1_000_000:.1f}" if rate else "?"
+    log_message(f"Скорость прокси {proxy_str}: загрузка {mbit(download)} Мбит/с, отдача {mbit(upload)} Мбит/с, разброс ±{mbit(jitter)} Мбит/с")
+    return result
+
+# Лимиты массовой проверки: всего одновременных проверок и через один хост провайдера
+# (шлюзы SX/CyberYozh режут частые подключения с одного адреса)
+CHECK_CONCURRENCY = 32
+CHECK_PER_HOST_LIMIT = 4
+
+def proxy_host(proxy: str) -> str:
+    """Хост прокси (шлюз провайдера) для лимита на хост"""
+    try:
+        return parse_proxy(proxy, canonical=True)[1]
+    except Exception:
+        return proxy
+
+class CheckBudget:
+    """Бюджет параллельности проверок: общий лимит и лимит на хост прокси"""
+    def __init__(self, concurrency=CHECK_CONCURRENCY, per_host_limit=CHECK_PER_HOST_LIMIT):
+        self.concurrency = concurrency
+        self.per_host_limit = per_host_limit
+        self._global = asyncio.Semaphore(concurrency)
+        self._hosts = {}  # host -> семафор; есть только пока через хост идут или ждут проверки
+        self._users = {}  # host -> проверок, держащих или ждущих слот хоста
+    
+    @asynccontextmanager
+    async def slot(self, proxy):
+        """Слот на одну проверку"""
+        host = proxy_host(proxy)
+        host_limit = self._hosts.get(host)
+        if host_limit is None:
+            host_limit = self._hosts[host] = asyncio.Semaphore(self.per_host_limit)
+        self._users[host] = self._users.get(host, 0) + 1
+        try:
+            # Сначала слот хоста, потом общий: прокси одного шлюза не занимают общие слоты в ожидании
+            async with host_limit:
+                async with self._global:
+                    yield
+        finally:
+            # Простаивающий хост забываем: монитор живёт весь процесс, а хостов становится всё больше
+            self._users[host] -= 1
+            if not self._users[host]:
+                del self._users[host], self._hosts[host]
+    
+    async def check(self, proxy):
+        """Проверка прокси в рамках бюджета (результат уходит в журнал пачкой)"""
+        async with self.slot(proxy):
+            return await check_proxy_async(proxy, save_cache=False)
+
+# Общий бюджет на event loop: массовая проверка и фоновый монитор делят одни лимиты
+_check_budgets = weakref.WeakKeyDictionary()
+
+def get_check_budget() -> CheckBudget:
+    """Общий бюджет проверок для текущего event loop"""
+    loop = asyncio.get_running_loop()
+    budget = _check_budgets.get(loop)
+    if budget is None:
+        budget = _check_budgets[loop] = CheckBudget()
+    return budget
+
+async def check_proxies_bulk(proxies, on_result=None, on_progress=None,
+                             concurrency=None, per_host_limit=None) -> dict:
+    """Массовая проверка прокси с общим лимитом и лимитом на хост.
+    
+    on_result(proxy, result) вызывается по мере готовности каждого результата,
+    on_progress(done, total) - после каждого. Возвращает словарь proxy -> результат.
+    Без явных лимитов используется общий бюджет (get_check_budget).
+    """
+    proxies = list(dict.fromkeys(proxies))
+    total = len(proxies)
+    results = {}
+    if concurrency is None and per_host_limit is None:
+        budget = get_check_budget()
+    else:
+        budget = CheckBudget(concurrency or CHECK_CONCURRENCY, per_host_limit or CHECK_PER_HOST_LIMIT)
+    log_message(f"Массовая проверка: {total} прокси, параллельно до {budget.concurrency}, на хост до {budget.per_host_limit}")
+    
+    async def check_one(proxy):
+        try:
+            result = await budget.check(proxy)
+        except Exception as e:
+            # Сбой одной проверки не должен обрывать всю пачку - это просто неудачный результат
+            log_message(f"Ошибка проверки прокси {proxy}: {e!r}", "ERROR")
+            result = {"status": "error", "proxy_str": proxy, "error": f"Ошибка проверки: {str(e) or type(e).__name__}"}
+        results[proxy] = result
+        
+        for callback, args in ((on_result, (proxy, result)), (on_progress, (len(results), total))):
+            if callback:
+                try:
+                    callback(*args)
+                except Exception as e:
+                    log_message(f"Ошибка обработчика массовой проверки: {str(e)}", "ERROR")
+    
+    # Результаты уходят в журнал пачками (proxy_results), в конце - сбрасываем остаток
+    started = time.time()
+    await asyncio.gather(*(check_one(proxy) for proxy in proxies))
+    await asyncio.to_thread(proxy_results.flush)
+    
+    working = sum(1 for result in results.values() if result.get("status") == "ok")
+    log_message(f"Массовая проверка завершена за {time.time() - started:.1f}с: работает {working} из {total}")
+    return results
+
+def prefetch_proxy_hosts(proxies=None):
+    """Фоновый резолв хостов прокси (по умолчанию - всех из списка)"""
+    hosts = []
+    for proxy in get_proxy(verbose=False) if proxies is None else proxies:
+        try:
+            hosts.append(parse_proxy(proxy)[1])
+        except Exception:
+            continue
+    return dns_cache.prefetch(hosts)
+
+def get_proxy(verbose: bool = True):
+    """Получение списка прокси (из базы proxy_store, в порядке добавления)"""
+    try:
+        proxies = proxy_store.list()
+        if verbose:
+            log_message(f"Загружено {len(proxies)} прокси")
+        return proxies
+    except Exception as e:
+        log_message(f"Ошибка загрузки прокси: {str(e)}", "ERROR")
+        return []
+
+def save_proxy_to_file(proxy_str: str):
+    """Сохранение прокси в базу (дубли по каноническому ключу не добавляются)"""
+    try:
+        if proxy_store.add(proxy_str):
+            log_message(f"Прокси добавлен: {proxy_str}")
+            return True
+        return False
+    except Exception as e:
+        log_message(f"Ошибка сохранения прокси: {str(e)}", "ERROR")
+        return False
+
+def import_proxies(proxies, provider: str | None = None, check: bool = False, skip_dead: bool = True) -> dict:
+    """Пакетный импорт списка прокси от провайдера: один проход по базе и одна транзакция.
+    
+    Возвращает {'inserted': [...], 'duplicates': n, 'invalid': [...], 'dead': n}. Заведомо
+    нерабочие эндпоинты (circuit breaker) при skip_dead не импортируются; check - проверить
+    новые прокси раньше остальных (монитором, а если он не запущен - разово).
+    """
+    proxies = list(proxies)
+    dead = 0
+    if skip_dead:
+        alive = [proxy for proxy in proxies if not (isinstance(proxy, str) and proxy_breaker.is_open(proxy))]
+        dead = len(proxies) - len(alive)
+        proxies = alive
+    report = proxy_store.add_many(proxies, provider)
+    report["dead"] = dead
+    log_message(f"Импорт прокси{f' ({provider})' if provider else ''}: добавлено {len(report['inserted'])}, "
+                f"дублей {report['duplicates']}, некорректных {len(report['invalid'])}, нерабочих {dead}")
+    
+    if report["inserted"]:
+        prefetch_proxy_hosts(report["inserted"])
+        if check:
+            from .monitor import proxy_monitor
+            proxy_monitor.enqueue(report["inserted"])
+    return report
+
+def remove_proxy_from_file(proxy_str: str):
+    """Удаление прокси из базы"""
+    try:
+        if proxy_store.remove(proxy_str):
+            proxy_results.delete(proxy_str)
+            log_message(f"Прокси удален: {proxy_str}")
+            return True
+        return False
+    except Exception as e:
+        log_message(f"Ошибка удаления прокси: {str(e)}", "ERROR")
+        return False
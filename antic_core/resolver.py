@@ -0,0 +1,150 @@
+# ============================================================
+# DNS-КЭШ ДЛЯ ХОСТОВ ПРОКСИ: TTL, НЕГАТИВНЫЙ КЭШ, ПРЕДЗАГРУЗКА
+# ============================================================
+import time
+import socket
+import asyncio
+import ipaddress
+import queue
+import threading
+from concurrent.futures import Future
+
+from .utils import log_message
+
+DNS_TTL = 5 * 60          # Сколько считать ответ свежим
+DNS_STALE_TTL = 60 * 60   # Сколько ещё отдавать устаревший ответ, обновляя его в фоне
+DNS_NEGATIVE_TTL = 30     # Сколько помнить, что хост не резолвится
+DNS_TIMEOUT = 5           # Ожидание резолва в синхронном lookup
+DNS_WORKERS = 8           # Параллельных запросов к системному резолверу
+
+def is_ip_address(host: str) -> bool:
+    """Строка - IPv4/IPv6 адрес (резолвить не нужно)"""
+    try:
+        ipaddress.ip_address(host)
+        return True
+    except ValueError:
+        return False
+
+class DNSCache:
+    """Кэш резолва хостов прокси поверх системного резолвера.
+
+    Системный getaddrinfo не отдаёт TTL записей, поэтому свежесть задаётся
+    DNS_TTL; после него ответ ещё DNS_STALE_TTL отдаётся сразу, а обновляется
+    в фоне. Ошибки резолва кэшируются на DNS_NEGATIVE_TTL. Одновременные
+    запросы одного хоста склеиваются в один. Работает из любого потока и
+    любого event loop.
+    """
+    def __init__(self, ttl=DNS_TTL, stale_ttl=DNS_STALE_TTL, negative_ttl=DNS_NEGATIVE_TTL):
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.negative_ttl = negative_ttl
+        self._entries = {}   # host -> (адреса или None, ошибка или None, resolved_at)
+        self._pending = {}   # host -> concurrent.futures.Future
+        self._lock = threading.Lock()
+        self._queue = None
+
+    def _resolve_blocking(self, host):
+        """Системный резолв с записью в кэш; возвращает запись"""
+        try:
+            infos = socket.getaddrinfo(host, None, type=socket.SOCK_STREAM)
+            entry = (list(dict.fromkeys(info[4][0] for info in infos)), None, time.time())
+        except OSError as e:
+            entry = (None, e.strerror or str(e), time.time())
+        except (UnicodeError, ValueError) as e:
+            # Имя, которое не кодируется в IDNA ("a..b", слишком длинная метка) - тот же негативный ответ
+            entry = (None, str(e) or type(e).__name__, time.time())
+        with self._lock:
+            self._entries[host] = entry
+        return entry
+
+    def _worker(self):
+        """Поток резолва: берёт хосты из очереди"""
+        while True:
+            host, future = self._queue.get()
+            try:
+                future.set_result(self._resolve_blocking(host))
+            except Exception as e:
+                future.set_exception(e)
+            finally:
+                # Запрос завершён при любом исходе: следующий вызов не получит старый future
+                with self._lock:
+                    if self._pending.get(host) is future:
+                        del self._pending[host]
+
+    def _submit(self, host):
+        """Запуск резолва в пуле (или уже идущий запрос этого хоста)"""
+        with self._lock:
+            future = self._pending.get(host)
+            if future is None:
+                if self._queue is None:
+                    # Потоки-демоны: зависший системный резолвер не держит выход из приложения
+                    self._queue = queue.SimpleQueue()
+                    for i in range(DNS_WORKERS):
+                        threading.Thread(target=self._worker, name=f"dns-{i}", daemon=True).start()
+                future = self._pending[host] = Future()
+                self._queue.put((host, future))
+            return future
+
+    def _cached_entry(self, host):
+        """(запись, свежая ли) по кэшу; запись None - нужен резолв"""
+        with self._lock:
+            entry = self._entries.get(host)
+        if entry is None:
+            return None, False
+        addresses, _, resolved_at = entry
+        age = time.time() - resolved_at
+        if addresses is None:
+            return (entry, True) if age < self.negative_ttl else (None, False)
+        if age < self.ttl:
+            return entry, True
+        if age < self.ttl + self.stale_ttl:
+            return entry, False
+        return None, False
+
+    def _answer(self, host, entry):
+        """Адреса из записи или socket.gaierror для негативного ответа"""
+        addresses, error, _ = entry
+        if addresses is None:
+            raise socket.gaierror(f"Не удалось определить адрес {host}: {error}")
+        return addresses
+
+    async def resolve(self, host: str) -> list:
+        """Все адреса хоста (из кэша без ожидания, если он есть)"""
+        if is_ip_address(host):
+            return [host]
+        entry, fresh = self._cached_entry(host)
+        if entry is not None:
+            if not fresh:
+                # Устаревший ответ отдаём сразу, обновляем в фоне
+                self._submit(host)
+            return self._answer(host, entry)
+        return self._answer(host, await asyncio.wrap_future(self._submit(host)))
+
+    def lookup(self, host: str, timeout=DNS_TIMEOUT) -> str:
+        """Синхронно: первый адрес хоста (или сам host, если резолв не удался)"""
+        if is_ip_address(host):
+            return host
+        entry, fresh = self._cached_entry(host)
+        if entry is None:
+            try:
+                entry = self._submit(host).result(timeout)
+            except Exception:
+                return host
+        elif not fresh:
+            self._submit(host)
+        addresses = entry[0]
+        return addresses[0] if addresses else host
+
+    def prefetch(self, hosts):
+        """Резолв хостов в фоне, без ожидания (IP-адреса пропускаются)"""
+        hosts = [host for host in dict.fromkeys(hosts) if host and not is_ip_address(host)]
+        for host in hosts:
+            if self._cached_entry(host)[1]:
+                continue
+            self._submit(host)
+        if hosts:
+            log_message(f"DNS: предзагрузка {len(hosts)} хостов прокси")
+        return len(hosts)
+
+# Глобальный DNS-кэш
+dns_cache = DNSCache()
@@ -0,0 +1,162 @@
+# ============================================================
+# ХРАНИЛИЩЕ РЕЗУЛЬТАТОВ ПРОВЕРКИ ПРОКСИ: СНИМОК + ЖУРНАЛ JSONL
+# ============================================================
+import os
+import json
+import atexit
+import threading
+
+from .config import PROXY_CACHE_PATH, PROXY_JOURNAL_PATH
+from .utils import log_message
+
+class ProxyResultStore:
+    """Потокобезопасное хранилище результатов проверки: proxy -> результат.
+    
+    На диске - снимок proxy_cache.json (прежний формат) и журнал JSONL, в который
+    изменения дописываются пачками. Когда журнал разрастается, он сворачивается
+    в новый снимок. Файлы читаются при первом обращении, а не при импорте.
+    """
+    FLUSH_INTERVAL = 1.0    # Секунд до сброса накопленных изменений в журнал
+    FLUSH_BATCH = 100       # Сбрасывать сразу, если накопилось столько изменений
+    COMPACT_MIN_LINES = 500 # Сворачивать журнал не раньше этого числа строк...
+    COMPACT_RATIO = 2       # ...и когда строк больше, чем записей × COMPACT_RATIO
+    
+    def __init__(self, snapshot_path=PROXY_CACHE_PATH, journal_path=PROXY_JOURNAL_PATH):
+        self.snapshot_path = snapshot_path
+        self.journal_path = journal_path
+        self._results = None
+        self._pending = []
+        self._journal_lines = 0
+        self._flush_timer = None
+        self._lock = threading.RLock()
+        self._io_lock = threading.Lock()
+    
+    def _load(self):
+        """Снимок + повтор журнала (вызывается под блокировкой)"""
+        if self._results is not None:
+            return self._results
+        results = {}
+        if os.path.isfile(self.snapshot_path):
+            try:
+                with open(self.snapshot_path, "r", encoding="utf-8") as f:
+                    results = json.load(f)
+            except Exception as e:
+                log_message(f"Не удалось загрузить кэш прокси: {str(e)}", "ERROR")
+                results = {}
+        
+        lines = 0
+        if os.path.isfile(self.journal_path):
+            try:
+                with open(self.journal_path, "r", encoding="utf-8") as f:
+                    for line in f:
+                        try:
+                            record = json.loads(line)
+                        except ValueError:
+                            # Недописанная строка после аварийного завершения
+                            continue
+                        lines += 1
+                        if record.get("deleted"):
+                            results.pop(record["proxy"], None)
+                        else:
+                            results[record["proxy"]] = record["result"]
+            except Exception as e:
+                log_message(f"Ошибка чтения журнала кэша прокси: {str(e)}", "ERROR")
+        
+        self._results = results
+        self._journal_lines = lines
+        log_message(f"Загружен кэш прокси: {len(results)} записей (журнал: {lines} строк)")
+        return results
+    
+    def get(self, proxy, default=None):
+        """Результат для прокси"""
+        with self._lock:
+            return self._load().get(proxy, default)
+    
+    def snapshot(self):
+        """Копия всех результатов (для чтения без блокировки)"""
+        with self._lock:
+            return dict(self._load())
+    
+    def put(self, proxy, result):
+        """Запись результата; на диск попадёт со следующей пачкой"""
+        with self._lock:
+            self._load()[proxy] = result
+            self._pending.append({"proxy": proxy, "result": result})
+            self._schedule_flush()
+    
+    def update(self, proxy, default=None, **fields):
+        """Дополнение результата полями (запись создаётся из default, если её нет)"""
+        with self._lock:
+            result = dict(self._load().get(proxy) or default or {})
+            result.update(fields)
+            self.put(proxy, result)
+            return result
+    
+    def delete(self, proxy):
+        """Удаление результата"""
+        with self._lock:
+            if self._load().pop(proxy, None) is not None:
+                self._pending.append({"proxy": proxy, "deleted": True})
+                self._schedule_flush()
+    
+    def _schedule_flush(self):
+        """Сброс пачкой: сразу при FLUSH_BATCH изменений, иначе через FLUSH_INTERVAL"""
+        delay = 0 if len(self._pending) >= self.FLUSH_BATCH else self.FLUSH_INTERVAL
+        if self._flush_timer is not None:
+            if delay or self._flush_timer.interval == 0:
+                return
+            self._flush_timer.cancel()
+        self._flush_timer = threading.Timer(delay, self.flush)
+        self._flush_timer.daemon = True
+        self._flush_timer.start()
+    
+    def flush(self):
+        """Дописывание накопленных изменений в журнал и, при необходимости, сворачивание"""
+        with self._io_lock:
+            with self._lock:
+                if self._flush_timer is not None:
+                    self._flush_timer.cancel()
+                    self._flush_timer = None
+                pending, self._pending = self._pending, []
+            if not pending:
+                return
+            try:
+                with open(self.journal_path, "a", encoding="utf-8") as f:
+                    f.write("".join(json.dumps(record, ensure_ascii=False) + "\n" for record in pending))
+                    f.flush()
+                    os.fsync(f.fileno())
+            except Exception as e:
+                log_message(f"Ошибка записи журнала кэша прокси: {str(e)}", "ERROR")
+                with self._lock:
+                    self._pending[:0] = pending
+                return
+            
+            with self._lock:
+                self._journal_lines += len(pending)
+                needs_compaction = self._journal_lines >= max(self.COMPACT_MIN_LINES, len(self._results) * self.COMPACT_RATIO)
+            if needs_compaction:
+                self._compact()
+    
+    def _compact(self):
+        """Сворачивание журнала в новый снимок (вызывается под _io_lock)"""
+        snapshot = self.snapshot()
+        try:
+            tmp_path = self.snapshot_path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(snapshot, f, indent=4)
+            os.replace(tmp_path, self.snapshot_path)
+            # Журнал обнуляем только после замены снимка: при сбое между шагами
+            # повтор журнала поверх нового снимка даст тот же результат
+            open(self.journal_path, "w", encoding="utf-8").close()
+        except Exception as e:
+            log_message(f"Ошибка сворачивания журнала кэша прокси: {str(e)}", "ERROR")
+            return
+        with self._lock:
+            self._journal_lines = 0
+        log_message(f"Журнал кэша прокси свёрнут: {len(snapshot)} записей")
+
+# Глобальное хранилище результатов проверки
+proxy_results = ProxyResultStore()
+
+# Несброшенные результаты не теряются при выходе
+atexit.register(proxy_results.flush)
@@ -0,0 +1,98 @@
+# ============================================================
+# ОЦЕНКА КАЧЕСТВА ПРОКСИ: EWMA ЗАДЕРЖКИ, ДОЛЯ УСПЕХОВ, ПОСЛЕДНИЕ N ИСХОДОВ
+# ============================================================
+from array import array
+
+SCORE_WINDOW = 20         # Сколько последних исходов проверки помнить
+SCORE_ALPHA = 0.3         # Вес новой проверки в скользящих средних (EWMA)
+SCORE_LATENCY_REF = 1.0   # Задержка (с), при которой вклад скорости падает до середины
+
+class ProxyStats:
+    """Скользящая статистика прокси: EWMA задержки и успехов + кольцевой буфер исходов"""
+    __slots__ = ("latency", "success", "checks", "outcomes", "head", "count")
+
+    def __init__(self, latency=None, success=None, checks=0, recent=""):
+        self.latency = latency
+        self.success = success
+        self.checks = checks
+        # Кольцевой буфер на array: 1 - успех, 0 - неудача; head - куда писать следующий
+        self.outcomes = array("B", bytes(SCORE_WINDOW))
+        self.head = 0
+        self.count = 0
+        for outcome in recent[-SCORE_WINDOW:]:
+            self._push(outcome == "1")
+
+    def _push(self, ok):
+        self.outcomes[self.head] = ok
+        self.head = (self.head + 1) % SCORE_WINDOW
+        self.count = min(self.count + 1, SCORE_WINDOW)
+
+    def record(self, ok: bool, latency=None):
+        """Учёт результата одной проверки"""
+        self._push(ok)
+        self.checks += 1
+        value = 1.0 if ok else 0.0
+        self.success = value if self.success is None else self.success + SCORE_ALPHA * (value - self.success)
+        # Задержку усредняем только по успешным проверкам - у неудачных её нет
+        if ok and isinstance(latency, (int, float)):
+            self.latency = latency if self.latency is None else self.latency + SCORE_ALPHA * (latency - self.latency)
+
+    def recent(self) -> str:
+        """Последние исходы от старого к новому строкой '1'/'0'"""
+        if self.count < SCORE_WINDOW:
+            ordered = self.outcomes[:self.count]
+        else:
+            ordered = self.outcomes[self.head:] + self.outcomes[:self.head]
+        return "".join("1" if outcome else "0" for outcome in ordered)
+
+    def score(self):
+        """Оценка 0..100 (None, если проверок не было)"""
+        if not self.checks:
+            return None
+        # Доля успехов в окне со сглаживанием Лапласа: 1 удачная проверка из 1 - это не 100%
+        window_ratio = (sum(self.outcomes) + 1) / (self.count + 2)
+        reliability = 0.5 * self.success + 0.5 * window_ratio
+        speed = 0.5
+        if self.latency is not None:
+            speed = SCORE_LATENCY_REF / (SCORE_LATENCY_REF + self.latency)
+        return round(100 * reliability * (0.5 + 0.5 * speed), 1)
+
+    def to_dict(self) -> dict:
+        """Компактное представление для кэша результатов"""
+        return {
+            "latency": round(self.latency, 3) if self.latency is not None else None,
+            "success": round(self.success, 4) if self.success is not None else None,
+            "checks": self.checks,
+            "recent": self.recent(),
+            "score": self.score(),
+        }
+
+    @classmethod
+    def from_dict(cls, data) -> "ProxyStats":
+        """Восстановление из кэша результатов"""
+        if not data:
+            return cls()
+        return cls(data.get("latency"), data.get("success"), data.get("checks", 0), data.get("recent", ""))
+
+def record_check(stats, result) -> dict:
+    """Новая статистика (dict) по прежней и результату проверки"""
+    proxy_stats = ProxyStats.from_dict(stats)
+    proxy_stats.record(result.get("status") == "ok", result.get("latency"))
+    return proxy_stats.to_dict()
+
+def proxy_score(result):
+    """Оценка качества прокси по результату из кэша (None, если статистики нет)"""
+    return ((result or {}).get("stats") or {}).get("score")
+
+def rank_proxies(proxies, results) -> list:
+    """Прокси по убыванию оценки; без оценки - в конце, в исходном порядке"""
+    def key(proxy):
+        score = proxy_score(results.get(proxy))
+        return (score is None, -(score or 0))
+    return sorted(proxies, key=key)
+
+def best_proxy(proxies, results):
+    """Прокси с лучшей оценкой среди рабочих (None, если таких нет)"""
+    working = [proxy for proxy in proxies if (results.get(proxy) or {}).get("status") == "ok"]
+    ranked = rank_proxies(working, results)
+    return ranked[0] if ranked else None
@@ -0,0 +1,260 @@
+# ============================================================
+# ХРАНИЛИЩЕ СПИСКА ПРОКСИ: SQLITE С ИНДЕКСАМИ (ВМЕСТО proxies.json)
+# ============================================================
+import os
+import json
+import time
+import atexit
+import sqlite3
+import threading
+
+from .config import PROXY_DB_PATH, PROXIES_FILE
+from .results import proxy_results
+from .scoring import proxy_score
+from .utils import log_message, parse_proxy, canonical_proxy_key
+
+# Провайдер по хосту прокси (для индекса provider)
+PROVIDER_HOSTS = (
+    ("sx.org", "sx"),
+    ("cyberyozh", "cyberyozh"),
+)
+
+def detect_provider(proxy: str):
+    """Провайдер по хосту прокси или None"""
+    try:
+        host = parse_proxy(proxy, canonical=True)[1]
+    except ValueError:
+        return None
+    for suffix, provider in PROVIDER_HOSTS:
+        if suffix in host:
+            return provider
+    return None
+
+class ProxyStore:
+    """Список прокси в SQLite: уникальный канонический ключ, индексы по провайдеру,
+    стране, статусу, времени проверки и оценке, пакетные транзакции.
+
+    При первом открытии однократно переносит proxies.json (отметка - в таблице meta).
+    Порядок списка - порядок добавления. Итоги проверок пишутся пачками.
+    """
+    FLUSH_INTERVAL = 1.0  # Секунд до записи накопленных итогов проверок
+    COLUMNS = ("proxy", "provider", "country", "status", "last_checked", "score", "added_at")
+    ORDERS = {
+        "added": "id",
+        "score": "score IS NULL, score DESC, id",
+        "last_checked": "last_checked IS NULL, last_checked, id",
+    }
+
+    def __init__(self, path=PROXY_DB_PATH, legacy_path=PROXIES_FILE):
+        self.path = path
+        self.legacy_path = legacy_path
+        self._db = None
+        self._list = None
+        self._pending = {}
+        self._flush_timer = None
+        self._lock = threading.RLock()
+
+    def _connect(self):
+        """Соединение с базой (открывается и переносит proxies.json при первом обращении; под блокировкой)"""
+        if self._db is None:
+            db = sqlite3.connect(self.path, check_same_thread=False)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            with db:
+                db.execute("""CREATE TABLE IF NOT EXISTS proxies (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    key TEXT NOT NULL UNIQUE,
+                    proxy TEXT NOT NULL,
+                    provider TEXT,
+                    country TEXT,
+                    status TEXT NOT NULL DEFAULT 'unchecked',
+                    last_checked REAL,
+                    score REAL,
+                    added_at REAL NOT NULL
+                )""")
+                for column in ("provider", "country", "status", "last_checked", "score"):
+                    db.execute(f"CREATE INDEX IF NOT EXISTS proxies_{column} ON proxies ({column})")
+                db.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+            self._db = db
+            self._migrate_legacy()
+        return self._db
+
+    def _migrate_legacy(self):
+        """Однократный перенос proxies.json (под блокировкой).
+
+        Отметка в meta ставится вместе со вставкой и дальше не сравнивается с файлом:
+        иначе правка proxies.json вернула бы в список удалённые с тех пор прокси.
+        """
+        if not os.path.isfile(self.legacy_path):
+            return
+        if self._db.execute("SELECT 1 FROM meta WHERE key = 'legacy_json'").fetchone() is not None:
+            return
+        try:
+            with open(self.legacy_path, "r", encoding="utf-8") as f:
+                proxies = json.load(f)
+        except Exception as e:
+            log_message(f"Ошибка чтения {os.path.basename(self.legacy_path)} для переноса: {str(e)}", "ERROR")
+            return
+        report = self._insert(proxies if isinstance(proxies, list) else [], None, "legacy_json", "migrated")
+        # Итоги прежних проверок - сразу в индексируемые колонки
+        results = proxy_results.snapshot()
+        self._write_checks({proxy: results[proxy] for proxy in report["inserted"] if proxy in results})
+        log_message(f"Перенесено из {os.path.basename(self.legacy_path)}: {len(report['inserted'])} прокси "
+                    f"(дубли: {report['duplicates']}, некорректных: {len(report['invalid'])})")
+
+    def _insert(self, proxies, provider, meta_key=None, meta_value=None):
+        """Вставка пачки одной транзакцией (под блокировкой): {'inserted', 'duplicates', 'invalid'}"""
+        inserted, invalid, duplicates = [], [], 0
+        keys = set()
+        now = time.time()
+        with self._db:
+            for proxy in proxies:
+                try:
+                    proxy = proxy.strip()
+                    key = canonical_proxy_key(proxy)
+                except (AttributeError, ValueError):
+                    invalid.append(proxy)
+                    continue
+                if key in keys:
+                    duplicates += 1
+                    continue
+                keys.add(key)
+                cursor = self._db.execute(
+                    "INSERT OR IGNORE INTO proxies (key, proxy, provider, added_at) VALUES (?, ?, ?, ?)",
+                    (key, proxy, provider or detect_provider(proxy), now)
+                )
+                if cursor.rowcount:
+                    inserted.append(proxy)
+                else:
+                    duplicates += 1
+            if meta_key:
+                self._db.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (meta_key, meta_value))
+        if inserted:
+            self._list = None
+        return {"inserted": inserted, "duplicates": duplicates, "invalid": invalid}
+
+    def list(self, order: str = "added") -> list:
+        """Строки прокси в порядке добавления (или по "score" / "last_checked")"""
+        with self._lock:
+            if order == "added" and self._list is not None:
+                return list(self._list)
+            self._flush_pending()
+            rows = self._connect().execute(f"SELECT proxy FROM proxies ORDER BY {self.ORDERS[order]}").fetchall()
+            proxies = [row[0] for row in rows]
+            if order == "added":
+                self._list = proxies
+            return list(proxies)
+
+    def __len__(self):
+        with self._lock:
+            return self._connect().execute("SELECT COUNT(*) FROM proxies").fetchone()[0]
+
+    def contains(self, proxy: str) -> bool:
+        """Есть ли прокси (сравнение по каноническому ключу)"""
+        try:
+            key = canonical_proxy_key(proxy)
+        except ValueError:
+            return False
+        with self._lock:
+            return self._connect().execute("SELECT 1 FROM proxies WHERE key = ?", (key,)).fetchone() is not None
+
+    def add(self, proxy: str, provider: str | None = None) -> bool:
+        """Добавление одного прокси; False - уже есть или некорректный"""
+        return bool(self.add_many([proxy], provider)["inserted"])
+
+    def add_many(self, proxies, provider: str | None = None) -> dict:
+        """Пакетное добавление одной транзакцией: {'inserted': [...], 'duplicates': n, 'invalid': [...]}"""
+        with self._lock:
+            self._connect()
+            return self._insert(proxies, provider)
+
+    def remove(self, proxy: str) -> bool:
+        """Удаление прокси; False - его не было"""
+        return self.remove_many([proxy]) > 0
+
+    def remove_many(self, proxies) -> int:
+        """Пакетное удаление одной транзакцией; число удалённых"""
+        keys = []
+        for proxy in proxies:
+            try:
+                keys.append((canonical_proxy_key(proxy),))
+            except ValueError:
+                continue
+        with self._lock:
+            db = self._connect()
+            with db:
+                removed = db.executemany("DELETE FROM proxies WHERE key = ?", keys).rowcount
+            if removed:
+                self._list = None
+            return removed
+
+    def query(self, provider=None, country=None, status=None, checked_before=None, min_score=None, order="score") -> list:
+        """Выборка по индексируемым полям: список словарей с колонками COLUMNS"""
+        conditions, params = [], []
+        for column, value in (("provider", provider), ("country", country), ("status", status)):
+            if value is not None:
+                conditions.append(f"{column} = ?")
+                params.append(value)
+        if checked_before is not None:
+            conditions.append("(last_checked IS NULL OR last_checked < ?)")
+            params.append(checked_before)
+        if min_score is not None:
+            conditions.append("score >= ?")
+            params.append(min_score)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        with self._lock:
+            self._flush_pending()
+            rows = self._connect().execute(
+                f"SELECT {', '.join(self.COLUMNS)} FROM proxies {where} ORDER BY {self.ORDERS[order]}", params
+            ).fetchall()
+        return [dict(zip(self.COLUMNS, row)) for row in rows]
+
+    def record_check(self, proxy: str, result: dict):
+        """Итог проверки в индексируемые колонки (пишется пачкой через FLUSH_INTERVAL)"""
+        with self._lock:
+            self._pending[proxy] = result
+            if self._flush_timer is None:
+                self._flush_timer = threading.Timer(self.FLUSH_INTERVAL, self.flush)
+                self._flush_timer.daemon = True
+                self._flush_timer.start()
+
+    def _write_checks(self, results):
+        """UPDATE итогов проверок одной транзакцией (под блокировкой)"""
+        rows = []
+        for proxy, result in results.items():
+            try:
+                key = canonical_proxy_key(proxy)
+            except ValueError:
+                continue
+            country = result.get("country") if result.get("status") == "ok" else None
+            rows.append((result.get("status", "unchecked"), country, result.get("checked_at"), proxy_score(result), key))
+        if rows:
+            with self._db:
+                self._db.executemany(
+                    "UPDATE proxies SET status = ?, country = COALESCE(?, country), last_checked = ?, score = ? WHERE key = ?",
+                    rows
+                )
+
+    def _flush_pending(self):
+        """Запись накопленных итогов проверок (под блокировкой)"""
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+            self._flush_timer = None
+        pending, self._pending = self._pending, {}
+        if pending:
+            self._connect()
+            self._write_checks(pending)
+
+    def flush(self):
+        """Запись накопленных итогов проверок"""
+        with self._lock:
+            try:
+                self._flush_pending()
+            except Exception as e:
+                log_message(f"Ошибка записи итогов проверок в базу прокси: {str(e)}", "ERROR")
+
+# Глобальное хранилище списка прокси
+proxy_store = ProxyStore()
+
+# Несохранённые итоги проверок не теряются при выходе
+atexit.register(proxy_store.flush)
@@ -0,0 +1,90 @@
+# ============================================================
+# USER AGENTS: ДИСКОВЫЙ КЭШ С ФОНОВЫМ ОБНОВЛЕНИЕМ
+# ============================================================
+import os
+import json
+import time
+import threading
+
+import requests
+
+from .config import USER_AGENTS_CACHE_PATH
+from .utils import log_message
+
+# Список User Agents: читается из дискового кэша мгновенно, обновляется в фоне
+USER_AGENTS_URL = "https://raw.githubusercontent.com/microlinkhq/top-user-agents/refs/heads/master/src/index.json"
+USER_AGENTS_CACHE_TTL = 24 * 60 * 60  # Секунды до повторной проверки списка
+DEFAULT_USER_AGENTS = [
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+]
+_user_agents_lock = threading.Lock()
+USER_AGENTS = None  # Загружается из кэша при первом обращении (get_user_agents)
+
+def load_user_agents_cache():
+    """Чтение кэша User Agents с диска"""
+    try:
+        if os.path.isfile(USER_AGENTS_CACHE_PATH):
+            with open(USER_AGENTS_CACHE_PATH, "r", encoding="utf-8") as f:
+                cache = json.load(f)
+            if isinstance(cache.get("user_agents"), list) and cache["user_agents"]:
+                return cache
+    except Exception as e:
+        log_message(f"Ошибка чтения кэша User Agents: {str(e)}", "ERROR")
+    return {}
+
+def save_user_agents_cache(cache: dict):
+    """Атомарная запись кэша User Agents на диск"""
+    try:
+        tmp_path = USER_AGENTS_CACHE_PATH + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(cache, f)
+        os.replace(tmp_path, USER_AGENTS_CACHE_PATH)
+    except Exception as e:
+        log_message(f"Ошибка сохранения кэша User Agents: {str(e)}", "ERROR")
+
+def refresh_user_agents(force: bool = False):
+    """Обновление списка User Agents через кэш (условный запрос по ETag/Last-Modified)"""
+    global USER_AGENTS
+    with _user_agents_lock:
+        cache = load_user_agents_cache()
+        if not force and cache and time.time() - cache.get("fetched_at", 0) < USER_AGENTS_CACHE_TTL:
+            return get_user_agents()
+        
+        headers = {'User-Agent': 'Antic Browser v1.0.0'}
+        if cache.get("etag"):
+            headers["If-None-Match"] = cache["etag"]
+        if cache.get("last_modified"):
+            headers["If-Modified-Since"] = cache["last_modified"]
+        
+        try:
+            response = requests.get(USER_AGENTS_URL, headers=headers, timeout=10)
+            if response.status_code == 304 and cache:
+                cache["fetched_at"] = time.time()
+                log_message("Список User Agents не изменился")
+            else:
+                response.raise_for_status()
+                data = response.json()
+                if not isinstance(data, list) or not data:
+                    raise ValueError("пустой список User Agents")
+                cache = {
+                    "user_agents": data,
+                    "etag": response.headers.get("ETag"),
+                    "last_modified": response.headers.get("Last-Modified"),
+                    "fetched_at": time.time()
+                }
+                log_message(f"Загружено {len(data)} User Agents")
+            save_user_agents_cache(cache)
+            USER_AGENTS = cache["user_agents"]
+        except Exception as e:
+            log_message(f"Не удалось обновить User Agents: {str(e)}", "ERROR")
+        return get_user_agents()
+
+def get_user_agents():
+    """Текущий список User Agents (при первом вызове читается из кэша на диске)"""
+    global USER_AGENTS
+    if USER_AGENTS is None:
+        USER_AGENTS = load_user_agents_cache().get("user_agents") or list(DEFAULT_USER_AGENTS)
+        log_message(f"User Agents из кэша: {len(USER_AGENTS)}")
+    return USER_AGENTS
@@ -0,0 +1,96 @@
+# ============================================================
+# ОБЩИЕ УТИЛИТЫ ЯДРА: ЛОГИРОВАНИЕ, ОТЛОЖЕННЫЕ ИМПОРТЫ, УВЕДОМЛЕНИЯ, РАЗБОР ПРОКСИ
+# ============================================================
+import sys
+import time
+import threading
+import importlib
+
+# Тяжёлые модули (playwright, geoip2, timezonefinder, pproxy, pytz) загружаются
+# отложенно через lazy_import(), чтобы окно появлялось раньше
+HEAVY_MODULES = ("playwright.async_api", "geoip2.database", "timezonefinder", "pproxy", "pytz")
+
+# Логирование
+def log_message(message, level="INFO"):
+    """Логирование сообщений с временной меткой"""
+    timestamp = time.strftime("%Y-%m-%d %H:%M:%S")
+    print(f"[{timestamp}] [{level}] {message}")
+
+# Отложенная загрузка тяжёлых модулей
+_lazy_import_lock = threading.Lock()
+LAZY_IMPORT_TIMINGS = {}
+
+def lazy_import(module_name: str):
+    """Импорт модуля при первом обращении с замером времени загрузки"""
+    module = sys.modules.get(module_name)
+    if module is not None:
+        return module
+    with _lazy_import_lock:
+        module = sys.modules.get(module_name)
+        if module is None:
+            started = time.perf_counter()
+            module = importlib.import_module(module_name)
+            duration = time.perf_counter() - started
+            LAZY_IMPORT_TIMINGS[module_name] = {
+                "started_at": started,
+                "duration": duration
+            }
+            log_message(f"Модуль {module_name} загружен за {duration:.2f}с")
+    return module
+
+# Обработчик уведомлений: UI подставляет свой, без него уведомления только в логе
+_notification_handler = None
+
+def set_notification_handler(handler):
+    """Установка обработчика уведомлений (title, message, type)"""
+    global _notification_handler
+    _notification_handler = handler
+
+def notify(title, message, type="info"):
+    """Показ уведомления через установленный обработчик"""
+    if _notification_handler:
+        try:
+            _notification_handler(title, message, type)
+        except Exception as e:
+            log_message(f"Ошибка показа уведомления: {str(e)}", "ERROR")
+
+# Разбор строк прокси - единственный в ядре: список, проверка, circuit breaker и провайдеры
+# должны видеть в одной строке один и тот же прокси
+DEFAULT_PROXY_PORT = 8080
+
+def parse_proxy(proxy: str, canonical: bool = False):
+    """Разбор строки прокси: (протокол, хост, порт, логин, пароль).
+
+    Логин с паролем отделяются по последнему "@" (пароль может его содержать).
+    canonical - протокол и хост в нижнем регистре. ValueError - строка не похожа на прокси.
+    """
+    proxy = proxy.strip()
+    if "://" in proxy:
+        protocol, rest = proxy.split("://", 1)
+    else:
+        protocol, rest = "http", proxy
+    auth, _, server = rest.rpartition("@")
+    username, _, password = auth.partition(":")
+    host, _, port = server.partition(":")
+    port = int(port) if port else DEFAULT_PROXY_PORT
+    if not protocol or not host:
+        raise ValueError(f"Некорректный прокси: {proxy}")
+    if not 0 < port < 65536:
+        raise ValueError(f"порт вне диапазона 1-65535: {port}")
+    if canonical:
+        protocol, host = protocol.lower(), host.lower()
+    return protocol, host, port, username, password
+
+def canonical_proxy_key(proxy: str) -> str:
+    """Канонический ключ прокси: протокол и хост в нижнем регистре, порт числом (ValueError - не прокси)"""
+    protocol, host, port, username, password = parse_proxy(proxy, canonical=True)
+    credentials = f"{username}:{password}@" if username or password else ""
+    return f"{protocol}://{credentials}{host}:{port}"
+
+def proxy_endpoint(proxy: str) -> str:
+    """Ключ эндпоинта прокси: host:port (без протокола и логина)"""
+    try:
+        _, host, port, _, _ = parse_proxy(proxy, canonical=True)
+    except ValueError:
+        return proxy.strip().lower()
+    return f"{host}:{port}"
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Пропускная способность проверки прокси на локальном стенде (benchmarks/standins.py):
+IP-echo сервер вместо ipify/httpbin и пул поддельных upstream-прокси с задержкой,
+обрывами и отказами авторизации. Сеть не нужна.
+
+Для каждого размера списка и каждого способа проверки печатает проверок в секунду,
+p50/p99 времени до вердикта (от старта пачки), прирост RSS и число рабочих.
+
+Способы:
+    single - check_proxy_async по одному, последовательно
+    gather - check_proxy_async для всех сразу через asyncio.gather (без лимитов)
+    bulk   - check_proxies_bulk (общий бюджет: лимит всего и на хост)
+
+Запуск:
+    python benchmarks/bench_checker.py
+    python benchmarks/bench_checker.py --counts 10 100 1000 --latency 0.05 --drop 0.02 --auth-fail 0.05
+    python benchmarks/bench_checker.py --modes bulk --https
+"""
+import io
+import os
+import sys
+import time
+import asyncio
+import argparse
+import tempfile
+import statistics
+import contextlib
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from antic_core import proxies
+from antic_core.results import proxy_results
+from antic_core.store import proxy_store
+from standins import FakeUpstreamPool, start_echo_server, make_self_signed_context
+
+MODES = ("single", "gather", "bulk")
+
+def current_rss():
+    """Текущий RSS процесса в байтах (None вне Linux)"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+async def sample_peak_rss(peak):
+    """Фоновый замер пикового RSS (каждые 20 мс)"""
+    while True:
+        rss = current_rss()
+        if rss is not None:
+            peak["rss"] = max(peak["rss"], rss)
+        await asyncio.sleep(0.02)
+
+def percentile(values, fraction):
+    """Перцентиль по отсортированному списку"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(int(fraction * len(ordered)), len(ordered) - 1)]
+
+async def run_mode(mode, proxy_list):
+    """Одна пачка проверок: (вердикты по времени от старта, результаты, секунд всего, прирост RSS)"""
+    verdicts = []
+    results = {}
+    started = time.perf_counter()
+
+    async def check(proxy):
+        results[proxy] = await proxies.check_proxy_async(proxy, save_cache=False)
+        verdicts.append(time.perf_counter() - started)
+
+    def on_result(proxy, result):
+        results[proxy] = result
+        verdicts.append(time.perf_counter() - started)
+
+    base_rss = current_rss()
+    peak = {"rss": base_rss or 0}
+    sampler = asyncio.create_task(sample_peak_rss(peak))
+    # Журнал проверок (по строке на прокси) глушим - он не часть замера
+    with contextlib.redirect_stdout(io.StringIO()):
+        if mode == "single":
+            for proxy in proxy_list:
+                await check(proxy)
+        elif mode == "gather":
+            await asyncio.gather(*(check(proxy) for proxy in proxy_list))
+        else:
+            await proxies.check_proxies_bulk(proxy_list, on_result=on_result)
+    elapsed = time.perf_counter() - started
+    sampler.cancel()
+    rss_growth = peak["rss"] - base_rss if base_rss is not None else None
+    return verdicts, results, elapsed, rss_growth
+
+async def run(args):
+    """Поднять стенд, прогнать все размеры и способы, напечатать таблицу"""
+    # Результаты проверок и база прокси - во временные файлы, рабочие не трогаем
+    # (DNS-кэш только в памяти, а прокси стенда заданы IP-адресами и его не используют)
+    directory = tempfile.mkdtemp(prefix="antic-bench-")
+    proxy_results.snapshot_path = os.path.join(directory, "proxy_cache.json")
+    proxy_results.journal_path = os.path.join(directory, "proxy_cache.journal.jsonl")
+    proxy_store.path = os.path.join(directory, "proxies.sqlite3")
+    proxy_store.legacy_path = os.path.join(directory, "proxies.json")
+
+    echo_server, echo_url = await start_echo_server()
+    servers = [echo_server]
+    services = [(echo_url, "ip")]
+    if args.https:
+        server_context, client_context = make_self_signed_context()
+        if server_context is None:
+            print("openssl не найден - HTTPS echo сервер пропущен")
+        else:
+            tls_server, tls_url = await start_echo_server(server_context)
+            servers.append(tls_server)
+            services.append((tls_url, "origin"))
+            proxies._ssl_context = client_context
+    proxies.CHECK_SERVICES[:] = services
+
+    pool = await FakeUpstreamPool(max(args.counts), args.latency, args.drop, args.auth_fail).start()
+    print(f"Стенд: echo {', '.join(url for url, _ in services)}; {len(pool.profiles)} прокси на порту {pool.port}, "
+          f"задержка ~{args.latency * 1000:.0f} мс, обрывы {args.drop:.0%}, отказ авторизации {args.auth_fail:.0%}\n")
+    print(f"{'Способ':<8}{'Прокси':>8}{'Проверок/с':>12}{'p50, с':>9}{'p99, с':>9}{'RSS, МБ':>10}{'Рабочих':>14}{'Всего, с':>10}")
+
+    for count in args.counts:
+        proxy_list = pool.proxies(count)
+        for mode in args.modes:
+            if mode == "single" and count > args.single_limit:
+                print(f"{mode:<8}{count:>8}   пропущено (больше --single-limit {args.single_limit})")
+                continue
+            verdicts, results, elapsed, rss_growth = await run_mode(mode, proxy_list)
+            working = sum(1 for result in results.values() if result.get("status") == "ok")
+            rss = f"{rss_growth / 1024 / 1024:.1f}" if rss_growth is not None else "-"
+            print(f"{mode:<8}{count:>8}{count / elapsed:>12.1f}{percentile(verdicts, 0.5):>9.3f}{percentile(verdicts, 0.99):>9.3f}"
+                  f"{rss:>10}{f'{working}/{pool.expected_ok(count)}':>14}{elapsed:>10.2f}")
+
+    print(f"\nСоединений к прокси: {pool.connections}; ср. задержка прокси: "
+          f"{statistics.mean(p.latency for p in pool.profiles.values()) * 1000:.0f} мс")
+    pool.close()
+    for server in servers:
+        server.close()
+
+def main():
+    """Основная функция"""
+    parser = argparse.ArgumentParser(description="Бенчмарк проверки прокси на локальном стенде")
+    parser.add_argument("--counts", type=int, nargs="+", default=[10, 100, 1000], help="Размеры списков прокси")
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=list(MODES), help="Способы проверки")
+    parser.add_argument("--latency", type=float, default=0.05, help="Средняя задержка ответа прокси, с")
+    parser.add_argument("--drop", type=float, default=0.0, help="Доля соединений, которые прокси рвёт")
+    parser.add_argument("--auth-fail", type=float, default=0.05, help="Доля прокси, отвергающих авторизацию")
+    parser.add_argument("--https", action="store_true", help="Добавить HTTPS echo сервер (нужен openssl)")
+    parser.add_argument("--single-limit", type=int, default=100, help="Не гонять single на списках больше этого")
+    args = parser.parse_args()
+    asyncio.run(run(args))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
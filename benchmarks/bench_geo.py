@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Микро-бенчмарк GEO-запросов: открытие Reader на каждый запрос (как было раньше)
+против общего GeoService с базами, открытыми один раз через mmap,
+и пакетный enrich() по таблице IP-диапазонов NumPy.
+
+Запуск:
+    python benchmarks/bench_geo.py --count 20000
+    python benchmarks/bench_geo.py --country GeoLite2-City.mmdb --city GeoLite2-City.mmdb
+    python benchmarks/bench_geo.py --bulk 100000
+"""
+import os
+import sys
+import time
+import random
+import argparse
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import geoip2.database
+
+from antic_core.config import COUNTRY_DATABASE_PATH, CITY_DATABASE_PATH
+from antic_core.geo import GeoService
+from antic_core.geo_bulk import get_ip_range_table, enrich
+
+def random_ips(count, seed=42):
+    """Случайные публичные IPv4 адреса"""
+    rnd = random.Random(seed)
+    return [f"{rnd.randint(1, 223)}.{rnd.randint(0, 255)}.{rnd.randint(0, 255)}.{rnd.randint(1, 254)}" for _ in range(count)]
+
+def lookup_per_call_reader(ips, country_path, city_path):
+    """Старый способ: новый Reader на каждый запрос"""
+    for ip in ips:
+        try:
+            with geoip2.database.Reader(country_path) as reader:
+                reader.country(ip)
+        except Exception:
+            pass
+        try:
+            with geoip2.database.Reader(city_path) as reader:
+                reader.city(ip)
+        except Exception:
+            pass
+
+def lookup_geo_service(ips, service):
+    """Новый способ: общий GeoService"""
+    for ip in ips:
+        service.country(ip)
+        service.city(ip)
+
+def measure(name, func, count):
+    """Замер и вывод числа запросов в секунду"""
+    started = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - started
+    rate = count / elapsed if elapsed else float("inf")
+    print(f"{name:<40}{count:>10}{elapsed:>12.3f}{rate:>16,.0f}")
+    return rate
+
+def main():
+    """Основная функция"""
+    parser = argparse.ArgumentParser(description="Бенчмарк GEO-запросов")
+    parser.add_argument("--country", default=COUNTRY_DATABASE_PATH, help="Путь к базе стран")
+    parser.add_argument("--city", default=CITY_DATABASE_PATH, help="Путь к базе городов")
+    parser.add_argument("--count", type=int, default=20000, help="Число IP для GeoService")
+    parser.add_argument("--threads", type=int, default=4, help="Потоков для параллельного замера")
+    parser.add_argument("--bulk", type=int, default=0, help="Число IP для пакетного enrich() (0 - не замерять)")
+    args = parser.parse_args()
+    
+    for path in (args.country, args.city):
+        if not os.path.isfile(path):
+            print(f"❌ База не найдена: {path}")
+            return 1
+    
+    # Открытие Reader на каждый запрос очень медленное - берём меньше IP
+    slow_count = max(1, args.count // 20)
+    ips = random_ips(args.count)
+    service = GeoService(args.country, args.city)
+    service.country("8.8.8.8")  # Открываем базы заранее
+    
+    print(f"{'Способ':<40}{'IP':>10}{'Время, с':>12}{'Запросов/с':>16}")
+    before = measure("Reader на каждый запрос", lambda: lookup_per_call_reader(ips[:slow_count], args.country, args.city), slow_count)
+    after = measure("GeoService (mmap, 1 поток)", lambda: lookup_geo_service(ips, service), args.count)
+    
+    def threaded():
+        chunk = len(ips) // args.threads + 1
+        threads = [threading.Thread(target=lookup_geo_service, args=(ips[i:i + chunk], service)) for i in range(0, len(ips), chunk)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+    measure(f"GeoService (mmap, {args.threads} потока)", threaded, args.count)
+    
+    print(f"\nУскорение: x{after / before:.1f}")
+    
+    if args.bulk:
+        # Таблица строится один раз на версию базы и дальше читается из кэша
+        started = time.perf_counter()
+        table = get_ip_range_table(service=service)
+        if table is None:
+            print("❌ Не удалось построить таблицу IP-диапазонов")
+            service.close()
+            return 1
+        print(f"\nТаблица IP-диапазонов: {len(table)} диапазонов, готова за {time.perf_counter() - started:.2f}с")
+        bulk_ips = random_ips(args.bulk, seed=7)
+        print(f"{'Способ':<40}{'IP':>10}{'Время, с':>12}{'IP/с':>16}")
+        measure("enrich() (NumPy, векторно)", lambda: enrich(bulk_ips, table, service), args.bulk)
+    
+    service.close()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
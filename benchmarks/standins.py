@@ -0,0 +1,264 @@
+"""
+Локальные заменители внешних сервисов для бенчмарков проверки прокси:
+
+- IP-echo сервер (HTTP и, если есть openssl, HTTPS): отвечает {"ip": ..., "origin": ...}
+  с адресом, с которого пришло соединение - то есть с "внешним IP" прокси;
+- пул поддельных upstream-прокси (HTTP CONNECT/absolute-URI и SOCKS5 с логином):
+  каждый прокси слушает свой адрес 127.1.x.y, ходит к цели с этого же адреса и
+  по настройкам добавляет задержку, рвёт соединения и отвергает авторизацию.
+
+Всё работает в текущем event loop, сеть не нужна.
+"""
+import os
+import ssl
+import base64
+import random
+import asyncio
+import tempfile
+import subprocess
+from urllib.parse import urlsplit
+
+# ============================================================
+# IP-ECHO СЕРВЕР
+# ============================================================
+async def _read_head(reader):
+    """Стартовая строка и заголовки HTTP-запроса: (строка, {заголовок: значение}, сырые байты)"""
+    raw = await reader.readuntil(b"\r\n\r\n")
+    lines = raw.decode("latin-1").split("\r\n")
+    headers = {}
+    for line in lines[1:]:
+        if ":" in line:
+            name, value = line.split(":", 1)
+            headers[name.strip().lower()] = value.strip()
+    return lines[0], headers, raw
+
+async def _echo_handler(reader, writer):
+    """Ответ с адресом клиента и закрытие соединения"""
+    try:
+        await _read_head(reader)
+        peer_ip = writer.get_extra_info("peername")[0]
+        body = f'{{"ip": "{peer_ip}", "origin": "{peer_ip}"}}'.encode()
+        writer.write(
+            b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+            + f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode() + body
+        )
+        await writer.drain()
+    except (asyncio.IncompleteReadError, ConnectionError, ssl.SSLError):
+        pass
+    finally:
+        writer.close()
+
+def make_self_signed_context():
+    """Серверный и клиентский SSL-контексты с самоподписанным сертификатом для 127.0.0.1 (None без openssl)"""
+    directory = tempfile.mkdtemp(prefix="antic-bench-")
+    cert, key = os.path.join(directory, "cert.pem"), os.path.join(directory, "key.pem")
+    try:
+        subprocess.run(
+            ["openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "1",
+             "-subj", "/CN=127.0.0.1", "-addext", "subjectAltName=IP:127.0.0.1",
+             "-keyout", key, "-out", cert],
+            check=True, capture_output=True
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None, None
+    server_context = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+    server_context.load_cert_chain(cert, key)
+    client_context = ssl.create_default_context(cafile=cert)
+    return server_context, client_context
+
+async def start_echo_server(ssl_context=None):
+    """IP-echo сервер на 127.0.0.1; возвращает (server, URL /ip)"""
+    server = await asyncio.start_server(_echo_handler, "127.0.0.1", 0, ssl=ssl_context)
+    port = server.sockets[0].getsockname()[1]
+    return server, f"{'https' if ssl_context else 'http'}://127.0.0.1:{port}/ip"
+
+# ============================================================
+# ПОДДЕЛЬНЫЕ UPSTREAM-ПРОКСИ
+# ============================================================
+async def _pipe(reader, writer):
+    """Перекачка данных в одну сторону до EOF"""
+    try:
+        while True:
+            data = await reader.read(64 * 1024)
+            if not data:
+                break
+            writer.write(data)
+            await writer.drain()
+    except (ConnectionError, asyncio.CancelledError):
+        pass
+    finally:
+        writer.close()
+
+async def _relay(client_reader, client_writer, target_reader, target_writer):
+    """Туннель клиент <-> цель в обе стороны"""
+    await asyncio.gather(_pipe(client_reader, target_writer), _pipe(target_reader, client_writer))
+
+class UpstreamProfile:
+    """Поведение одного поддельного прокси"""
+    __slots__ = ("host", "protocol", "latency", "reject_auth")
+
+    def __init__(self, host, protocol, latency, reject_auth):
+        self.host = host
+        self.protocol = protocol
+        self.latency = latency
+        self.reject_auth = reject_auth
+
+class FakeUpstreamPool:
+    """Пул поддельных прокси на адресах 127.1.x.y с общим портом.
+
+    latency - средняя задержка ответа прокси (с), у каждого прокси своя в пределах ±50%;
+    drop_rate - доля соединений, которые прокси рвёт сразу после accept;
+    auth_fail_rate - доля прокси, отвергающих любой логин/пароль.
+    Протоколы чередуются: чётные - http, нечётные - socks5.
+    """
+    USERNAME = "bench"
+    PASSWORD = "bench"
+
+    def __init__(self, count, latency=0.0, drop_rate=0.0, auth_fail_rate=0.0, seed=1):
+        self.random = random.Random(seed)
+        self.drop_rate = drop_rate
+        self.profiles = {}
+        for i in range(count):
+            host = f"127.1.{i // 250}.{i % 250 + 1}"
+            self.profiles[host] = UpstreamProfile(
+                host,
+                "http" if i % 2 == 0 else "socks5",
+                latency * self.random.uniform(0.5, 1.5),
+                self.random.random() < auth_fail_rate,
+            )
+        self.server = None
+        self.port = None
+        self.connections = 0
+
+    async def start(self):
+        """Открыть все адреса пула на одном свободном порту"""
+        probe = await asyncio.start_server(lambda r, w: None, "127.1.0.1", 0)
+        self.port = probe.sockets[0].getsockname()[1]
+        probe.close()
+        await probe.wait_closed()
+        self.server = await asyncio.start_server(self._handle, list(self.profiles), self.port)
+        return self
+
+    def close(self):
+        """Закрыть все адреса пула"""
+        if self.server:
+            self.server.close()
+
+    def proxies(self, count=None):
+        """Строки прокси пула (с логином) для проверки"""
+        profiles = list(self.profiles.values())[:count]
+        return [f"{p.protocol}://{self.USERNAME}:{self.PASSWORD}@{p.host}:{self.port}" for p in profiles]
+
+    def expected_ok(self, count=None):
+        """Сколько прокси должны пройти проверку без учёта случайных обрывов"""
+        return sum(1 for p in list(self.profiles.values())[:count] if not p.reject_auth)
+
+    async def _handle(self, reader, writer):
+        """Входящее соединение: обрыв по drop_rate или обработка по протоколу прокси"""
+        self.connections += 1
+        profile = self.profiles.get(writer.get_extra_info("sockname")[0])
+        if profile is None or self.random.random() < self.drop_rate:
+            writer.close()
+            return
+        try:
+            if profile.protocol == "http":
+                await self._handle_http(profile, reader, writer)
+            else:
+                await self._handle_socks5(profile, reader, writer)
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError, ValueError, asyncio.CancelledError):
+            # Отмена - стенд закрывается вместе с event loop
+            writer.close()
+
+    def _credentials_ok(self, profile, username, password):
+        """Принимает ли прокси этот логин/пароль"""
+        return not profile.reject_auth and username == self.USERNAME and password == self.PASSWORD
+
+    async def _open_target(self, profile, host, port):
+        """Соединение с целью от имени прокси"""
+        # С адреса прокси - echo сервер увидит его как внешний IP
+        return await asyncio.open_connection(host, port, local_addr=(profile.host, 0))
+
+    async def _handle_http(self, profile, reader, writer):
+        """HTTP-прокси: CONNECT-туннель или пересылка запроса с абсолютным URI"""
+        request_line, headers, _ = await _read_head(reader)
+        await asyncio.sleep(profile.latency)
+        method, target, _ = request_line.split(" ", 2)
+
+        auth = headers.get("proxy-authorization", "")
+        username = password = ""
+        if auth.lower().startswith("basic "):
+            username, _, password = base64.b64decode(auth[6:]).decode().partition(":")
+        if not self._credentials_ok(profile, username, password):
+            writer.write(b"HTTP/1.1 407 Proxy Authentication Required\r\nContent-Length: 0\r\nConnection: close\r\n\r\n")
+            await writer.drain()
+            writer.close()
+            return
+
+        if method == "CONNECT":
+            host, port = target.rsplit(":", 1)
+            try:
+                target_reader, target_writer = await self._open_target(profile, host, int(port))
+            except OSError:
+                writer.write(b"HTTP/1.1 502 Bad Gateway\r\nContent-Length: 0\r\nConnection: close\r\n\r\n")
+                await writer.drain()
+                writer.close()
+                return
+            writer.write(b"HTTP/1.1 200 Connection established\r\n\r\n")
+            await writer.drain()
+        else:
+            url = urlsplit(target)
+            target_reader, target_writer = await self._open_target(profile, url.hostname, url.port or 80)
+            path = (url.path or "/") + (f"?{url.query}" if url.query else "")
+            forwarded = [f"{method} {path} HTTP/1.1"]
+            forwarded += [f"{name}: {value}" for name, value in headers.items() if not name.startswith("proxy-")]
+            target_writer.write(("\r\n".join(forwarded) + "\r\n\r\n").encode("latin-1"))
+            await target_writer.drain()
+        await _relay(reader, writer, target_reader, target_writer)
+
+    async def _handle_socks5(self, profile, reader, writer):
+        """SOCKS5 с авторизацией логином/паролем (RFC 1928/1929), только CONNECT"""
+        version, count = await reader.readexactly(2)
+        methods = await reader.readexactly(count)
+        await asyncio.sleep(profile.latency)
+        if version != 5 or 2 not in methods:
+            writer.write(b"\x05\xff")
+            await writer.drain()
+            writer.close()
+            return
+        writer.write(b"\x05\x02")
+        await writer.drain()
+
+        _, length = await reader.readexactly(2)
+        username = (await reader.readexactly(length)).decode()
+        length = (await reader.readexactly(1))[0]
+        password = (await reader.readexactly(length)).decode()
+        if not self._credentials_ok(profile, username, password):
+            writer.write(b"\x01\x01")
+            await writer.drain()
+            writer.close()
+            return
+        writer.write(b"\x01\x00")
+        await writer.drain()
+
+        _, command, _, address_type = await reader.readexactly(4)
+        if address_type == 1:
+            host = ".".join(str(octet) for octet in await reader.readexactly(4))
+        elif address_type == 3:
+            host = (await reader.readexactly((await reader.readexactly(1))[0])).decode()
+        else:
+            writer.write(b"\x05\x08\x00\x01" + bytes(6))
+            await writer.drain()
+            writer.close()
+            return
+        port = int.from_bytes(await reader.readexactly(2), "big")
+        await asyncio.sleep(profile.latency)
+        try:
+            target_reader, target_writer = await self._open_target(profile, host, port)
+        except OSError:
+            writer.write(b"\x05\x05\x00\x01" + bytes(6))
+            await writer.drain()
+            writer.close()
+            return
+        writer.write(b"\x05\x00\x00\x01" + bytes(6))
+        await writer.drain()
+        await _relay(reader, writer, target_reader, target_writer)
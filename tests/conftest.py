@@ -0,0 +1,36 @@
+"""
+Общие фикстуры тестов antic_core: рабочие файлы приложения (кэш результатов,
+база прокси) на время теста подменяются временными.
+"""
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+from antic_core.breaker import proxy_breaker
+from antic_core.results import proxy_results
+from antic_core.store import proxy_store
+
+@pytest.fixture
+def isolated_storage(tmp_path, monkeypatch):
+    """Кэш результатов, база прокси и circuit breaker - пустые, файлы во временной папке"""
+    monkeypatch.setattr(proxy_results, "snapshot_path", str(tmp_path / "proxy_cache.json"))
+    monkeypatch.setattr(proxy_results, "journal_path", str(tmp_path / "proxy_cache.journal.jsonl"))
+    monkeypatch.setattr(proxy_results, "_results", None)
+    monkeypatch.setattr(proxy_results, "_pending", [])
+    monkeypatch.setattr(proxy_store, "path", str(tmp_path / "proxies.sqlite3"))
+    monkeypatch.setattr(proxy_store, "legacy_path", str(tmp_path / "proxies.json"))
+    monkeypatch.setattr(proxy_store, "_db", None)
+    monkeypatch.setattr(proxy_store, "_list", None)
+    monkeypatch.setattr(proxy_store, "_pending", {})
+    monkeypatch.setattr(proxy_breaker, "_circuits", {})
+    monkeypatch.setattr(proxy_breaker, "_seeded", True)
+    yield tmp_path
+    proxy_results.flush()
+    proxy_store.flush()
+    if proxy_store._db is not None:
+        proxy_store._db.close()
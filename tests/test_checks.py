@@ -0,0 +1,158 @@
+"""
+Исходы check_proxy_async: что попадает в кэш результатов и в circuit breaker.
+"""
+import time
+import socket
+import asyncio
+
+import pproxy
+import pytest
+
+from antic_core import proxies
+from antic_core.breaker import proxy_breaker, proxy_endpoint
+from antic_core.monitor import result_due_at, HEALTH_RETRY_BASE
+from antic_core.proxies import check_proxy_async, import_proxies
+from antic_core.results import proxy_results
+from standins import FakeUpstreamPool, start_echo_server
+
+def test_unparseable_proxy_is_retried_with_backoff(isolated_storage):
+    proxy = "http://1.2.3.4:not-a-port"
+    result = asyncio.run(check_proxy_async(proxy, save_cache=False))
+
+    assert result["status"] == "error"
+    assert result["stage"] == "parse"
+    stored = proxy_results.get(proxy)
+    assert stored["failures"] == 1
+    assert time.time() - stored["checked_at"] < 5
+    # Монитор не перепроверяет такую строку на каждом проходе
+    assert result_due_at(stored) >= stored["checked_at"] + HEALTH_RETRY_BASE
+
+    asyncio.run(check_proxy_async(proxy, save_cache=False))
+    assert proxy_results.get(proxy)["failures"] == 2
+
+def test_port_out_of_range_is_an_error_result(isolated_storage):
+    result = asyncio.run(check_proxy_async("http://127.0.0.1:99999", save_cache=False))
+
+    assert result["status"] == "error"
+    assert result["stage"] == "parse"
+    assert "unreachable" not in result
+
+async def check_pair_on_stand_in(monkeypatch):
+    """Два логина на одном host:port поддельного HTTP-прокси: с неверным паролем (407) и верным"""
+    echo_server, echo_url = await start_echo_server()
+    monkeypatch.setattr(proxies, "CHECK_SERVICES", [(echo_url, "ip")])
+    pool = await FakeUpstreamPool(1).start()
+    good = pool.proxies()[0]
+    bad = good.replace(f":{pool.PASSWORD}@", ":wrong@")
+    try:
+        bad_result = await check_proxy_async(bad, save_cache=False)
+        # Отказ логину проверен - соседний логин шлюза должен остаться доступным
+        allowed = proxy_breaker.allow(good)
+        good_result = await check_proxy_async(good, save_cache=False)
+    finally:
+        pool.close()
+        echo_server.close()
+    return bad, good, bad_result, good_result, allowed
+
+def test_auth_failure_leaves_other_credentials_on_endpoint_usable(isolated_storage, monkeypatch):
+    bad, good, bad_result, good_result, allowed = asyncio.run(check_pair_on_stand_in(monkeypatch))
+
+    assert bad_result["status"] == "error"
+    assert bad_result["stage"] == "handshake"
+    assert "unreachable" not in bad_result
+    assert proxy_endpoint(bad) == proxy_endpoint(good)
+    assert allowed
+    assert good_result["status"] == "ok", good_result
+    # Сам прокси с неверным паролем отключён: не предлагается и не запускается
+    assert proxy_breaker.is_open(bad)
+    assert not proxy_breaker.allow(bad)
+    assert not proxy_breaker.is_open(good)
+    assert import_proxies([good, bad])["dead"] == 1
+
+def test_failed_proxy_stays_blocked_after_restart(isolated_storage, monkeypatch):
+    failed, neighbour = "http://a:a@10.0.0.1:8080", "http://b:b@10.0.0.1:8080"
+    result = {"status": "error", "proxy_str": failed, "stage": "egress", "error": "Прокси не отвечает"}
+    asyncio.run(proxies._store_check_result(failed, result, save_cache=False))
+
+    # Новый процесс: реестр заполняется из кэша результатов
+    monkeypatch.setattr(proxy_breaker, "_circuits", {})
+    monkeypatch.setattr(proxy_breaker, "_seeded", False)
+
+    assert proxy_breaker.is_open(failed)
+    assert proxy_breaker.reason(failed) == "Прокси не отвечает"
+    assert not proxy_breaker.is_open(neighbour)
+
+def test_unreachable_endpoint_opens_the_breaker(isolated_storage):
+    # Свободный порт: подключение отвергается сразу
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+    first, second = f"http://a:a@127.0.0.1:{port}", f"http://b:b@127.0.0.1:{port}"
+    result = asyncio.run(check_proxy_async(first, save_cache=False))
+
+    assert result["stage"] == "tcp"
+    assert result["unreachable"]
+    # Эндпоинт недоступен целиком - отключён для всех логинов
+    assert proxy_breaker.is_open(second)
+    assert import_proxies([second])["dead"] == 1
+
+async def check_through_pproxy(protocol, monkeypatch):
+    """Проверка через локальный pproxy-сервер нужного протокола до эхо-сервиса"""
+    echo_server, echo_url = await start_echo_server()
+    monkeypatch.setattr(proxies, "CHECK_SERVICES", [(echo_url, "ip")])
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+    server = await pproxy.Server(f"{protocol}://127.0.0.1:{port}").start_server({"rserver": [], "verbose": lambda *args: None})
+    try:
+        return await check_proxy_async(f"{protocol}://127.0.0.1:{port}", save_cache=False)
+    finally:
+        server.close()
+        echo_server.close()
+
+@pytest.mark.parametrize("protocol", ["http", "socks5", "socks4"])
+def test_check_passes_through_each_protocol(isolated_storage, monkeypatch, protocol):
+    result = asyncio.run(check_through_pproxy(protocol, monkeypatch))
+
+    assert result["status"] == "ok", result
+    assert result["type"] == protocol
+    assert result["ip"] == "127.0.0.1"
+
+def test_bulk_check_survives_a_raising_check(isolated_storage, monkeypatch):
+    async def check(proxy, save_cache=True):
+        if "broken" in proxy:
+            raise UnicodeError("label empty or too long")
+        return {"status": "ok", "proxy_str": proxy}
+    monkeypatch.setattr(proxies, "check_proxy_async", check)
+    progress = []
+
+    results = asyncio.run(proxies.check_proxies_bulk(
+        ["http://127.0.0.1:1", "http://broken:80"], on_progress=lambda done, total: progress.append((done, total))))
+
+    assert results["http://127.0.0.1:1"]["status"] == "ok"
+    assert results["http://broken:80"]["status"] == "error"
+    assert progress[-1] == (2, 2)
+
+async def check_against_silent_proxy():
+    """Проверка HTTP-прокси, который принимает TCP, но ничего не отвечает; (результат, секунд)"""
+    async def hang(reader, writer):
+        await reader.read()
+        writer.close()
+    server = await asyncio.start_server(hang, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    started = time.perf_counter()
+    try:
+        result = await check_proxy_async(f"http://127.0.0.1:{port}", save_cache=False)
+    finally:
+        server.close()
+    return result, time.perf_counter() - started
+
+def test_deadline_covers_the_preflight(isolated_storage, monkeypatch):
+    # Рукопожатию самому по себе дали бы PREFLIGHT_TIMEOUT, но вся проверка ограничена CHECK_DEADLINE
+    monkeypatch.setattr(proxies, "CHECK_DEADLINE", 0.5)
+    result, elapsed = asyncio.run(check_against_silent_proxy())
+
+    assert elapsed < proxies.PREFLIGHT_TIMEOUT
+    assert result["status"] == "error"
+    assert result["stage"] == "handshake"
+    assert result["unreachable"]
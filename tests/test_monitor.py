@@ -0,0 +1,26 @@
+from concurrent.futures import Future
+
+from antic_core import monitor
+from antic_core.monitor import ProxyHealthMonitor, PRIORITY_IMPORTED, PRIORITY_OTHER
+
+def test_enqueued_proxies_are_checked_before_stale_ones(isolated_storage):
+    health_monitor = ProxyHealthMonitor()
+    health_monitor._future = Future()  # Монитор работает
+    stale = [f"http://10.0.0.{i}:8080" for i in range(20)]
+    new = "http://10.0.1.1:8080"
+
+    assert health_monitor.enqueue([new]) is None
+    due, _ = health_monitor._due({proxy: PRIORITY_OTHER for proxy in stale + [new]}, {})
+
+    assert due[0] == (PRIORITY_IMPORTED, 0, new)
+    assert len(due) == len(stale) + 1
+
+def test_enqueue_without_running_monitor_checks_once(isolated_storage, monkeypatch):
+    submitted = []
+    monkeypatch.setattr(monitor, "submit_check", lambda coro: submitted.append(coro) or "future")
+    health_monitor = ProxyHealthMonitor()
+
+    assert health_monitor.enqueue(["http://10.0.1.1:8080"]) == "future"
+    assert submitted[0].cr_code.co_name == "check_proxies_bulk"
+    submitted[0].close()
+    assert not health_monitor._imported
@@ -0,0 +1,22 @@
+import socket
+import asyncio
+
+import pytest
+
+from antic_core.proxies import check_proxy_async
+from antic_core.resolver import DNSCache
+
+def test_unencodable_host_is_cached_as_negative_answer():
+    cache = DNSCache()
+    for _ in range(2):
+        with pytest.raises(socket.gaierror):
+            asyncio.run(cache.resolve("a..b"))
+    assert cache._pending == {}
+    assert cache._entries["a..b"][0] is None
+    assert cache.lookup("a..b") == "a..b"
+
+def test_unencodable_host_is_an_error_result(isolated_storage):
+    result = asyncio.run(check_proxy_async("http://a..b:8080", save_cache=False))
+
+    assert result["status"] == "error"
+    assert result["stage"] == "tcp"
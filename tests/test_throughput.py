@@ -0,0 +1,48 @@
+"""
+measure_proxy_throughput на локальном стенде из benchmarks/bench_throughput.py:
+сервер нагрузки с ограничением скорости и локальный pproxy (HTTP + SOCKS5).
+"""
+import json
+import asyncio
+
+import pytest
+
+from antic_core.proxies import measure_proxy_throughput
+from antic_core.results import proxy_results
+from bench_throughput import start_payload_server, start_local_proxy
+
+RATE = 4_000_000   # Ограничение сервера нагрузки, байт/с
+SIZE = 2_000_000   # Байт на загрузку и на отдачу (~0.5с в каждую сторону)
+
+async def measure(protocol):
+    """Замер через локальный прокси: (строка прокси, результат)"""
+    payload_server, base_url = start_payload_server(RATE)
+    proxy_handler, port = await start_local_proxy()
+    proxy = f"{protocol}://127.0.0.1:{port}"
+    # Результат обычной проверки - замер должен лечь рядом с ним
+    proxy_results.put(proxy, {"status": "ok", "proxy_str": proxy, "type": protocol, "latency": 0.05})
+    try:
+        return proxy, await measure_proxy_throughput(proxy, SIZE, base_url + "/__down?bytes={size}", base_url + "/__up")
+    finally:
+        proxy_handler.close()
+        payload_server.shutdown()
+
+@pytest.mark.parametrize("protocol", ["http", "socks5"])
+def test_throughput_is_measured_and_stored_with_latency(isolated_storage, protocol):
+    proxy, result = asyncio.run(measure(protocol))
+
+    assert result["status"] == "ok", result
+    assert result["bytes"] == SIZE
+    # Сервер отдаёт и принимает не быстрее RATE: замер должен быть с ним одного порядка
+    assert RATE / 2 < result["download"] < RATE * 2
+    assert RATE / 4 < result["upload"] < RATE * 4
+    assert 0 <= result["jitter"] < result["download"]
+
+    stored = proxy_results.get(proxy)
+    assert stored["latency"] == 0.05
+    assert stored["throughput"] == result
+    # save_cache=True - замер уже в журнале на диске
+    with open(isolated_storage / "proxy_cache.journal.jsonl", encoding="utf-8") as f:
+        records = [json.loads(line) for line in f]
+    assert records[-1]["proxy"] == proxy
+    assert records[-1]["result"]["throughput"]["download"] == result["download"]